@@ -0,0 +1,178 @@
+"""Organization-wide competency analytics endpoints"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import distinct, func, select
+from typing import List, Optional, Dict, Any
+import json
+
+from app.core.database import get_db
+from app.models.assessment import Assessment, ProficiencyLevel
+from app.models.competency import Competency, CompetencyCategory
+from app.models.analytics import CompetencyRisk
+from app.models.organization import JobRole
+from app.models.user import User
+from app.services.competency_matrix import competency_matrix
+from app.services.organization import USER_FIELDS, OrganizationFilter, organization_filter
+from app.services.risk_report import refresh_competency_risk, RISK_LEVELS
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/heatmap")
+def get_competency_heatmap(
+    user_ids: Optional[List[int]] = Query(None, description="Restrict to these users (team); all users if omitted"),
+    category: Optional[CompetencyCategory] = None,
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Team or organization competency heatmap
+
+    Returns the number of users at each proficiency level per competency.
+    For an explicit team the per-user level grid (0 = not assessed) is included.
+    region, country, location and job_role narrow the users (or the team)
+    here and in the other matrix endpoints.
+    """
+    competency_matrix.ensure_loaded(db)
+    team = user_ids is not None
+    user_ids = organization.user_ids(db, user_ids)
+    return competency_matrix.heatmap(user_ids, category.value if category else None, include_grid=team)
+
+
+@router.get("/category-averages")
+def get_category_averages(
+    user_ids: Optional[List[int]] = Query(None),
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Average proficiency per competency category"""
+    competency_matrix.ensure_loaded(db)
+    user_ids = organization.user_ids(db, user_ids)
+    return {"categories": competency_matrix.category_averages(user_ids)}
+
+
+@router.get("/coverage")
+def get_competency_coverage(
+    user_ids: Optional[List[int]] = Query(None),
+    min_level: int = Query(ProficiencyLevel.BEGINNER.value, ge=1, le=4, description="Minimum proficiency level (1-4)"),
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Percentage of users holding each competency at min_level or above"""
+    competency_matrix.ensure_loaded(db)
+    user_ids = organization.user_ids(db, user_ids)
+    coverage = competency_matrix.coverage(user_ids, min_level)
+    return {"min_level": ProficiencyLevel(min_level).name, "competencies": coverage, "total": len(coverage)}
+
+
+@router.get("/gaps")
+def get_competency_gaps(
+    user_ids: Optional[List[int]] = Query(None),
+    target_level: int = Query(ProficiencyLevel.ADVANCED.value, ge=1, le=4, description="Expected proficiency level (1-4)"),
+    top_n: int = Query(10, ge=1, le=500),
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Top-N competencies where the group falls furthest below target_level"""
+    competency_matrix.ensure_loaded(db)
+    user_ids = organization.user_ids(db, user_ids)
+    return {
+        "target_level": ProficiencyLevel(target_level).name,
+        "gaps": competency_matrix.gaps(user_ids, target_level, top_n)
+    }
+
+
+@router.get("/headcount")
+def get_headcount(
+    group_by: str = Query("region", pattern="^(region|country|location|job_role)$"),
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Users per region, country, location or job role, largest group first
+
+    Users without a value are counted under null. For job roles a user counts
+    once in every role they hold competencies of.
+    """
+    users = select(User.id).filter(*organization.conditions())
+    if group_by == "job_role":
+        statement = (
+            select(JobRole.name, func.count(distinct(Assessment.user_id)))
+            .select_from(Assessment)
+            .join(Competency, Competency.id == Assessment.competency_id)
+            .outerjoin(JobRole, JobRole.id == Competency.job_role_id)
+            .filter(Assessment.user_id.in_(users))
+            .group_by(Competency.job_role_id, JobRole.name)
+        )
+    else:
+        model, column = USER_FIELDS[group_by]
+        statement = (
+            select(model.name, func.count(User.id))
+            .select_from(User)
+            .outerjoin(model, model.id == column)
+            .filter(*organization.conditions())
+            .group_by(column, model.name)
+        )
+    rows = db.execute(statement.order_by(func.count().desc(), statement.selected_columns[0])).all()
+    return {
+        "group_by": group_by,
+        "groups": [{"name": name, "users": count} for name, count in rows],
+        "total_users": db.scalar(select(func.count()).select_from(users.subquery()))
+    }
+
+
+@router.get("/risk")
+def get_competency_risk(
+    risk_level: Optional[str] = Query(None, description="Filter by: critical, high, medium or low"),
+    limit: int = Query(100, ge=1, le=5000),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Competencies ranked by bus-factor risk, most at risk first
+
+    Served from the competency_risk summary table, which is refreshed after
+    every Planisware import (or via POST /api/analytics/risk/refresh).
+    """
+    if risk_level and risk_level not in RISK_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Invalid risk level. Must be one of: {RISK_LEVELS}")
+
+    query = db.query(CompetencyRisk, Competency.name, Competency.category).join(
+        Competency, Competency.id == CompetencyRisk.competency_id
+    )
+    if risk_level:
+        query = query.filter(CompetencyRisk.risk_level == risk_level)
+    rows = query.order_by(CompetencyRisk.risk_rank).limit(limit).all()
+
+    return {
+        "competencies": [
+            {
+                "competency_id": risk.competency_id,
+                "name": name,
+                "category": category.value,
+                "risk_level": risk.risk_level,
+                "holders": risk.holders,
+                "holders_by_level": {
+                    "BEGINNER": risk.beginner_count,
+                    "INTERMEDIATE": risk.intermediate_count,
+                    "ADVANCED": risk.advanced_count,
+                    "EXPERT": risk.expert_count
+                },
+                "bus_factor": risk.bus_factor,
+                "gini": risk.gini,
+                "regions_covered": risk.regions_covered,
+                "countries_covered": risk.countries_covered,
+                "region_coverage": json.loads(risk.region_coverage) if risk.region_coverage else None,
+                "computed_at": risk.computed_at.isoformat()
+            }
+            for risk, name, category in rows
+        ],
+        "total": len(rows)
+    }
+
+
+@router.post("/risk/refresh")
+def refresh_risk_report(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Recompute the competency risk summary from current assessments"""
+    summarized = refresh_competency_risk(db)
+    db.commit()
+    return {"competencies_summarized": summarized}
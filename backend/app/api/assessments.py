@@ -1,29 +1,112 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
-from ..core.database import get_db
+from typing import List, Dict, Any
+from datetime import datetime
+from ..core.database import get_db, upsert
 from ..models.assessment import Assessment
-from ..schemas.assessment import AssessmentCreate, AssessmentResponse
+from ..models.competency import Competency
+from ..models.user import User
+from ..services.assessment_views import assessments_changed
+from ..services.generations import ASSESSMENTS, bump_generation
+from ..schemas.assessment import (
+    AssessmentCreate,
+    AssessmentResponse,
+    AssessmentBulkCreate
+)
 
 router = APIRouter(prefix="/assessments", tags=["assessments"])
 
 
+def upsert_assessments(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Validate users and competencies and upsert assessments keyed on (user_id, competency_id)
+
+    Users and competencies are each checked with a single IN query; when the same user and
+    competency appear more than once the last entry wins. Does not commit.
+
+    Returns:
+        Number of distinct assessments written
+    """
+    user_ids = {row["user_id"] for row in rows}
+    existing_users = {
+        user_id for (user_id,) in
+        db.query(User.id).filter(User.id.in_(user_ids))
+    }
+    missing_users = sorted(user_ids - existing_users)
+    if missing_users:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Users not found: {', '.join(str(m) for m in missing_users)}"
+        )
+
+    competency_ids = {row["competency_id"] for row in rows}
+    existing_ids = {
+        competency_id for (competency_id,) in
+        db.query(Competency.id).filter(Competency.id.in_(competency_ids))
+    }
+    missing = sorted(competency_ids - existing_ids)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Competencies not found: {', '.join(str(m) for m in missing)}"
+        )
+
+    assessed_at = datetime.utcnow()
+    deduped = {
+        (row["user_id"], row["competency_id"]): {**row, "assessed_at": assessed_at}
+        for row in rows
+    }
+    upsert(
+        db,
+        Assessment,
+        list(deduped.values()),
+        index_elements=["user_id", "competency_id"],
+        update_columns=["proficiency_level", "assessed_at"]
+    )
+    return len(deduped)
+
+
 @router.post("/", response_model=AssessmentResponse)
 def create_assessment(
     assessment: AssessmentCreate,
     user_id: int,
     db: Session = Depends(get_db)
 ):
-    """Create a new skill assessment for a user"""
-    db_assessment = Assessment(
-        user_id=user_id,
-        competency_id=assessment.competency_id,
-        proficiency_level=assessment.proficiency_level
-    )
-    db.add(db_assessment)
+    """Create or update a skill assessment for a user"""
+    row = {
+        "user_id": user_id,
+        "competency_id": assessment.competency_id,
+        "proficiency_level": assessment.proficiency_level
+    }
+    upsert_assessments(db, [row])
+    generation = bump_generation(db, ASSESSMENTS)
     db.commit()
-    db.refresh(db_assessment)
-    return db_assessment
+    assessments_changed([row], generation)
+
+    return db.query(Assessment).filter(
+        Assessment.user_id == user_id,
+        Assessment.competency_id == assessment.competency_id
+    ).first()
+
+
+@router.post("/bulk")
+def create_assessments_bulk(
+    request: AssessmentBulkCreate,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Create or update many assessments, for one or many users, in one transaction
+    """
+    rows = [item.model_dump() for item in request.items]
+    written = upsert_assessments(db, rows)
+    generation = bump_generation(db, ASSESSMENTS)
+    db.commit()
+    assessments_changed(rows, generation)
+
+    return {
+        "assessments_upserted": written,
+        "user_ids": sorted({row["user_id"] for row in rows})
+    }
 
 
 @router.get("/user/{user_id}", response_model=List[AssessmentResponse])
@@ -1,29 +1,47 @@
 """Career framework API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
-import json
-from pathlib import Path
-
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, exists, func, insert, select, tuple_, update
+from typing import Dict, List, Optional, Tuple
+
+from app.core.database import get_db, get_async_db
+from app.schemas.career import DevelopmentPlanBulkCreate, ObjectiveStatusBatchUpdate
+from app.services.cache import cached, response_cache
+from app.services.reference_snapshot import reference_snapshot
 from app.models.career import (
     CareerLevel,
     CompetencyArea,
     CompetencyExpectation,
     Skill,
     DevelopmentPlan,
-    LearningObjective
+    LearningObjective,
+    PlanStatus,
+    ObjectiveStatus,
+    ObjectivePriority
 )
 
 router = APIRouter(prefix="/api/career", tags=["career"])
 
 
-# Helper function to load JSON files
-def load_framework_json():
-    """Load CareerFramework.json"""
-    file_path = Path(__file__).parent.parent.parent.parent / 'CareerFramework.json'
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def _label(member) -> Optional[str]:
+    """API label of a coded status/priority (None for rows without one)"""
+    return member.label if member is not None else None
+
+
+def invalidate_plans(db: Session, plan_ids) -> None:
+    """Invalidate cached plan reads for the given plans and their owners"""
+    plan_ids = set(plan_ids)
+    user_ids = {
+        user_id for (user_id,) in
+        db.query(DevelopmentPlan.user_id).filter(DevelopmentPlan.id.in_(plan_ids))
+    }
+    response_cache.invalidate(
+        "plans",
+        *(f"plan:{plan_id}" for plan_id in plan_ids),
+        *(f"plans:{user_id}" for user_id in user_ids)
+    )
 
 
 @router.get("/paths")
@@ -34,31 +52,13 @@ def get_career_paths():
     Returns:
         List of career tracks with their details
     """
-    framework = load_framework_json()
-
-    tracks = []
-    for key, data in framework['career_tracks'].items():
-        tracks.append({
-            "key": key,
-            "name": data['name'],
-            "description": data['description'],
-            "levels": len(data['levels']),
-            "level_details": [
-                {
-                    "level": level['level'],
-                    "title": level['title'],
-                    "pay_class": level['pay_class'],
-                    "summary": level['summary']
-                }
-                for level in data['levels']
-            ]
-        })
-
-    return {"tracks": tracks}
+    # Precomputed when the reference snapshot is built
+    return reference_snapshot().career_paths
 
 
 @router.get("/paths/{track}/{pay_class}")
-def get_level_details(track: str, pay_class: str, db: Session = Depends(get_db)):
+@cached("career")
+async def get_level_details(track: str, pay_class: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed information for a specific career level
 
@@ -69,27 +69,28 @@ def get_level_details(track: str, pay_class: str, db: Session = Depends(get_db))
     Returns:
         Level details with competencies
     """
-    framework = load_framework_json()
+    snapshot = reference_snapshot()
 
-    track_data = framework['career_tracks'].get(track)
-    if not track_data:
+    if track not in snapshot.framework['career_tracks']:
         raise HTTPException(status_code=404, detail="Career track not found")
 
-    level = next((l for l in track_data['levels'] if l['pay_class'] == pay_class), None)
+    level = snapshot.levels.get((track, pay_class))
     if not level:
         raise HTTPException(status_code=404, detail="Level not found")
 
     # Get competencies from database
     competencies = []
-    competency_areas = db.query(CompetencyArea).all()
-
-    for area in competency_areas:
-        expectation = db.query(CompetencyExpectation).filter(
-            CompetencyExpectation.competency_area_id == area.id,
-            CompetencyExpectation.pay_class == pay_class
-        ).first()
-
-        if expectation:
+    rows = (await db.execute(
+        select(CompetencyArea, CompetencyExpectation)
+        .join(CompetencyExpectation, CompetencyExpectation.competency_area_id == CompetencyArea.id)
+        .filter(CompetencyExpectation.pay_class == pay_class)
+        .order_by(CompetencyArea.id, CompetencyExpectation.id)
+    )).all()
+
+    seen_areas = set()
+    for area, expectation in rows:
+        if area.id not in seen_areas:
+            seen_areas.add(area.id)
             competencies.append({
                 "area_key": area.area_key,
                 "area": area.name,
@@ -106,7 +107,8 @@ def get_level_details(track: str, pay_class: str, db: Session = Depends(get_db))
 
 
 @router.get("/competencies")
-def get_all_competencies(pay_class: Optional[str] = None, db: Session = Depends(get_db)):
+@cached("career")
+async def get_all_competencies(pay_class: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """
     Get all competency areas, optionally filtered by pay class
 
@@ -117,7 +119,16 @@ def get_all_competencies(pay_class: Optional[str] = None, db: Session = Depends(
         List of competency areas with expectations
     """
     competencies = []
-    areas = db.query(CompetencyArea).all()
+    areas = (await db.scalars(select(CompetencyArea).order_by(CompetencyArea.id))).all()
+
+    # Get expectations for all areas at once
+    query = select(CompetencyExpectation).order_by(CompetencyExpectation.id)
+    if pay_class:
+        query = query.filter(CompetencyExpectation.pay_class == pay_class)
+
+    expectations_by_area = {}
+    for exp in (await db.scalars(query)).all():
+        expectations_by_area.setdefault(exp.competency_area_id, []).append(exp)
 
     for area in areas:
         comp_data = {
@@ -128,17 +139,7 @@ def get_all_competencies(pay_class: Optional[str] = None, db: Session = Depends(
             "expectations": []
         }
 
-        # Get expectations
-        query = db.query(CompetencyExpectation).filter(
-            CompetencyExpectation.competency_area_id == area.id
-        )
-
-        if pay_class:
-            query = query.filter(CompetencyExpectation.pay_class == pay_class)
-
-        expectations = query.all()
-
-        for exp in expectations:
+        for exp in expectations_by_area.get(area.id, []):
             comp_data["expectations"].append({
                 "pay_class": exp.pay_class,
                 "expectations": exp.expectations,
@@ -154,6 +155,62 @@ def get_all_competencies(pay_class: Optional[str] = None, db: Session = Depends(
     }
 
 
+def compute_skills_gaps(db: Session, level_pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Dict]]:
+    """
+    Competency gaps for each (current_level, target_level) pair
+
+    Expectations for every pay class involved are loaded in one query, so the
+    cost does not grow with the number of areas or pairs.
+    """
+    pay_classes = {level for pair in level_pairs for level in pair}
+    areas = db.query(CompetencyArea).order_by(CompetencyArea.id).all()
+    expectations = {
+        (exp.competency_area_id, exp.pay_class): exp
+        for exp in db.query(CompetencyExpectation).filter(CompetencyExpectation.pay_class.in_(pay_classes))
+    }
+
+    gaps_by_pair = {}
+    for current_level, target_level in set(level_pairs):
+        gaps = []
+        for area in areas:
+            current_exp = expectations.get((area.id, current_level))
+            target_exp = expectations.get((area.id, target_level))
+
+            # Include if target level has expectations AND either:
+            # 1. Current level doesn't have it (new competency to learn)
+            # 2. Current level has it but it's different (competency to improve)
+            if target_exp:
+                if not current_exp:
+                    # New competency that doesn't exist at current level
+                    gaps.append({
+                        "competency_area_id": area.id,
+                        "area": area.name,
+                        "description": area.description,
+                        "current": "Not applicable at this level",
+                        "required": target_exp.expectations,
+                        "gap_summary": f"New competency required at {target_level}",
+                        "gap_type": "new"
+                    })
+                elif current_exp.expectations != target_exp.expectations:
+                    # Existing competency with different expectations
+                    gaps.append({
+                        "competency_area_id": area.id,
+                        "area": area.name,
+                        "description": area.description,
+                        "current": current_exp.expectations,
+                        "required": target_exp.expectations,
+                        "gap_summary": f"Need to progress from '{current_level}' to '{target_level}' level",
+                        "gap_type": "improvement"
+                    })
+        gaps_by_pair[(current_level, target_level)] = gaps
+    return gaps_by_pair
+
+
+def objective_priority(index: int) -> ObjectivePriority:
+    """Priority of the index-th gap in a plan: the first three are high"""
+    return ObjectivePriority.HIGH if index < 3 else ObjectivePriority.MEDIUM if index < 6 else ObjectivePriority.LOW
+
+
 @router.post("/skills-gap")
 def calculate_skills_gap(current_level: str, target_level: str, db: Session = Depends(get_db)):
     """
@@ -170,48 +227,7 @@ def calculate_skills_gap(current_level: str, target_level: str, db: Session = De
     Returns:
         List of competency gaps
     """
-    gaps = []
-    areas = db.query(CompetencyArea).all()
-
-    for area in areas:
-        # Get current level expectations
-        current_exp = db.query(CompetencyExpectation).filter(
-            CompetencyExpectation.competency_area_id == area.id,
-            CompetencyExpectation.pay_class == current_level
-        ).first()
-
-        # Get target level expectations
-        target_exp = db.query(CompetencyExpectation).filter(
-            CompetencyExpectation.competency_area_id == area.id,
-            CompetencyExpectation.pay_class == target_level
-        ).first()
-
-        # Include if target level has expectations AND either:
-        # 1. Current level doesn't have it (new competency to learn)
-        # 2. Current level has it but it's different (competency to improve)
-        if target_exp:
-            if not current_exp:
-                # New competency that doesn't exist at current level
-                gaps.append({
-                    "competency_area_id": area.id,
-                    "area": area.name,
-                    "description": area.description,
-                    "current": "Not applicable at this level",
-                    "required": target_exp.expectations,
-                    "gap_summary": f"New competency required at {target_level}",
-                    "gap_type": "new"
-                })
-            elif current_exp.expectations != target_exp.expectations:
-                # Existing competency with different expectations
-                gaps.append({
-                    "competency_area_id": area.id,
-                    "area": area.name,
-                    "description": area.description,
-                    "current": current_exp.expectations,
-                    "required": target_exp.expectations,
-                    "gap_summary": f"Need to progress from '{current_level}' to '{target_level}' level",
-                    "gap_type": "improvement"
-                })
+    gaps = compute_skills_gaps(db, [(current_level, target_level)])[(current_level, target_level)]
 
     return {
         "current_level": current_level,
@@ -251,7 +267,7 @@ def generate_development_plan(
         target_level=target_level,
         created_date=date.today(),
         target_date=date.today() + timedelta(days=180),  # 6 months
-        status='active'
+        status=PlanStatus.ACTIVE
     )
     db.add(plan)
     db.flush()
@@ -259,14 +275,14 @@ def generate_development_plan(
     # Create learning objectives
     objectives = []
     for idx, gap in enumerate(gap_data['gaps']):
-        priority = 'High' if idx < 3 else 'Medium' if idx < 6 else 'Low'
+        priority = objective_priority(idx)
 
         objective = LearningObjective(
             plan_id=plan.id,
             competency_area_id=gap['competency_area_id'],
             description=f"Achieve {target_level} level competency in {gap['area']}",
             priority=priority,
-            status='not_started'
+            status=ObjectiveStatus.NOT_STARTED
         )
         db.add(objective)
 
@@ -275,11 +291,12 @@ def generate_development_plan(
             "competency": gap['area'],
             "current_state": gap['current'],
             "target_state": gap['required'],
-            "priority": priority,
-            "status": 'not_started'
+            "priority": priority.label,
+            "status": ObjectiveStatus.NOT_STARTED.label
         })
 
     db.commit()
+    response_cache.invalidate("plans", f"plans:{user_id}")
 
     return {
         "plan_id": plan.id,
@@ -294,10 +311,80 @@ def generate_development_plan(
     }
 
 
+@router.post("/development-plans/bulk")
+def generate_development_plans_bulk(request: DevelopmentPlanBulkCreate, db: Session = Depends(get_db)):
+    """
+    Generate development plans for many employees in one transaction
+
+    The skills gap is computed once per distinct (current_level, target_level)
+    pair, and plans and objectives are written with bulk inserts.
+
+    Returns:
+        Created plan ids in request order with their objective counts
+    """
+    from datetime import date, timedelta
+
+    items = request.items
+    gaps_by_pair = compute_skills_gaps(db, [(item.current_level, item.target_level) for item in items])
+
+    today = date.today()
+    plan_ids = db.scalars(
+        insert(DevelopmentPlan).returning(DevelopmentPlan.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": item.user_id,
+                "current_level": item.current_level,
+                "target_level": item.target_level,
+                "created_date": today,
+                "target_date": today + timedelta(days=180),  # 6 months
+                "status": PlanStatus.ACTIVE
+            }
+            for item in items
+        ]
+    ).all()
+
+    objectives = [
+        {
+            "plan_id": plan_id,
+            "competency_area_id": gap['competency_area_id'],
+            "description": f"Achieve {item.target_level} level competency in {gap['area']}",
+            "priority": objective_priority(idx),
+            "status": ObjectiveStatus.NOT_STARTED
+        }
+        for plan_id, item in zip(plan_ids, items)
+        for idx, gap in enumerate(gaps_by_pair[(item.current_level, item.target_level)])
+    ]
+    if objectives:
+        db.execute(insert(LearningObjective), objectives)
+    db.commit()
+    response_cache.invalidate("plans", *{f"plans:{item.user_id}" for item in items})
+
+    return {
+        "plans": [
+            {
+                "plan_id": plan_id,
+                "user_id": item.user_id,
+                "current_level": item.current_level,
+                "target_level": item.target_level,
+                "total_objectives": len(gaps_by_pair[(item.current_level, item.target_level)])
+            }
+            for plan_id, item in zip(plan_ids, items)
+        ],
+        "total_plans": len(plan_ids),
+        "total_objectives": len(objectives),
+        "level_pairs": len(gaps_by_pair)
+    }
+
+
 @router.get("/development-plan/{plan_id}")
-def get_development_plan(plan_id: int, db: Session = Depends(get_db)):
+@cached("plan:{plan_id}")
+async def get_development_plan(plan_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific development plan"""
-    plan = db.query(DevelopmentPlan).filter(DevelopmentPlan.id == plan_id).first()
+    plan = await db.scalar(
+        select(DevelopmentPlan)
+        .filter(DevelopmentPlan.id == plan_id)
+        .options(selectinload(DevelopmentPlan.objectives).selectinload(LearningObjective.competency_area))
+    )
 
     if not plan:
         raise HTTPException(status_code=404, detail="Development plan not found")
@@ -309,8 +396,9 @@ def get_development_plan(plan_id: int, db: Session = Depends(get_db)):
             "id": obj.id,
             "competency": obj.competency_area.name if obj.competency_area else "General",
             "description": obj.description,
-            "priority": obj.priority,
-            "status": obj.status
+            "priority": _label(obj.priority),
+            "status": _label(obj.status),
+            "version": obj.version
         })
 
     return {
@@ -320,13 +408,14 @@ def get_development_plan(plan_id: int, db: Session = Depends(get_db)):
         "target_level": plan.target_level,
         "created_date": str(plan.created_date),
         "target_date": str(plan.target_date),
-        "status": plan.status,
+        "status": _label(plan.status),
         "objectives": objectives
     }
 
 
 @router.get("/levels")
-def get_all_career_levels(track: Optional[str] = None, db: Session = Depends(get_db)):
+@cached("career")
+async def get_all_career_levels(track: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """
     Get all career levels from database
 
@@ -336,12 +425,12 @@ def get_all_career_levels(track: Optional[str] = None, db: Session = Depends(get
     Returns:
         List of career levels
     """
-    query = db.query(CareerLevel)
+    query = select(CareerLevel)
 
     if track:
         query = query.filter(CareerLevel.track == track)
 
-    levels = query.order_by(CareerLevel.level).all()
+    levels = (await db.scalars(query.order_by(CareerLevel.level))).all()
 
     return {
         "levels": [
@@ -360,8 +449,50 @@ def get_all_career_levels(track: Optional[str] = None, db: Session = Depends(get
     }
 
 
+def plan_progress_query():
+    """
+    Plans with their objective counts per status, aggregated in the database
+
+    One LEFT JOIN + GROUP BY over all selected plans, so callers issue a single
+    query regardless of how many plans or objectives there are.
+    """
+    def count_status(status: ObjectiveStatus):
+        return func.coalesce(func.sum(case((LearningObjective.status == status, 1), else_=0)), 0)
+
+    return (
+        select(
+            DevelopmentPlan,
+            func.count(LearningObjective.id).label("total"),
+            count_status(ObjectiveStatus.COMPLETED).label("completed"),
+            count_status(ObjectiveStatus.IN_PROGRESS).label("in_progress"),
+            count_status(ObjectiveStatus.NOT_STARTED).label("not_started")
+        )
+        .outerjoin(LearningObjective, LearningObjective.plan_id == DevelopmentPlan.id)
+        .group_by(DevelopmentPlan.id)
+    )
+
+
+def plan_progress(row) -> Dict:
+    """API representation of a plan_progress_query row"""
+    plan, total, completed = row.DevelopmentPlan, row.total, row.completed
+    return {
+        "plan_id": plan.id,
+        "current_level": plan.current_level,
+        "target_level": plan.target_level,
+        "created_date": str(plan.created_date),
+        "target_date": str(plan.target_date) if plan.target_date else None,
+        "status": _label(plan.status),
+        "total_objectives": total,
+        "completed_objectives": completed,
+        "in_progress_objectives": row.in_progress,
+        "not_started_objectives": row.not_started,
+        "completion_percentage": round((completed / total * 100) if total > 0 else 0, 1)
+    }
+
+
 @router.get("/user-plans/{user_id}")
-def get_user_plans(user_id: int, db: Session = Depends(get_db)):
+@cached("plans:{user_id}")
+async def get_user_plans(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get all development plans for a user
 
@@ -371,48 +502,93 @@ def get_user_plans(user_id: int, db: Session = Depends(get_db)):
     Returns:
         List of development plans with progress
     """
-    plans = db.query(DevelopmentPlan).filter(
-        DevelopmentPlan.user_id == user_id
-    ).order_by(DevelopmentPlan.created_date.desc()).all()
-
-    result = []
-    for plan in plans:
-        objectives = plan.objectives
-        total = len(objectives)
-        completed = sum(1 for obj in objectives if obj.status == 'completed')
-        in_progress = sum(1 for obj in objectives if obj.status == 'in_progress')
-        not_started = sum(1 for obj in objectives if obj.status == 'not_started')
-
-        result.append({
-            "plan_id": plan.id,
-            "current_level": plan.current_level,
-            "target_level": plan.target_level,
-            "created_date": str(plan.created_date),
-            "target_date": str(plan.target_date) if plan.target_date else None,
-            "status": plan.status,
+    rows = (await db.execute(
+        plan_progress_query()
+        .filter(DevelopmentPlan.user_id == user_id)
+        .order_by(DevelopmentPlan.created_date.desc(), DevelopmentPlan.id.desc())
+    )).all()
+
+    result = [plan_progress(row) for row in rows]
+    return {"plans": result, "total": len(result)}
+
+
+@router.get("/plans/progress")
+@cached("plans")
+async def get_team_plan_progress(
+    user_ids: List[int] = Query(..., description="Users to report on (e.g. a manager's team)"),
+    status: Optional[str] = Query(None, description="Only plans with this status (active, completed, cancelled)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Development plan progress for many users in one query
+
+    Args:
+        user_ids: Users to include
+        status: Optional plan status filter
+
+    Returns:
+        Per-user plans with progress and objective totals across their plans
+    """
+    query = plan_progress_query().filter(DevelopmentPlan.user_id.in_(user_ids))
+    if status:
+        if status not in PlanStatus.labels():
+            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {PlanStatus.labels()}")
+        query = query.filter(DevelopmentPlan.status == PlanStatus.from_label(status))
+
+    rows = (await db.execute(
+        query.order_by(DevelopmentPlan.user_id, DevelopmentPlan.created_date.desc(), DevelopmentPlan.id.desc())
+    )).all()
+
+    by_user = {user_id: [] for user_id in dict.fromkeys(user_ids)}
+    for row in rows:
+        by_user[row.DevelopmentPlan.user_id].append(plan_progress(row))
+
+    users = []
+    for user_id, plans in by_user.items():
+        total = sum(plan["total_objectives"] for plan in plans)
+        completed = sum(plan["completed_objectives"] for plan in plans)
+        users.append({
+            "user_id": user_id,
+            "plans": plans,
+            "total_plans": len(plans),
             "total_objectives": total,
             "completed_objectives": completed,
-            "in_progress_objectives": in_progress,
-            "not_started_objectives": not_started,
             "completion_percentage": round((completed / total * 100) if total > 0 else 0, 1)
         })
 
-    return {"plans": result, "total": len(result)}
+    return {"users": users, "total_plans": len(rows)}
+
+
+def objective_conflict(objective_id: int, version: int, status) -> HTTPException:
+    """409 for an objective modified concurrently, with its current version and status"""
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": "Objectives were modified concurrently",
+            "conflicts": [{"id": objective_id, "version": version, "status": _label(status)}]
+        }
+    )
 
 
 @router.put("/objective/{objective_id}")
-def update_objective_status(objective_id: int, status: str, db: Session = Depends(get_db)):
+def update_objective_status(
+    objective_id: int,
+    status: str,
+    version: Optional[int] = Query(None, description="Version the client last read; the update fails with 409 if it has changed"),
+    db: Session = Depends(get_db)
+):
     """
     Update learning objective status
 
     Args:
         objective_id: Objective ID
         status: New status (not_started, in_progress, completed)
+        version: Version the client last read (optional, as for PATCH /objectives)
 
     Returns:
         Updated objective
     """
-    valid_statuses = ['not_started', 'in_progress', 'completed']
+    valid_statuses = ObjectiveStatus.labels()
     if status not in valid_statuses:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
 
@@ -420,20 +596,153 @@ def update_objective_status(objective_id: int, status: str, db: Session = Depend
 
     if not objective:
         raise HTTPException(status_code=404, detail="Objective not found")
-
-    objective.status = status
+    if version is not None and objective.version != version:
+        raise objective_conflict(objective.id, objective.version, objective.status)
+
+    objective.status = ObjectiveStatus.from_label(status)
+    try:
+        db.flush()
+    except StaleDataError:
+        # Another writer committed between the read and the versioned UPDATE
+        db.rollback()
+        latest = db.query(LearningObjective.version, LearningObjective.status).filter(
+            LearningObjective.id == objective_id
+        ).first()
+        if latest is None:
+            raise HTTPException(status_code=404, detail="Objective not found")
+        raise objective_conflict(objective_id, latest.version, latest.status)
+    roll_up_plan_status(db, {objective.plan_id})
     db.commit()
+    invalidate_plans(db, {objective.plan_id})
     db.refresh(objective)
 
     return {
         "id": objective.id,
         "description": objective.description,
-        "status": objective.status,
-        "priority": objective.priority,
+        "status": _label(objective.status),
+        "priority": _label(objective.priority),
+        "version": objective.version,
         "message": f"Objective status updated to '{status}'"
     }
 
 
+@router.patch("/objectives")
+def update_objective_statuses(request: ObjectiveStatusBatchUpdate, db: Session = Depends(get_db)):
+    """
+    Update the status of many learning objectives at once
+
+    Each item carries the version the client last read. Objectives are updated
+    with one UPDATE per target status, guarded by (id, version); if any of them
+    changed in the meantime nothing is written and 409 lists the conflicts.
+    Plans whose objectives are then all completed are marked completed, and
+    completed plans with an unfinished objective again are reopened.
+
+    Returns:
+        New versions of the updated objectives and the plans that were
+        completed or reopened
+    """
+    items = request.items
+    ids = [item.id for item in items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each objective may appear only once per request")
+
+    current = {
+        row.id: row for row in
+        db.query(LearningObjective.id, LearningObjective.plan_id, LearningObjective.version, LearningObjective.status)
+        .filter(LearningObjective.id.in_(ids))
+    }
+    missing = sorted(set(ids) - set(current))
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Objectives not found: {', '.join(str(m) for m in missing)}"
+        )
+
+    def conflicts(rows):
+        return [
+            {"id": item.id, "version": rows[item.id].version, "status": _label(rows[item.id].status)}
+            for item in items if rows[item.id].version != item.version
+        ]
+
+    stale = conflicts(current)
+    if stale:
+        raise HTTPException(status_code=409, detail={"message": "Objectives were modified concurrently", "conflicts": stale})
+
+    by_status = {}
+    for item in items:
+        by_status.setdefault(item.status, []).append((item.id, item.version))
+
+    updated = 0
+    for status, keys in by_status.items():
+        result = db.execute(
+            update(LearningObjective)
+            .where(tuple_(LearningObjective.id, LearningObjective.version).in_(keys))
+            .values(status=ObjectiveStatus.from_label(status), version=LearningObjective.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+
+    if updated != len(items):
+        # Another writer got in between the version check and the update
+        db.rollback()
+        latest = {
+            row.id: row for row in
+            db.query(LearningObjective.id, LearningObjective.version, LearningObjective.status)
+            .filter(LearningObjective.id.in_(ids))
+        }
+        raise HTTPException(status_code=409, detail={"message": "Objectives were modified concurrently", "conflicts": conflicts(latest)})
+
+    completed_plans, reopened_plans = roll_up_plan_status(db, {row.plan_id for row in current.values()})
+    db.commit()
+    invalidate_plans(db, {row.plan_id for row in current.values()})
+
+    return {
+        "updated": updated,
+        "objectives": [
+            {"id": item.id, "status": item.status, "version": item.version + 1}
+            for item in items
+        ],
+        "completed_plans": completed_plans,
+        "reopened_plans": reopened_plans
+    }
+
+
+def roll_up_plan_status(db: Session, plan_ids) -> Tuple[List[int], List[int]]:
+    """
+    Keep plan status in line with objective status: active plans whose
+    objectives are all completed are marked completed, and completed plans
+    with an unfinished objective are reopened (cancelled plans are left alone)
+
+    Returns:
+        Ids of the plans that were completed and of those that were reopened
+    """
+    unfinished = exists().where(
+        LearningObjective.plan_id == DevelopmentPlan.id,
+        LearningObjective.status != ObjectiveStatus.COMPLETED
+    )
+    has_objectives = exists().where(LearningObjective.plan_id == DevelopmentPlan.id)
+    completed, reopened = [], []
+    for plan_id, status, open_objectives in db.query(DevelopmentPlan.id, DevelopmentPlan.status, unfinished).filter(
+        DevelopmentPlan.id.in_(plan_ids),
+        DevelopmentPlan.status.in_([PlanStatus.ACTIVE, PlanStatus.COMPLETED]),
+        has_objectives
+    ):
+        if status == PlanStatus.ACTIVE and not open_objectives:
+            completed.append(plan_id)
+        elif status == PlanStatus.COMPLETED and open_objectives:
+            reopened.append(plan_id)
+
+    for ids, status in ((completed, PlanStatus.COMPLETED), (reopened, PlanStatus.ACTIVE)):
+        if ids:
+            db.execute(
+                update(DevelopmentPlan)
+                .where(DevelopmentPlan.id.in_(ids))
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            )
+    return completed, reopened
+
+
 @router.put("/plan/{plan_id}/status")
 def update_plan_status(plan_id: int, status: str, db: Session = Depends(get_db)):
     """
@@ -446,7 +755,7 @@ def update_plan_status(plan_id: int, status: str, db: Session = Depends(get_db))
     Returns:
         Updated plan
     """
-    valid_statuses = ['active', 'completed', 'cancelled']
+    valid_statuses = PlanStatus.labels()
     if status not in valid_statuses:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
 
@@ -455,12 +764,13 @@ def update_plan_status(plan_id: int, status: str, db: Session = Depends(get_db))
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
 
-    plan.status = status
+    plan.status = PlanStatus.from_label(status)
     db.commit()
+    invalidate_plans(db, {plan.id})
     db.refresh(plan)
 
     return {
         "plan_id": plan.id,
-        "status": plan.status,
+        "status": _label(plan.status),
         "message": f"Plan status updated to '{status}'"
     }
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from ..core.database import get_db
 from ..models.competency import Competency
 from ..schemas.competency import CompetencyCreate, CompetencyResponse
+from ..services.cache import response_cache
+from ..core.responses import RESPONSE_FORMATS, json_response, ndjson_response
 
 router = APIRouter(prefix="/competencies", tags=["competencies"])
 
@@ -18,14 +20,29 @@ def create_competency(
     db.add(db_competency)
     db.commit()
     db.refresh(db_competency)
+    response_cache.invalidate("competencies")
     return db_competency
 
 
 @router.get("/", response_model=List[CompetencyResponse])
-def list_competencies(db: Session = Depends(get_db)):
-    """Get all available competencies"""
-    competencies = db.query(Competency).all()
-    return competencies
+def list_competencies(
+    format: str = Query("json", pattern=RESPONSE_FORMATS, description="json, or ndjson to stream one competency per line"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get all available competencies
+
+    Rows come straight from the database columns, so they are serialized
+    without re-validating each one through CompetencyResponse.
+    """
+    rows = db.query(Competency.id, Competency.name, Competency.description, Competency.category).all()
+    competencies = [
+        {"id": row.id, "name": row.name, "description": row.description, "category": row.category.value}
+        for row in rows
+    ]
+    if format == "ndjson":
+        return ndjson_response(competencies)
+    return json_response(competencies)
 
 
 @router.get("/{competency_id}", response_model=CompetencyResponse)
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Query
+from sqlalchemy import select
+from ..models.user import User
+from ..models.competency import Competency
+from ..models.assessment import Assessment
+from ..models.career import CompetencyArea, DevelopmentPlan, LearningObjective
+from ..models.organization import JobRole
+from ..services.exports import EXPORT_FORMATS, export_response, stream_query
+from ..services.organization import with_organization
+from ..services.planisware import SKILLSET_CATEGORY_LABELS, SKILLSET_LEVELS
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+PLANISWARE_LEVEL_LABELS = {level: label for label, level in SKILLSET_LEVELS.items()}
+
+USER_COLUMNS = [
+    ("id", "int"), ("name", "str"), ("email", "str"), ("role", "str"),
+    ("region", "str"), ("country", "str"), ("location", "str")
+]
+
+# Planisware columns read by POST /import/planisware, plus the assessment date
+ASSESSMENT_COLUMNS = [
+    ("Name", "str"), ("Skillset Level", "str"), ("Skillset", "str"),
+    ("Skillsets.Description", "str"), ("Skillsets.Category", "str"), ("Skillsets.Role", "str"),
+    ("Resource Location", "str"), ("Resource Country", "str"), ("Resource Region", "str"),
+    ("Assessed At", "datetime")
+]
+
+PLAN_COLUMNS = [
+    ("plan_id", "int"), ("user_id", "int"), ("user_name", "str"), ("current_level", "str"),
+    ("target_level", "str"), ("created_date", "date"), ("target_date", "date"), ("plan_status", "str"),
+    ("objective_id", "int"), ("competency_area", "str"), ("objective", "str"), ("priority", "str"),
+    ("objective_status", "str")
+]
+
+
+def _label(member):
+    return member.label if member is not None else None
+
+
+@router.get("/users")
+def export_users(format: str = Query("csv", pattern=EXPORT_FORMATS)):
+    """All users, streamed as CSV, XLSX or Parquet"""
+    statement = with_organization(select(User.id, User.name, User.email, User.role)).order_by(User.id)
+    return export_response(format, "users", USER_COLUMNS, stream_query(
+        statement, lambda row: (row.id, row.name, row.email, row.role.value, row.region, row.country, row.location)
+    ))
+
+
+@router.get("/assessments")
+def export_assessments(format: str = Query("csv", pattern=EXPORT_FORMATS)):
+    """
+    All assessments in the Planisware skillset format
+
+    The CSV and XLSX files can be uploaded to POST /import/planisware as they
+    are; importing an export reproduces the same users, competencies and
+    proficiency levels.
+    """
+    statement = with_organization(
+        select(User.name, Assessment.proficiency_level, Competency.name.label("skillset"),
+               Competency.description, Competency.category, JobRole.name.label("job_role"), Assessment.assessed_at)
+        .select_from(Assessment)
+        .join(User, User.id == Assessment.user_id)
+        .join(Competency, Competency.id == Assessment.competency_id)
+        .outerjoin(JobRole, JobRole.id == Competency.job_role_id)
+    ).order_by(Assessment.id)
+    return export_response(format, "assessments", ASSESSMENT_COLUMNS, stream_query(
+        statement, lambda row: (
+            row.name, PLANISWARE_LEVEL_LABELS[row.proficiency_level], row.skillset, row.description,
+            SKILLSET_CATEGORY_LABELS[row.category], row.job_role, row.location, row.country, row.region,
+            row.assessed_at
+        )
+    ))
+
+
+@router.get("/plans")
+def export_plans(format: str = Query("csv", pattern=EXPORT_FORMATS)):
+    """Development plans with one row per learning objective (plans without objectives get one row)"""
+    statement = (
+        select(DevelopmentPlan.id, DevelopmentPlan.user_id, User.name, DevelopmentPlan.current_level,
+               DevelopmentPlan.target_level, DevelopmentPlan.created_date, DevelopmentPlan.target_date,
+               DevelopmentPlan.status, LearningObjective.id.label("objective_id"),
+               CompetencyArea.name.label("area"), LearningObjective.description,
+               LearningObjective.priority, LearningObjective.status.label("objective_status"))
+        .outerjoin(User, User.id == DevelopmentPlan.user_id)
+        .outerjoin(LearningObjective, LearningObjective.plan_id == DevelopmentPlan.id)
+        .outerjoin(CompetencyArea, CompetencyArea.id == LearningObjective.competency_area_id)
+        .order_by(DevelopmentPlan.id, LearningObjective.id)
+    )
+    return export_response(format, "plans", PLAN_COLUMNS, stream_query(
+        statement, lambda row: (
+            row.id, row.user_id, row.name, row.current_level, row.target_level, row.created_date,
+            row.target_date, _label(row.status), row.objective_id, row.area, row.description,
+            _label(row.priority), _label(row.objective_status)
+        )
+    ))
@@ -1,56 +1,41 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import Dict
-import pandas as pd
+from functools import lru_cache
 import tempfile
 import os
-from passlib.context import CryptContext
 from ..core.database import get_db
-from ..models.user import User, UserRole
-from ..models.competency import Competency, CompetencyCategory
-from ..models.assessment import Assessment, ProficiencyLevel
+from ..models.user import User
+from ..models.competency import Competency
+from ..models.assessment import Assessment
+from ..services.assessment_views import assessments_reloaded
+from ..services.cache import response_cache
+from ..services.competency_matrix import CompetencyMatrix
+from ..services.import_report import report_path
+from ..services.risk_report import refresh_competency_risk
 
 router = APIRouter(prefix="/import", tags=["import"])
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-
-def map_skillset_level_to_proficiency(level: str) -> ProficiencyLevel:
-    """Map Planisware skillset level to proficiency level"""
-    level_mapping = {
-        "1st": ProficiencyLevel.BEGINNER,
-        "2nd": ProficiencyLevel.INTERMEDIATE,
-        "3rd": ProficiencyLevel.ADVANCED,
-        "4th": ProficiencyLevel.EXPERT
-    }
-    return level_mapping.get(level, ProficiencyLevel.BEGINNER)
-
-
-def map_category_to_competency_category(category: str) -> CompetencyCategory:
-    """Map Planisware category to competency category"""
-    if pd.isna(category):
-        return CompetencyCategory.TECHNICAL
-
-    category = category.lower()
-
-    if "standard" in category or "advanced" in category:
-        return CompetencyCategory.TECHNICAL
-    elif "leadership" in category:
-        return CompetencyCategory.LEADERSHIP
-    elif "niche" in category or "domain" in category:
-        return CompetencyCategory.DOMAIN_KNOWLEDGE
-    else:
-        return CompetencyCategory.TECHNICAL
+@lru_cache(maxsize=None)
+def password_context():
+    """Password hashing context, created on first import rather than at startup"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 @router.post("/planisware")
-async def import_planisware_data(
+def import_planisware_data(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ) -> Dict:
     """
-    Import employee skillset data from Planisware Excel file
+    Import employee skillset data from a Planisware Excel file, or a CSV
+    file with the same columns (as written by GET /export/assessments)
+
+    Declared as a plain function so FastAPI runs the blocking parse and ORM
+    work in its threadpool instead of on the event loop.
 
     Expected columns:
     - Name (required)
@@ -64,123 +49,51 @@ async def import_planisware_data(
     - Resource Region
     """
 
+    # pandas and the import pipeline are only loaded once an import actually runs
+    import pandas as pd
+    from ..services.planisware import REQUIRED_COLUMNS
+    from ..services.planisware_import import ImportWriter, PlaniswareFile, import_workers
+
     # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename.endswith(('.xlsx', '.xls', '.csv')):
         raise HTTPException(
             status_code=400,
-            detail="Invalid file type. Please upload an Excel file (.xlsx or .xls)"
+            detail="Invalid file type. Please upload an Excel file (.xlsx or .xls) or a CSV file"
         )
+    is_csv = file.filename.endswith('.csv')
+    suffix = os.path.splitext(file.filename)[1]
 
     try:
         # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            content = file.file.read()
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
 
-        # Read Excel file
-        df = pd.read_excel(tmp_file_path)
+        # xlsx sheets are split into row ranges parsed by a process pool
+        source = PlaniswareFile(tmp_file_path, is_csv=is_csv)
 
         # Validate required columns
-        required_columns = ['Name', 'Skillset', 'Skillset Level']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in source.columns]
         if missing_columns:
             raise HTTPException(
                 status_code=400,
                 detail=f"Missing required columns: {', '.join(missing_columns)}"
             )
 
-        # Track statistics
-        stats = {
-            "users_created": 0,
-            "users_existing": 0,
-            "competencies_created": 0,
-            "competencies_existing": 0,
-            "assessments_created": 0,
-            "assessments_existing": 0,
-            "rows_processed": 0,
-            "rows_skipped": 0,
-            "errors": []
-        }
+        # Normalized chunks arrive in file order; this request is the only writer
+        writer = ImportWriter(db, lambda: password_context().hash('password123'))
+        for chunk in source.chunks(workers=import_workers()):
+            writer.write(chunk)
+        stats = writer.finish()
 
-        # Process each row
-        for idx, row in df.iterrows():
-            try:
-                # Extract data
-                name = row['Name']
-                skillset = row['Skillset']
-                skillset_level = row['Skillset Level']
-                description = row.get('Skillsets.Description', '')
-                category = row.get('Skillsets.Category', '')
-
-                # Skip if essential data is missing
-                if pd.isna(name) or pd.isna(skillset):
-                    stats["rows_skipped"] += 1
-                    continue
-
-                # Create/Get User
-                email = name.lower().replace(' ', '.') + '@bosch.com'
-                user = db.query(User).filter(User.email == email).first()
-
-                if not user:
-                    user = User(
-                        email=email,
-                        name=name,
-                        role=UserRole.EMPLOYEE,
-                        hashed_password=pwd_context.hash('password123')
-                    )
-                    db.add(user)
-                    db.flush()
-                    stats["users_created"] += 1
-                else:
-                    stats["users_existing"] += 1
-
-                # Create/Get Competency
-                competency = db.query(Competency).filter(
-                    Competency.name == skillset
-                ).first()
-
-                if not competency:
-                    comp_category = map_category_to_competency_category(category)
-                    competency = Competency(
-                        name=skillset,
-                        description=description if not pd.isna(description) else None,
-                        category=comp_category
-                    )
-                    db.add(competency)
-                    db.flush()
-                    stats["competencies_created"] += 1
-                else:
-                    stats["competencies_existing"] += 1
-
-                # Create Assessment
-                proficiency = map_skillset_level_to_proficiency(skillset_level)
-
-                existing_assessment = db.query(Assessment).filter(
-                    Assessment.user_id == user.id,
-                    Assessment.competency_id == competency.id,
-                    Assessment.proficiency_level == proficiency
-                ).first()
-
-                if not existing_assessment:
-                    assessment = Assessment(
-                        user_id=user.id,
-                        competency_id=competency.id,
-                        proficiency_level=proficiency
-                    )
-                    db.add(assessment)
-                    stats["assessments_created"] += 1
-                else:
-                    stats["assessments_existing"] += 1
-
-                stats["rows_processed"] += 1
-
-            except Exception as e:
-                stats["errors"].append(f"Row {idx}: {str(e)}")
-                continue
+        # Materialize the bus-factor / coverage report in the import's transaction
+        refresh_competency_risk(db, matrix=CompetencyMatrix())
 
         # Commit all changes
         db.commit()
+        assessments_reloaded()
+        response_cache.invalidate("users", "competencies")
 
         # Clean up temporary file
         os.unlink(tmp_file_path)
@@ -191,6 +104,11 @@ async def import_planisware_data(
             "statistics": stats
         }
 
+    except HTTPException:
+        db.rollback()
+        if 'tmp_file_path' in locals():
+            os.unlink(tmp_file_path)
+        raise
     except pd.errors.EmptyDataError:
         raise HTTPException(status_code=400, detail="The Excel file is empty")
     except Exception as e:
@@ -204,6 +122,15 @@ async def import_planisware_data(
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
 
+@router.get("/reports/{report_id}")
+def download_import_report(report_id: str):
+    """All issues found by an import, as CSV (the error_report of its statistics)"""
+    path = report_path(report_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Import report not found")
+    return FileResponse(path, media_type="text/csv", filename=f"import-issues-{report_id}.csv")
+
+
 @router.get("/status")
 def get_import_status(db: Session = Depends(get_db)):
     """Get current database statistics"""
@@ -1,29 +1,33 @@
 """Skills catalog API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional
-import json
-from pathlib import Path
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db, upsert
 from app.models.career import Skill, UserSkill
+from app.models.user import User
+from app.models.assessment import ProficiencyLevel
+from app.schemas.skill import UserSkillBulkUpsert
+from app.services.recommendations import recommendation_engine, SKILL
+from app.services.cache import cached, response_cache
+from app.services.reference_snapshot import reference_snapshot
+from app.core.responses import RESPONSE_FORMATS, ndjson_response
 
 router = APIRouter(prefix="/api/skills", tags=["skills"])
 
-
-def load_tech_skills_json():
-    """Load TechMasterData.json"""
-    file_path = Path(__file__).parent.parent.parent.parent / 'TechMasterData.json'
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+VALID_PROFICIENCY_LEVELS = ProficiencyLevel.labels()
 
 
 @router.get("/catalog")
-def get_skills_catalog(
+@cached("skills")
+async def get_skills_catalog(
     category: Optional[str] = None,
     search: Optional[str] = None,
     skill_type: Optional[str] = Query(None, description="Filter by: data, tech, or all"),
-    db: Session = Depends(get_db)
+    format: str = Query("json", pattern=RESPONSE_FORMATS, description="json, or ndjson to stream one skill per line"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get skills catalog with optional filtering
@@ -32,11 +36,16 @@ def get_skills_catalog(
         category: Filter by parent category
         search: Search in skill name or description
         skill_type: Filter by skill type (data, tech, or all)
+        format: Response format (json or ndjson)
 
     Returns:
         List of skills
     """
-    query = db.query(Skill)
+    # Plain columns: the rows are serialized directly, no ORM entities needed
+    query = select(
+        Skill.id, Skill.name, Skill.parent_category, Skill.description,
+        Skill.category, Skill.roles, Skill.is_data_skill
+    )
 
     # Filter by skill type
     if skill_type == 'data':
@@ -56,27 +65,32 @@ def get_skills_catalog(
             (Skill.description.ilike(search_term))
         )
 
-    skills = query.all()
+    rows = (await db.execute(query.order_by(Skill.id))).all()
+    skills = [
+        {
+            "id": skill.id,
+            "name": skill.name,
+            "category": skill.parent_category,
+            "description": skill.description,
+            "skill_category": skill.category,
+            "roles": skill.roles,
+            "is_data_skill": bool(skill.is_data_skill)
+        }
+        for skill in rows
+    ]
+
+    if format == "ndjson":
+        return ndjson_response(skills, headers={"X-Total-Count": str(len(skills))})
 
     return {
-        "skills": [
-            {
-                "id": skill.id,
-                "name": skill.name,
-                "category": skill.parent_category,
-                "description": skill.description,
-                "skill_category": skill.category,
-                "roles": skill.roles,
-                "is_data_skill": bool(skill.is_data_skill)
-            }
-            for skill in skills
-        ],
+        "skills": skills,
         "total": len(skills)
     }
 
 
 @router.get("/categories")
-def get_skill_categories(db: Session = Depends(get_db)):
+@cached("skills")
+async def get_skill_categories(db: AsyncSession = Depends(get_async_db)):
     """
     Get all unique skill categories
 
@@ -84,18 +98,20 @@ def get_skill_categories(db: Session = Depends(get_db)):
         List of categories with skill counts
     """
     # Get unique parent categories
-    from sqlalchemy import func
-
-    categories = db.query(
-        Skill.parent_category,
-        func.count(Skill.id).label('count')
-    ).group_by(Skill.parent_category).all()
+    categories = (await db.execute(
+        select(
+            Skill.parent_category,
+            func.count(Skill.id).label('count')
+        ).group_by(Skill.parent_category)
+    )).all()
 
     # Also get skill categories (Standard, Advanced, etc.)
-    skill_categories = db.query(
-        Skill.category,
-        func.count(Skill.id).label('count')
-    ).filter(Skill.category.isnot(None)).group_by(Skill.category).all()
+    skill_categories = (await db.execute(
+        select(
+            Skill.category,
+            func.count(Skill.id).label('count')
+        ).filter(Skill.category.isnot(None)).group_by(Skill.category)
+    )).all()
 
     return {
         "parent_categories": [
@@ -123,16 +139,12 @@ def get_hierarchical_skills():
     Returns:
         Hierarchical skill structure
     """
-    tech_data = load_tech_skills_json()
-
-    return {
-        "hierarchical": tech_data['hierarchical'],
-        "metadata": tech_data['metadata']
-    }
+    return reference_snapshot().hierarchical_skills
 
 
 @router.get("/recommend/{pay_class}")
-def recommend_skills(pay_class: str, db: Session = Depends(get_db)):
+@cached("skills", "career")
+async def recommend_skills(pay_class: str, db: AsyncSession = Depends(get_async_db)):
     """
     Recommend skills for a specific career level
 
@@ -154,10 +166,12 @@ def recommend_skills(pay_class: str, db: Session = Depends(get_db)):
     recommended_categories = proficiency_map.get(pay_class, ['Standard'])
 
     # Get skills from database
-    skills = db.query(Skill).filter(
-        Skill.category.in_(recommended_categories),
-        Skill.category != 'Inactive'
-    ).all()
+    skills = (await db.scalars(
+        select(Skill).filter(
+            Skill.category.in_(recommended_categories),
+            Skill.category != 'Inactive'
+        ).order_by(Skill.id)
+    )).all()
 
     # Group by category
     categorized_skills = {}
@@ -202,11 +216,10 @@ def add_user_skill(
     from datetime import date
 
     # Validate proficiency level
-    valid_levels = ['beginner', 'intermediate', 'advanced', 'expert']
-    if proficiency_level not in valid_levels:
+    if proficiency_level not in VALID_PROFICIENCY_LEVELS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid proficiency level. Must be one of: {', '.join(valid_levels)}"
+            detail=f"Invalid proficiency level. Must be one of: {', '.join(VALID_PROFICIENCY_LEVELS)}"
         )
 
     # Check if skill exists
@@ -222,20 +235,21 @@ def add_user_skill(
 
     if user_skill:
         # Update existing
-        user_skill.proficiency_level = proficiency_level
+        user_skill.proficiency_level = ProficiencyLevel.from_label(proficiency_level)
         user_skill.last_assessed = date.today()
     else:
         # Create new
         user_skill = UserSkill(
             user_id=user_id,
             skill_id=skill_id,
-            proficiency_level=proficiency_level,
+            proficiency_level=ProficiencyLevel.from_label(proficiency_level),
             last_assessed=date.today()
         )
         db.add(user_skill)
 
     db.commit()
     db.refresh(user_skill)
+    response_cache.invalidate(f"user:{user_id}")
 
     return {
         "id": user_skill.id,
@@ -245,35 +259,110 @@ def add_user_skill(
             "name": skill.name,
             "category": skill.parent_category
         },
-        "proficiency_level": user_skill.proficiency_level,
+        "proficiency_level": user_skill.proficiency_level.label,
         "last_assessed": str(user_skill.last_assessed)
     }
 
 
+@router.post("/user-skills/bulk")
+def add_user_skills_bulk(request: UserSkillBulkUpsert, db: Session = Depends(get_db)):
+    """
+    Add or update many user skill assessments in one transaction
+
+    Accepts entries for one or many users. Users and skills are each validated
+    with a single query and rows are written with an upsert on (user_id, skill_id); when the
+    same pair appears more than once the last entry wins.
+
+    Returns:
+        Number of user skills written and the affected users
+    """
+    from datetime import date
+
+    user_ids = {item.user_id for item in request.items}
+    existing_users = {
+        user_id for (user_id,) in
+        db.query(User.id).filter(User.id.in_(user_ids))
+    }
+    missing_users = sorted(user_ids - existing_users)
+    if missing_users:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Users not found: {', '.join(str(m) for m in missing_users)}"
+        )
+
+    skill_ids = {item.skill_id for item in request.items}
+    existing_ids = {
+        skill_id for (skill_id,) in
+        db.query(Skill.id).filter(Skill.id.in_(skill_ids))
+    }
+    missing = sorted(skill_ids - existing_ids)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Skills not found: {', '.join(str(m) for m in missing)}"
+        )
+
+    today = date.today()
+    rows = {
+        (item.user_id, item.skill_id): {
+            "user_id": item.user_id,
+            "skill_id": item.skill_id,
+            "proficiency_level": ProficiencyLevel.from_label(item.proficiency_level),
+            "last_assessed": today
+        }
+        for item in request.items
+    }
+    upsert(
+        db,
+        UserSkill,
+        list(rows.values()),
+        index_elements=["user_id", "skill_id"],
+        update_columns=["proficiency_level", "last_assessed"]
+    )
+    db.commit()
+    response_cache.invalidate(*{f"user:{user_id}" for user_id, _ in rows})
+
+    return {
+        "user_skills_upserted": len(rows),
+        "user_ids": sorted({user_id for user_id, _ in rows})
+    }
+
+
 @router.get("/user-skills/{user_id}")
-def get_user_skills(user_id: int, db: Session = Depends(get_db)):
+@cached("user:{user_id}", "profiles", "skills")
+async def get_user_skills(
+    user_id: int,
+    min_level: int = Query(1, ge=1, le=4, description="Minimum proficiency level (1-4)"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Get all skills for a specific user
 
     Args:
         user_id: User ID
+        min_level: Only skills at this proficiency level or above
 
     Returns:
         List of user skills with proficiency levels
     """
-    user_skills = db.query(UserSkill).filter(UserSkill.user_id == user_id).all()
+    user_skills = (await db.execute(
+        select(UserSkill, Skill)
+        .join(Skill, Skill.id == UserSkill.skill_id)
+        .filter(UserSkill.user_id == user_id, UserSkill.proficiency_level >= min_level)
+        .order_by(UserSkill.id)
+    )).all()
 
     skills_data = []
-    for us in user_skills:
+    for us, skill in user_skills:
         skills_data.append({
             "id": us.id,
             "skill": {
-                "id": us.skill.id,
-                "name": us.skill.name,
-                "category": us.skill.parent_category,
-                "description": us.skill.description
+                "id": skill.id,
+                "name": skill.name,
+                "category": skill.parent_category,
+                "description": skill.description
             },
-            "proficiency_level": us.proficiency_level,
+            "proficiency_level": us.proficiency_level.label,
             "last_assessed": str(us.last_assessed) if us.last_assessed else None
         })
 
@@ -294,7 +383,8 @@ def get_user_skills(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{skill_id}")
-def get_skill_details(skill_id: int, db: Session = Depends(get_db)):
+@cached("skills")
+async def get_skill_details(skill_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed information about a specific skill
 
@@ -304,7 +394,7 @@ def get_skill_details(skill_id: int, db: Session = Depends(get_db)):
     Returns:
         Skill details
     """
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    skill = await db.get(Skill, skill_id)
 
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
@@ -318,3 +408,43 @@ def get_skill_details(skill_id: int, db: Session = Depends(get_db)):
         "roles": skill.roles,
         "is_data_skill": bool(skill.is_data_skill)
     }
+
+
+@router.get("/{skill_id}/related")
+def get_related_skills(
+    skill_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Get skills that usually co-occur with a specific skill
+
+    Args:
+        skill_id: Skill ID
+        limit: Maximum number of related skills
+
+    Returns:
+        Related skills ranked by cosine similarity of their holders
+    """
+    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+
+    if not skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
+
+    recommendation_engine.ensure_loaded(db)
+    related = recommendation_engine.related(SKILL, skill_id, limit)
+    skills = {s.id: s for s in db.query(Skill).filter(Skill.id.in_([sid for sid, _ in related]))}
+
+    return {
+        "skill_id": skill_id,
+        "related_skills": [
+            {
+                "id": sid,
+                "name": skills[sid].name,
+                "category": skills[sid].parent_category,
+                "similarity": round(score, 3)
+            }
+            for sid, score in related
+            if sid in skills
+        ]
+    }
@@ -1,22 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional, Dict, Any
-import httpx
-from ..core.database import get_db
+import time
+from ..core.database import get_db, get_async_db, SessionLocal
+from ..core.metrics import llm_wait
 from ..models.user import User
 from ..models.competency import Competency, CompetencyCategory
 from ..models.assessment import Assessment, ProficiencyLevel
+from ..schemas.search import SkillSearchRequest
+from ..services.cache import cached
+from ..core.responses import RESPONSE_FORMATS, ndjson_response
+from ..services.organization import OrganizationFilter, organization_filter, organization_of, with_organization
+from ..services.skill_index import skill_index
+from ..services.recommendations import recommendation_engine
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/")
-def get_users(
+@cached("users", "assessments")
+async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    format: str = Query("json", pattern=RESPONSE_FORMATS),
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Get list of all users with optional search
@@ -25,8 +37,10 @@ def get_users(
     - skip: Number of records to skip (pagination)
     - limit: Maximum number of records to return
     - search: Search by name or email
+    - region, country, location, job_role: Planisware organization filters (exact names)
+    - format: json, or ndjson to stream one user per line (total in X-Total-Count)
     """
-    query = db.query(User)
+    query = select(User).filter(*organization.conditions())
 
     # Apply search filter if provided
     if search:
@@ -37,26 +51,34 @@ def get_users(
         )
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Apply pagination
-    users = query.offset(skip).limit(limit).all()
+    rows = (await db.execute(with_organization(query.order_by(User.id).offset(skip).limit(limit)))).all()
+    users = [row.User for row in rows]
 
-    # Enrich user data with skill counts
-    user_list = []
-    for user in users:
-        skills_count = db.query(Assessment).filter(
-            Assessment.user_id == user.id
-        ).count()
+    # Skill counts for the whole page in one grouped query
+    skills_counts = dict((await db.execute(
+        select(Assessment.user_id, func.count(Assessment.id))
+        .filter(Assessment.user_id.in_([user.id for user in users]))
+        .group_by(Assessment.user_id)
+    )).all())
 
+    user_list = []
+    for row in rows:
+        user = row.User
         user_list.append({
             "id": user.id,
             "name": user.name,
             "email": user.email,
             "role": user.role.value,
-            "skills_count": skills_count
+            **organization_of(row),
+            "skills_count": skills_counts.get(user.id, 0)
         })
 
+    if format == "ndjson":
+        return ndjson_response(user_list, headers={"X-Total-Count": str(total)})
+
     return {
         "total": total,
         "skip": skip,
@@ -66,78 +88,84 @@ def get_users(
 
 
 @router.get("/{user_id}")
-def get_user(user_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+@cached("user:{user_id}", "profiles", "competencies")
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
     """Get detailed information about a specific user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    row = (await db.execute(with_organization(select(User).filter(User.id == user_id)))).first()
 
-    if not user:
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
-
-    # Get skills count
-    skills_count = db.query(Assessment).filter(
-        Assessment.user_id == user_id
-    ).count()
+    user = row.User
 
     # Get skills by category
-    skills_by_category = {}
-    for category in CompetencyCategory:
-        count = db.query(Assessment).join(Competency).filter(
-            Assessment.user_id == user_id,
-            Competency.category == category
-        ).count()
-        if count > 0:
-            skills_by_category[category.value] = count
+    category_counts = dict((await db.execute(
+        select(Competency.category, func.count(Assessment.id))
+        .join(Competency, Competency.id == Assessment.competency_id)
+        .filter(Assessment.user_id == user_id)
+        .group_by(Competency.category)
+    )).all())
+    skills_by_category = {
+        category.value: category_counts[category]
+        for category in CompetencyCategory
+        if category_counts.get(category, 0) > 0
+    }
+
+    # Get skills count
+    skills_count = await db.scalar(
+        select(func.count(Assessment.id)).filter(Assessment.user_id == user_id)
+    )
 
     return {
         "id": user.id,
         "name": user.name,
         "email": user.email,
         "role": user.role.value,
+        **organization_of(row),
         "skills_count": skills_count,
         "skills_by_category": skills_by_category
     }
 
 
 @router.get("/{user_id}/skills")
-def get_user_skills(user_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+@cached("user:{user_id}", "profiles", "competencies")
+async def get_user_skills(user_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
     """Get all skills/competencies for a specific user grouped by category"""
-    user = db.query(User).filter(User.id == user_id).first()
+    row = (await db.execute(with_organization(select(User).filter(User.id == user_id)))).first()
 
-    if not user:
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
+    user = row.User
 
-    # Get all assessments for the user
-    assessments = db.query(Assessment).filter(
-        Assessment.user_id == user_id
-    ).all()
+    # Get all assessments for the user together with their competencies
+    rows = (await db.execute(
+        select(Assessment, Competency)
+        .join(Competency, Competency.id == Assessment.competency_id)
+        .filter(Assessment.user_id == user_id)
+        .order_by(Assessment.id)
+    )).all()
 
     # Group by category
     skills_by_category = {}
     total_skills = 0
 
-    for assessment in assessments:
-        competency = db.query(Competency).filter(
-            Competency.id == assessment.competency_id
-        ).first()
-
-        if competency:
-            category = competency.category.value
+    for assessment, competency in rows:
+        category = competency.category.value
 
-            if category not in skills_by_category:
-                skills_by_category[category] = {
-                    "category": category,
-                    "competencies": []
-                }
+        if category not in skills_by_category:
+            skills_by_category[category] = {
+                "category": category,
+                "competencies": []
+            }
 
-            skills_by_category[category]["competencies"].append({
-                "id": competency.id,
-                "name": competency.name,
-                "description": competency.description,
-                "proficiency_level": assessment.proficiency_level.value,
-                "proficiency_name": assessment.proficiency_level.name,
-                "assessed_at": assessment.assessed_at.isoformat() if assessment.assessed_at else None
-            })
-            total_skills += 1
+        skills_by_category[category]["competencies"].append({
+            "id": competency.id,
+            "name": competency.name,
+            "description": competency.description,
+            "proficiency_level": assessment.proficiency_level.value,
+            "proficiency_name": assessment.proficiency_level.name,
+            "assessed_at": assessment.assessed_at.isoformat() if assessment.assessed_at else None
+        })
+        total_skills += 1
 
     # Convert to list and sort by category
     skills_list = list(skills_by_category.values())
@@ -153,7 +181,8 @@ def get_user_skills(user_id: int, db: Session = Depends(get_db)) -> Dict[str, An
             "id": user.id,
             "name": user.name,
             "email": user.email,
-            "role": user.role.value
+            "role": user.role.value,
+            **organization_of(row)
         },
         "skills": skills_list,
         "total_skills": total_skills,
@@ -162,22 +191,29 @@ def get_user_skills(user_id: int, db: Session = Depends(get_db)) -> Dict[str, An
 
 
 @router.get("/search/by-skill/{competency_id}")
-def get_users_by_skill(
+async def get_users_by_skill(
     competency_id: int,
-    db: Session = Depends(get_db)
+    min_level: int = Query(1, ge=1, le=4, description="Minimum proficiency level (1-4)"),
+    organization: OrganizationFilter = Depends(organization_filter),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
-    """Get all users who have a specific skill/competency"""
-    competency = db.query(Competency).filter(
-        Competency.id == competency_id
-    ).first()
+    """
+    Get all users who have a specific skill/competency at min_level or above,
+    optionally only in one region, country, location or job role
+    """
+    competency = await db.get(Competency, competency_id)
 
     if not competency:
         raise HTTPException(status_code=404, detail="Competency not found")
 
     # Get all users with this competency
-    assessments = db.query(Assessment).filter(
-        Assessment.competency_id == competency_id
-    ).all()
+    rows = (await db.execute(with_organization(
+        select(Assessment, User)
+        .join(User, User.id == Assessment.user_id)
+        .filter(Assessment.competency_id == competency_id, Assessment.proficiency_level >= min_level)
+        .filter(*organization.conditions())
+        .order_by(Assessment.id)
+    ))).all()
 
     users_with_skill = []
     proficiency_distribution = {
@@ -187,18 +223,18 @@ def get_users_by_skill(
         "EXPERT": 0
     }
 
-    for assessment in assessments:
-        user = db.query(User).filter(User.id == assessment.user_id).first()
-        if user:
-            users_with_skill.append({
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "proficiency_level": assessment.proficiency_level.value,
-                "proficiency_name": assessment.proficiency_level.name,
-                "assessed_at": assessment.assessed_at.isoformat() if assessment.assessed_at else None
-            })
-            proficiency_distribution[assessment.proficiency_level.name] += 1
+    for row in rows:
+        assessment, user = row.Assessment, row.User
+        users_with_skill.append({
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            **organization_of(row),
+            "proficiency_level": assessment.proficiency_level.value,
+            "proficiency_name": assessment.proficiency_level.name,
+            "assessed_at": assessment.assessed_at.isoformat() if assessment.assessed_at else None
+        })
+        proficiency_distribution[assessment.proficiency_level.name] += 1
 
     return {
         "competency": {
@@ -213,24 +249,137 @@ def get_users_by_skill(
     }
 
 
+@router.get("/{user_id}/similar")
+def get_similar_users(
+    user_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Users with the most similar skill profiles (cosine similarity of proficiency vectors)"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    recommendation_engine.ensure_loaded(db)
+    neighbors = recommendation_engine.similar_users(user_id, limit)
+    users = {u.id: u for u in db.query(User).filter(User.id.in_([uid for uid, _ in neighbors]))}
+
+    return {
+        "user_id": user_id,
+        "similar_users": [
+            {
+                "id": uid,
+                "name": users[uid].name,
+                "email": users[uid].email,
+                "similarity": round(score, 3)
+            }
+            for uid, score in neighbors
+            if uid in users
+        ]
+    }
+
+
+@router.post("/search/skills")
+def search_users_by_skills(
+    request: SkillSearchRequest,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Find users by several competencies and minimum levels
+
+    Users must satisfy every `all_of` clause and, when given, at least one
+    `any_of` clause. Matches are ranked by their combined proficiency over the
+    queried competencies and answered from the in-memory skill index; the
+    optional region, country, location and job_role narrow the candidates
+    with an indexed query first.
+    """
+    if not request.all_of and not request.any_of:
+        raise HTTPException(status_code=400, detail="At least one skill clause is required")
+
+    started = time.perf_counter()
+    organization = OrganizationFilter(request.region, request.country, request.location, request.job_role)
+    skill_index.ensure_loaded(db)
+    total, ranked = skill_index.search(
+        all_of=[(c.competency_id, c.min_level.value) for c in request.all_of],
+        any_of=[(c.competency_id, c.min_level.value) for c in request.any_of],
+        limit=request.limit,
+        user_ids=organization.user_ids(db)
+    )
+
+    user_ids = [match["user_id"] for match in ranked]
+    users = {row.User.id: row for row in db.execute(with_organization(select(User).filter(User.id.in_(user_ids))))}
+    competency_ids = {c.competency_id for c in request.all_of + request.any_of}
+    competency_names = dict(
+        db.query(Competency.id, Competency.name).filter(Competency.id.in_(competency_ids))
+    )
+
+    results = []
+    for match in ranked:
+        row = users.get(match["user_id"])
+        if not row:
+            continue
+        user = row.User
+        results.append({
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            **organization_of(row),
+            "score": match["score"],
+            "skills": [
+                {
+                    "competency_id": competency_id,
+                    "name": competency_names.get(competency_id),
+                    "proficiency_level": level,
+                    "proficiency_name": ProficiencyLevel(level).name
+                }
+                for competency_id, level in match["levels"].items()
+            ]
+        })
+
+    return {
+        "total_matches": total,
+        "users": results,
+        "query_time_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def _peer_context(user_id: int):
+    """Similar-colleague count and competencies they hold that the user lacks"""
+    db = SessionLocal()
+    try:
+        recommendation_engine.ensure_loaded(db)
+        suggestions = recommendation_engine.suggested_competencies(user_id)
+        suggested_names = dict(
+            db.query(Competency.id, Competency.name).filter(
+                Competency.id.in_([cid for cid, _ in suggestions])
+            )
+        )
+    finally:
+        db.close()
+    return len(recommendation_engine.similar_users(user_id)), suggestions, suggested_names
+
+
 @router.post("/{user_id}/analyze-skills")
 async def analyze_user_skills(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Analyze user's skills with LLM to identify gaps, recommendations, and career paths
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Get user's skills
-    assessments = db.query(Assessment).filter(
-        Assessment.user_id == user_id
-    ).all()
-
-    if not assessments:
+    rows = (await db.execute(
+        select(Assessment, Competency)
+        .join(Competency, Competency.id == Assessment.competency_id)
+        .filter(Assessment.user_id == user_id)
+        .order_by(Assessment.id)
+    )).all()
+
+    if not rows:
         raise HTTPException(
             status_code=400,
             detail="User has no skills to analyze"
@@ -240,25 +389,29 @@ async def analyze_user_skills(
     skills_data = []
     skills_by_category = {}
 
-    for assessment in assessments:
-        competency = db.query(Competency).filter(
-            Competency.id == assessment.competency_id
-        ).first()
-
-        if competency:
-            skill_info = {
-                "name": competency.name,
-                "category": competency.category.value,
-                "proficiency": assessment.proficiency_level.name,
-                "description": competency.description or ""
-            }
-            skills_data.append(skill_info)
-
-            # Group by category
-            category = competency.category.value
-            if category not in skills_by_category:
-                skills_by_category[category] = []
-            skills_by_category[category].append(skill_info)
+    for assessment, competency in rows:
+        skill_info = {
+            "name": competency.name,
+            "category": competency.category.value,
+            "proficiency": assessment.proficiency_level.name,
+            "description": competency.description or ""
+        }
+        skills_data.append(skill_info)
+
+        # Group by category
+        category = competency.category.value
+        if category not in skills_by_category:
+            skills_by_category[category] = []
+        skills_by_category[category].append(skill_info)
+
+    # Deterministic peer context; building the neighbor cache is CPU-bound,
+    # so it runs in the threadpool instead of on the event loop
+    similar_count, suggestions, suggested_names = await run_in_threadpool(_peer_context, user_id)
+    peer_summary = "\n".join([
+        f"- {suggested_names[cid]}"
+        for cid, _ in suggestions
+        if cid in suggested_names
+    ]) or "- No peer data available"
 
     # Build LLM prompt
     skills_summary = "\n".join([
@@ -282,6 +435,9 @@ Provide specific, practical recommendations."""
 **Skills by Category:**
 {chr(10).join([f"- {cat}: {len(skills)} skills" for cat, skills in skills_by_category.items()])}
 
+**Skills Common Among {similar_count} Colleagues With Similar Profiles (not yet held):**
+{peer_summary}
+
 Please provide:
 
 1. **Skill Gaps Analysis:**
@@ -305,18 +461,21 @@ Please provide:
 
 Format your response in clear sections with bullet points. Be specific and actionable."""
 
+    import httpx  # Deferred to first use to keep worker startup fast
+
     try:
         # Call LLM API endpoint
         async with httpx.AsyncClient() as client:
-            llm_response = await client.post(
-                "http://localhost:8000/api/llm/chat",
-                json={
-                    "user_content": user_prompt,
-                    "system_content": system_prompt,
-                    "max_tokens": 2000
-                },
-                timeout=60.0
-            )
+            with llm_wait():
+                llm_response = await client.post(
+                    "http://localhost:8000/api/llm/chat",
+                    json={
+                        "user_content": user_prompt,
+                        "system_content": system_prompt,
+                        "max_tokens": 2000
+                    },
+                    timeout=60.0
+                )
             llm_response.raise_for_status()
             llm_data = llm_response.json()
 
@@ -331,6 +490,11 @@ Format your response in clear sections with bullet points. Be specific and actio
             "skills_by_category": {
                 cat: len(skills) for cat, skills in skills_by_category.items()
             },
+            "peer_suggestions": [
+                {"id": cid, "name": suggested_names[cid], "score": score}
+                for cid, score in suggestions
+                if cid in suggested_names
+            ],
             "analysis": llm_data.get("content", [{}])[0].get("text", ""),
             "model_used": llm_data.get("model", "unknown")
         }
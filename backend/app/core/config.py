@@ -8,6 +8,58 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Connection pool (server databases such as PostgreSQL)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite connection pragmas
+    SQLITE_WAL: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+
+    # Response cache: "memory" (per worker LRU, invalidated through the database),
+    # "redis" (shared) or "none"
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Request metrics (/metrics, Server-Timing); requests repeating one
+    # single-row SQL statement more often than the threshold are logged as
+    # likely N+1 patterns
+    METRICS_ENABLED: bool = True
+    METRICS_N_PLUS_ONE_REPEATS: int = 20
+
+    # Profiling: every request (PROFILING_ENABLED), or requests sent with
+    # "X-Profile: 1" and a matching X-Admin-Token; keeps the slowest per route
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "./profiles"
+    PROFILING_SLOWEST_PER_ROUTE: int = 5
+    PROFILING_INTERVAL_MS: float = 1.0
+
+    # Shared secret for admin endpoints (X-Admin-Token); admin endpoints are off when empty
+    ADMIN_TOKEN: str = ""
+
+    # Run migrations in each worker's lifespan instead of once in run.py
+    MIGRATE_ON_STARTUP: bool = False
+
+    # Apply CareerFramework.json / TechMasterData.json / Skillsets.json after
+    # migrating; unchanged files cost one query per table
+    LOAD_REFERENCE_DATA_ON_STARTUP: bool = True
+
+    # Compiled reference data (build_reference_snapshot.py), relative to backend/
+    REFERENCE_SNAPSHOT_PATH: str = "reference_data.snapshot"
+
+    # Processes parsing xlsx imports (at most one per CPU); 0 = one per CPU, 1 = parse in the request thread
+    IMPORT_WORKERS: int = 0
+
+    # Full issue lists of imports (GET /import/reports/{id}); the newest 20 are kept
+    IMPORT_REPORT_DIR: str = "./import_reports"
+
     # LLM Farm Configuration - Bosch LLM Farm
     LLM_FARM_BASE_URL: str = "https://aoai-farm.bosch-temp.com/api/google/v1"
     LLM_FARM_API_KEY: str = ""
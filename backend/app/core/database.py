@@ -1,20 +1,102 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from typing import List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .metrics import install_query_hooks
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+
+def sqlite_pragmas() -> List[str]:
+    """PRAGMA statements applied to every new SQLite connection"""
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY"
+    ]
+    if settings.SQLITE_WAL:
+        # WAL lets readers proceed while an import is writing; NORMAL sync is
+        # durable across application crashes in WAL mode
+        pragmas += ["PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"]
+    return pragmas
+
+
+def async_database_url(url: str) -> str:
+    """Async driver URL for a sync database URL (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgresql+psycopg2:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+            }
+        }
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+
+def _install_pragmas(sync_engine, statements: List[str]) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+def create_db_engine(url: str, pragmas: Optional[List[str]] = None):
+    """
+    Create an engine with the profile for the database backend
+
+    SQLite connections get the pragmas from `sqlite_pragmas()` (or the given
+    list) on connect; server databases get a sized, pre-pinged pool. Statements
+    are counted and timed for request metrics.
+    """
+    engine = create_engine(url, **_engine_options(url))
+    if url.startswith("sqlite"):
+        _install_pragmas(engine, sqlite_pragmas() if pragmas is None else pragmas)
+    install_query_hooks(engine)
+    return engine
+
+
+def create_async_db_engine(url: str):
+    """Async counterpart of `create_db_engine` with the same profile"""
+    url = async_database_url(url)
+    engine = create_async_engine(url, **_engine_options(url))
+    if url.startswith("sqlite"):
+        _install_pragmas(engine.sync_engine, sqlite_pragmas())
+    install_query_hooks(engine.sync_engine)
+    return engine
+
+
+# Create SQLAlchemy engines (sync for scripts and write paths, async for hot reads)
+engine = create_db_engine(settings.DATABASE_URL)
+async_engine = create_async_db_engine(settings.DATABASE_URL)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class for models
 Base = declarative_base()
 
+# Rows per INSERT statement; keeps bound parameters below SQLite's variable limit
+UPSERT_CHUNK_SIZE = 500
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -23,3 +105,60 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def savepoint(db):
+    """
+    Nested transaction (SAVEPOINT): an exception rolls back only the changes
+    made inside the block and is re-raised; the outer transaction stays usable.
+
+    pysqlite only opens a transaction before DML, so a SAVEPOINT issued first
+    would become the outer transaction and its RELEASE would commit. On SQLite
+    the transaction is therefore begun explicitly before the first savepoint.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN")
+    with db.begin_nested():
+        yield
+
+
+def upsert(db, model, rows, index_elements, update_columns):
+    """
+    Insert rows, updating existing ones on conflict (INSERT ... ON CONFLICT)
+
+    Uses the dialect-native upsert so a whole batch is applied without a
+    lookup query per row. The caller is responsible for committing.
+
+    Args:
+        db: Database session
+        model: Mapped model class
+        rows: List of column -> value dicts
+        index_elements: Columns of the unique index that identifies a row
+        update_columns: Columns to overwrite when the row already exists
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upsert is not supported for dialect '{dialect}'")
+
+    # One statement executed with many parameter sets: it is compiled once and
+    # cached, where a multi-row VALUES clause is compiled again for every batch
+    stmt = insert(model.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+    connection = db.connection()
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        connection.execute(stmt, rows[start:start + UPSERT_CHUNK_SIZE])
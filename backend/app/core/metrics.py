@@ -0,0 +1,300 @@
+"""
+Request instrumentation
+MetricsMiddleware measures every request: latency, SQL statement count and
+time (from engine cursor events), time spent waiting on the LLM service and
+response size. Totals are kept per route template as Prometheus histograms
+(served on /metrics) and each response carries a Server-Timing header.
+Requests that repeat one single-row statement more than
+METRICS_N_PLUS_ONE_REPEATS times are logged as likely N+1 patterns; batched
+statements (executemany, chunked IN lists) are not counted as repeats, so bulk
+paths such as imports do not raise false alarms.
+
+Per-request state lives in a context variable, so it follows the request
+into FastAPI's threadpool for sync endpoints and dependencies.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from .config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Route label for requests that matched no route, to keep label cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Executions binding more parameters than this work on a batch of rows
+# (chunked IN lists, multi-row VALUES) and do not count as N+1 repeats
+N_PLUS_ONE_MAX_PARAMETERS = 5
+
+
+class RequestMetrics:
+    """Counters for the request being handled"""
+
+    __slots__ = ("queries", "db_seconds", "llm_seconds", "statements", "timeline")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.llm_seconds = 0.0
+        # Single-row executions per statement, for N+1 detection
+        self.statements: Dict[str, int] = defaultdict(int)
+        # (kind, started, seconds, statement) per SQL statement and LLM call;
+        # only collected while the request is being profiled
+        self.timeline: Optional[List[Tuple[str, float, float, Optional[str]]]] = None
+
+    def most_repeated(self) -> Tuple[Optional[str], int]:
+        """The single-row statement executed most often and its count"""
+        if not self.statements:
+            return None, 0
+        return max(self.statements.items(), key=lambda item: item[1])
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        parts = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"']
+        if self.llm_seconds:
+            parts.append(f"llm;dur={self.llm_seconds * 1000:.1f}")
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request() -> Optional[RequestMetrics]:
+    """Metrics of the request being handled, or None outside a request"""
+    return _current.get()
+
+
+def track_request() -> Tuple[RequestMetrics, Optional[object]]:
+    """
+    Metrics of the current request, starting them if no middleware has
+
+    Returns:
+        (metrics, token to pass to untrack_request, or None if already tracked)
+    """
+    request = _current.get()
+    if request is not None:
+        return request, None
+    request = RequestMetrics()
+    return request, _current.set(request)
+
+
+def untrack_request(token) -> None:
+    if token is not None:
+        _current.reset(token)
+
+
+@contextmanager
+def llm_wait():
+    """Count the enclosed block as time spent waiting on the LLM service"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request = _current.get()
+        if request is not None:
+            elapsed = time.perf_counter() - started
+            request.llm_seconds += elapsed
+            if request.timeline is not None:
+                request.timeline.append(("llm", started, elapsed, None))
+
+
+def install_query_hooks(sync_engine) -> None:
+    """Attribute every statement run on the engine to the current request"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        request = _current.get()
+        if request is not None:
+            request.queries += 1
+            request.db_seconds += elapsed
+            if not executemany and len(parameters or ()) <= N_PLUS_ONE_MAX_PARAMETERS:
+                request.statements[statement] += 1
+            if request.timeline is not None:
+                request.timeline.append(("sql", started, elapsed, statement))
+
+
+class Histogram:
+    """Prometheus histogram keyed by a tuple of label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._counts: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = defaultdict(float)
+
+    def observe(self, labels: tuple, value: float) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, counts in sorted(self._counts.items()):
+            label_text = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {self._sums[labels]:.6f}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Prometheus counter keyed by a tuple of label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[tuple, int] = defaultdict(int)
+
+    def inc(self, labels: tuple) -> None:
+        self._values[labels] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{{{_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def _labels(names: Tuple[str, ...], values: tuple) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class MetricsRegistry:
+    """Per-route request metrics for this worker"""
+
+    def __init__(self):
+        route = ("method", "route")
+        self._lock = threading.Lock()
+        self.requests = Counter(
+            "growthpath_http_requests_total", "Requests handled", route + ("status",)
+        )
+        self.latency = Histogram(
+            "growthpath_http_request_duration_seconds", "Request latency", route, LATENCY_BUCKETS
+        )
+        self.queries = Histogram(
+            "growthpath_db_queries_per_request", "SQL statements per request", route, QUERY_COUNT_BUCKETS
+        )
+        self.db_time = Histogram(
+            "growthpath_db_time_seconds", "Time spent in SQL statements per request", route, LATENCY_BUCKETS
+        )
+        self.llm_time = Histogram(
+            "growthpath_llm_wait_seconds", "Time spent waiting on the LLM service per request", route, LATENCY_BUCKETS
+        )
+        self.response_size = Histogram(
+            "growthpath_http_response_size_bytes", "Response body size", route, SIZE_BUCKETS
+        )
+        self.n_plus_one = Counter(
+            "growthpath_n_plus_one_requests_total",
+            "Requests repeating one SQL statement more often than the N+1 threshold", route
+        )
+
+    def observe(self, method: str, route: str, status: int, request: RequestMetrics,
+                size: int, elapsed: float) -> None:
+        labels = (method, route)
+        with self._lock:
+            self.requests.inc(labels + (str(status),))
+            self.latency.observe(labels, elapsed)
+            self.queries.observe(labels, request.queries)
+            self.db_time.observe(labels, request.db_seconds)
+            self.response_size.observe(labels, size)
+            if request.llm_seconds:
+                self.llm_time.observe(labels, request.llm_seconds)
+            if request.most_repeated()[1] > settings.METRICS_N_PLUS_ONE_REPEATS:
+                self.n_plus_one.inc(labels)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.latency, self.queries, self.db_time,
+                           self.llm_time, self.response_size, self.n_plus_one):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+metrics_registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request metrics and adding a Server-Timing header"""
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Optional[Dict[object, str]] = None
+
+    def route_path(self, scope) -> str:
+        """Route template (e.g. /users/{user_id}) of the endpoint that handled the request"""
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics()
+        token = _current.set(request)
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = request.server_timing(time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            route = self.route_path(scope)
+            metrics_registry.observe(scope["method"], route, status, request, size, elapsed)
+            statement, repeats = request.most_repeated()
+            if repeats > settings.METRICS_N_PLUS_ONE_REPEATS:
+                logger.warning(
+                    "Possible N+1: %s %s repeated one SQL statement %d times (%d statements, %.1f ms): %s",
+                    scope["method"], route, repeats, request.queries, request.db_seconds * 1000,
+                    " ".join(statement.split())[:200]
+                )
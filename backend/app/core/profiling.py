@@ -0,0 +1,322 @@
+"""
+Opt-in request profiling
+A request is profiled when PROFILING_ENABLED is set, or when it carries
+"X-Profile: 1" together with a valid X-Admin-Token. The request runs under a
+sampling profiler (pyinstrument when installed, cProfile otherwise) on the
+event loop and, for sync endpoints, in the threadpool thread that runs the
+endpoint. The report is stored with the request's SQL and LLM timeline, and
+only the PROFILING_SLOWEST_PER_ROUTE slowest requests per route are kept on
+disk under PROFILING_DIR. Reports are served by the /admin/profiles endpoints.
+
+Nothing is installed unless profiling can be triggered (PROFILING_ENABLED or
+ADMIN_TOKEN set), so there is no overhead otherwise.
+"""
+import asyncio
+import functools
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from fastapi import Header, HTTPException
+from fastapi.routing import APIRoute
+from .config import settings
+from .metrics import UNMATCHED_ROUTE, track_request, untrack_request
+
+logger = logging.getLogger("uvicorn.error")
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+# Statements longer than this are truncated in the stored timeline
+STATEMENT_PREVIEW_CHARS = 500
+
+# cProfile allows one active profiler per thread, so the fallback profiles
+# one request at a time on the event loop
+_cprofile_loop_lock = threading.Lock()
+
+
+def profiling_available() -> bool:
+    """Whether any request can be profiled with the current settings"""
+    return settings.PROFILING_ENABLED or bool(settings.ADMIN_TOKEN)
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    return bool(settings.ADMIN_TOKEN) and token is not None and secrets.compare_digest(token, settings.ADMIN_TOKEN)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency for admin endpoints: X-Admin-Token must match ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+class _Sampler:
+    """One profiler running in the current thread"""
+
+    def __init__(self, label: str, async_mode: bool):
+        self.label = label
+        self._lock_held = False
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            Profiler = None
+        if Profiler is not None:
+            self.kind = "pyinstrument"
+            self._profiler = Profiler(
+                interval=settings.PROFILING_INTERVAL_MS / 1000,
+                async_mode="enabled" if async_mode else "disabled"
+            )
+        else:
+            import cProfile
+            self.kind = "cprofile"
+            self._profiler = cProfile.Profile()
+            if async_mode:
+                # Other profiled requests share the event loop thread
+                self._lock_held = _cprofile_loop_lock.acquire(blocking=False)
+                if not self._lock_held:
+                    self._profiler = None
+
+    def start(self) -> None:
+        if self._profiler is None:
+            return
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self._profiler is None:
+            return
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+            if self._lock_held:
+                _cprofile_loop_lock.release()
+
+    def report(self) -> Dict[str, Any]:
+        if self._profiler is None:
+            return {"thread": self.label, "profiler": self.kind, "text": "Skipped: another request was being profiled"}
+        if self.kind == "pyinstrument":
+            return {
+                "thread": self.label,
+                "profiler": self.kind,
+                "text": self._profiler.output_text(unicode=True, color=False),
+                "html": self._profiler.output_html()
+            }
+        import io
+        import pstats
+        buffer = io.StringIO()
+        pstats.Stats(self._profiler, stream=buffer).sort_stats("cumulative").print_stats(60)
+        return {"thread": self.label, "profiler": self.kind, "text": buffer.getvalue()}
+
+
+class ProfileSession:
+    """Profilers and timeline for one profiled request"""
+
+    def __init__(self):
+        self.samplers: List[_Sampler] = []
+
+    @contextmanager
+    def sample(self, label: str, async_mode: bool):
+        sampler = _Sampler(label, async_mode)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            # The event loop profile covers the whole request, so it comes first
+            self.samplers.insert(0 if async_mode else len(self.samplers), sampler)
+
+
+_session: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def _profile_in_thread(func):
+    """Wrap a sync endpoint so profiled requests are also sampled in its worker thread"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _session.get()
+        if session is None:
+            return func(*args, **kwargs)
+        with session.sample("endpoint thread", async_mode=False):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ProfileStore:
+    """On-disk ring of the slowest profiled requests per route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.PROFILING_DIR)
+
+    @staticmethod
+    def route_slug(method: str, route: str) -> str:
+        return f"{method}_{re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'}"
+
+    def save(self, report: Dict[str, Any]) -> Optional[str]:
+        """
+        Keep the report if it is among the slowest for its route
+
+        Returns:
+            Profile id, or None if faster than every stored report of a full ring
+        """
+        route_dir = self.directory / self.route_slug(report["method"], report["route"])
+        with self._lock:
+            route_dir.mkdir(parents=True, exist_ok=True)
+            # File names start with the zero-padded duration, so they sort by it
+            existing = sorted(route_dir.glob("*.json"))
+            limit = settings.PROFILING_SLOWEST_PER_ROUTE
+            if len(existing) >= limit and self._duration(existing[0]) >= report["duration_ms"]:
+                return None
+            profile_id = f"{int(report['duration_ms'] * 1000):012d}-{uuid.uuid4().hex[:8]}"
+            report["id"] = profile_id
+            (route_dir / f"{profile_id}.json").write_text(json.dumps(report))
+            for stale in existing[:max(0, len(existing) + 1 - limit)]:
+                stale.unlink(missing_ok=True)
+        return profile_id
+
+    @staticmethod
+    def _duration(path: Path) -> float:
+        return int(path.stem.split("-", 1)[0]) / 1000
+
+    def list(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Summaries of stored reports per route, slowest first"""
+        routes: Dict[str, List[Dict[str, Any]]] = {}
+        if not self.directory.exists():
+            return routes
+        for path in sorted(self.directory.glob("*/*.json"), reverse=True):
+            try:
+                report = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Removed or being written by another worker
+            routes.setdefault(f"{report['method']} {report['route']}", []).append({
+                key: report[key]
+                for key in ("id", "path", "status", "duration_ms", "queries", "db_ms", "llm_ms", "captured_at")
+            })
+        return routes
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not re.fullmatch(r"[0-9]+-[0-9a-f]+", profile_id):
+            return None
+        for path in self.directory.glob(f"*/{profile_id}.json"):
+            return json.loads(path.read_text())
+        return None
+
+    def clear(self) -> int:
+        removed = 0
+        with self._lock:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+# Global instance
+profile_store = ProfileStore()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling opted-in requests
+
+    Install inside MetricsMiddleware (add it first) so both see the same
+    request metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes_wrapped = False
+        self._route_paths: Dict[object, str] = {}
+
+    def _wrap_sync_endpoints(self, fastapi_app) -> None:
+        """Sample sync endpoints in their worker thread (done once, on first request)"""
+        for route in fastapi_app.routes:
+            if isinstance(route, APIRoute):
+                self._route_paths[route.endpoint] = route.path
+                if not asyncio.iscoroutinefunction(route.dependant.call):
+                    route.dependant.call = _profile_in_thread(route.dependant.call)
+        self._routes_wrapped = True
+
+    def wanted(self, scope) -> bool:
+        if settings.PROFILING_ENABLED:
+            return True
+        return _header(scope, PROFILE_HEADER) == "1" and is_admin_token(_header(scope, ADMIN_TOKEN_HEADER))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._routes_wrapped:
+            self._wrap_sync_endpoints(scope["app"])
+
+        request, token = track_request()
+        request.timeline = []
+        session = ProfileSession()
+        session_token = _session.set(session)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            with session.sample("event loop", async_mode=True):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _session.reset(session_token)
+            untrack_request(token)
+            timeline, request.timeline = request.timeline, None
+            try:
+                self._store(scope, status, elapsed, request, timeline, session, started)
+            except Exception:
+                logger.exception("Could not store request profile")
+
+    def _store(self, scope, status, elapsed, request, timeline, session, started) -> None:
+        report = {
+            "method": scope["method"],
+            "route": self._route_paths.get(scope.get("endpoint"), UNMATCHED_ROUTE),
+            "path": scope["path"] + (f"?{scope['query_string'].decode('latin-1')}" if scope.get("query_string") else ""),
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 2),
+            "queries": request.queries,
+            "db_ms": round(request.db_seconds * 1000, 2),
+            "llm_ms": round(request.llm_seconds * 1000, 2),
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+            "timeline": [
+                {
+                    "kind": kind,
+                    "offset_ms": round((at - started) * 1000, 2),
+                    "duration_ms": round(seconds * 1000, 3),
+                    "statement": " ".join(statement.split())[:STATEMENT_PREVIEW_CHARS] if statement else None
+                }
+                for kind, at, seconds, statement in timeline
+            ],
+            "profiles": [sampler.report() for sampler in session.samplers]
+        }
+        profile_store.save(report)
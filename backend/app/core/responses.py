@@ -0,0 +1,40 @@
+"""
+JSON responses serialized with orjson
+FastAPI's default path runs every payload through jsonable_encoder (and the
+response_model through Pydantic) before the stdlib json module; endpoints that
+build trusted dicts themselves return these responses to skip both.
+"""
+from typing import Any, Dict, Iterable, Optional
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Query parameter pattern for list endpoints offering NDJSON streaming
+RESPONSE_FORMATS = "^(json|ndjson)$"
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding that also accepts numpy values and non-string dict keys"""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """Default response class of the app"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """Serialize content as is, without jsonable_encoder or response_model validation"""
+    return FastJSONResponse(content, headers=headers)
+
+
+def ndjson_response(rows: Iterable[Any], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Stream rows as newline-delimited JSON, one object per line"""
+    def lines():
+        for row in rows:
+            yield dumps(row) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
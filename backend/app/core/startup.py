@@ -0,0 +1,35 @@
+"""
+Startup phase timing
+The timer starts when this module is first imported (the top of app.main), so
+phases cover framework and router imports as well as the lifespan startup.
+"""
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class StartupTimer:
+    """Records elapsed time per named startup phase"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Close the current phase under the given name"""
+        now = time.perf_counter()
+        self.phases[phase] = round(now - self._last, 4)
+        self._last = now
+
+    def report(self) -> Dict[str, float]:
+        """Phase timings in seconds plus the total, also written to the server log"""
+        timings = {**self.phases, "total": round(self._last - self.started, 4)}
+        logger.info("Startup timing: %s", ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items()))
+        return timings
+
+
+# Global instance
+startup_timer = StartupTimer()
@@ -1,18 +1,55 @@
-from fastapi import FastAPI
+from .core.startup import startup_timer
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from .core.database import engine, Base
-from .api import competencies, assessments, career, skills, llm, import_data, users
+from fastapi.responses import FileResponse, HTMLResponse, Response
 import os
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+startup_timer.mark("framework")
+
+from .core.config import settings
+from .core.metrics import MetricsMiddleware, metrics_registry, PROMETHEUS_CONTENT_TYPE
+from .core.profiling import ProfilingMiddleware, profile_store, profiling_available, require_admin
+from .core.responses import FastJSONResponse
+from .services.cache import response_cache
+from .api import competencies, assessments, career, skills, llm, import_data, export_data, users, analytics
+
+startup_timer.mark("routers")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Worker startup
+
+    Migrations normally run once in run.py before workers are spawned; set
+    MIGRATE_ON_STARTUP for single-process deployments started with uvicorn
+    directly.
+    """
+    if settings.MIGRATE_ON_STARTUP:
+        from .core.migrations import upgrade_database
+        upgrade_database()
+        startup_timer.mark("migrations")
+        if settings.LOAD_REFERENCE_DATA_ON_STARTUP:
+            from .services.reference_data import sync_reference_data
+            sync_reference_data()
+            startup_timer.mark("reference_data")
+    # Load the compiled reference data now rather than on the first request
+    from .services.reference_snapshot import reference_snapshot
+    reference_snapshot()
+    startup_timer.mark("reference_snapshot")
+    startup_timer.mark("lifespan")
+    app.state.startup_timings = startup_timer.report()
+    yield
+
 
 app = FastAPI(
     title="GrowthPath API",
     description="Competence Management System API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -22,8 +59,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Opt-in profiling; only installed when it can be triggered, and inside the
+# metrics middleware so both share the request's SQL and LLM timings
+if profiling_available():
+    app.add_middleware(ProfilingMiddleware)
+
+# Per-route latency, SQL and LLM timings; outermost so it times the whole request
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(competencies.router)
 app.include_router(assessments.router)
@@ -31,7 +77,11 @@ app.include_router(career.router)
 app.include_router(skills.router)
 app.include_router(llm.router)
 app.include_router(import_data.router)
+app.include_router(export_data.router)
 app.include_router(users.router)
+app.include_router(analytics.router)
+
+startup_timer.mark("app")
 
 
 @app.get("/")
@@ -48,6 +98,18 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    """Response cache hit rates, overall and per endpoint"""
+    return response_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request metrics for this worker in the Prometheus text format"""
+    return Response(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/tester")
 def llm_tester_page():
     """Serve the LLM tester page"""
@@ -55,3 +117,35 @@ def llm_tester_page():
     backend_dir = os.path.dirname(os.path.dirname(__file__))
     file_path = os.path.join(backend_dir, "static", "llm-tester.html")
     return FileResponse(file_path, media_type="text/html")
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+def list_profiles():
+    """Stored request profiles per route, slowest first"""
+    return profile_store.list()
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str):
+    """A stored profile: SQL/LLM timeline and text reports per profiled thread"""
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    for profile in report["profiles"]:
+        profile.pop("html", None)
+    return report
+
+
+@app.get("/admin/profiles/{profile_id}/html", dependencies=[Depends(require_admin)])
+def get_profile_html(profile_id: str, thread: int = 0):
+    """Interactive pyinstrument report of one profiled thread (0 is the event loop)"""
+    report = profile_store.get(profile_id)
+    if report is None or thread >= len(report["profiles"]) or "html" not in report["profiles"][thread]:
+        raise HTTPException(status_code=404, detail="HTML report not found")
+    return HTMLResponse(report["profiles"][thread]["html"])
+
+
+@app.delete("/admin/profiles", dependencies=[Depends(require_admin)])
+def clear_profiles():
+    """Delete every stored profile"""
+    return {"deleted": profile_store.clear()}
@@ -0,0 +1,33 @@
+"""Materialized analytics summaries"""
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class CompetencyRisk(Base):
+    """Per-competency holder counts and concentration, refreshed on each import"""
+    __tablename__ = "competency_risk"
+
+    id = Column(Integer, primary_key=True, index=True)
+    competency_id = Column(Integer, ForeignKey("competencies.id"), unique=True, nullable=False)
+    holders = Column(Integer, nullable=False)
+    beginner_count = Column(Integer, nullable=False)
+    intermediate_count = Column(Integer, nullable=False)
+    advanced_count = Column(Integer, nullable=False)
+    expert_count = Column(Integer, nullable=False)
+    bus_factor = Column(Integer, nullable=False)  # Holders at ADVANCED or above
+    gini = Column(Float, nullable=False)  # Concentration of proficiency across all users
+    regions_covered = Column(Integer, nullable=True)  # Null when no location data is known
+    countries_covered = Column(Integer, nullable=True)
+    region_coverage = Column(Text, nullable=True)  # JSON: region -> holder count
+    risk_level = Column(String(20), nullable=False)  # critical, high, medium, low
+    risk_rank = Column(Integer, nullable=False, index=True)  # Sort key, most at risk first
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class DataGeneration(Base):
+    """Counter bumped by every write to a data set, so each worker can tell its in-memory views are stale"""
+    __tablename__ = "data_generations"
+
+    name = Column(String(50), primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
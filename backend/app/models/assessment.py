@@ -1,24 +1,31 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import enum
 from ..core.database import Base
+from .types import CodedEnum, EnumCode
 
 
-class ProficiencyLevel(enum.Enum):
-    BEGINNER = 1
-    INTERMEDIATE = 2
-    ADVANCED = 3
-    EXPERT = 4
+class ProficiencyLevel(CodedEnum):
+    """Proficiency scale shared by competency assessments and user skills"""
+    BEGINNER = 1, "beginner"
+    INTERMEDIATE = 2, "intermediate"
+    ADVANCED = 3, "advanced"
+    EXPERT = 4, "expert"
 
 
 class Assessment(Base):
     __tablename__ = "assessments"
+    __table_args__ = (
+        # One current proficiency per user and competency; target of upserts
+        Index("ix_assessments_user_competency", "user_id", "competency_id", unique=True),
+        # Covers people search and per-level counts without touching the table
+        Index("ix_assessments_competency_level", "competency_id", "proficiency_level"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     competency_id = Column(Integer, ForeignKey("competencies.id"), nullable=False)
-    proficiency_level = Column(Enum(ProficiencyLevel), nullable=False)
+    proficiency_level = Column(EnumCode(ProficiencyLevel), nullable=False)
     assessed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
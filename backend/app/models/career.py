@@ -1,12 +1,36 @@
 """Career framework database models"""
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Index
+from sqlalchemy.orm import declared_attr, relationship
 from app.core.database import Base
+from .assessment import ProficiencyLevel
+from .types import CodedEnum, EnumCode
+
+
+class PlanStatus(CodedEnum):
+    ACTIVE = 1, "active"
+    COMPLETED = 2, "completed"
+    CANCELLED = 3, "cancelled"
+
+
+class ObjectiveStatus(CodedEnum):
+    NOT_STARTED = 1, "not_started"
+    IN_PROGRESS = 2, "in_progress"
+    COMPLETED = 3, "completed"
+
+
+class ObjectivePriority(CodedEnum):
+    HIGH = 1, "High"
+    MEDIUM = 2, "Medium"
+    LOW = 3, "Low"
 
 
 class CareerLevel(Base):
     """Career levels (e.g., Junior Engineer, Senior Engineer)"""
     __tablename__ = "career_levels"
+    __table_args__ = (
+        # Natural key of the reference data loader
+        Index("ix_career_levels_track_pay_class", "track", "pay_class", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     track = Column(String(50), nullable=False)  # 'software_engineer' or 'software_architect'
@@ -33,6 +57,9 @@ class CompetencyArea(Base):
 class CompetencyExpectation(Base):
     """Expected competency levels for each pay class"""
     __tablename__ = "competency_expectations"
+    __table_args__ = (
+        Index("ix_competency_expectations_area_pay_class", "competency_area_id", "pay_class", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     competency_area_id = Column(Integer, ForeignKey("competency_areas.id"))
@@ -46,9 +73,13 @@ class CompetencyExpectation(Base):
 class Skill(Base):
     """Skills catalog (technologies, tools, methodologies)"""
     __tablename__ = "skills"
+    __table_args__ = (
+        # Natural key of the reference data loader; skill names repeat across categories
+        Index("ix_skills_name_parent_category", "name", "parent_category", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(200), nullable=False, index=True)
+    name = Column(String(200), nullable=False)
     parent_category = Column(String(100), nullable=True)
     description = Column(Text, nullable=True)
     category = Column(String(50), nullable=True)  # Standard, Advanced, Niche, Inactive
@@ -59,11 +90,15 @@ class Skill(Base):
 class UserSkill(Base):
     """User skill assessments"""
     __tablename__ = "user_skills"
+    __table_args__ = (
+        Index("ix_user_skills_user_skill", "user_id", "skill_id", unique=True),
+        Index("ix_user_skills_skill_level", "skill_id", "proficiency_level"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)
     skill_id = Column(Integer, ForeignKey("skills.id"))
-    proficiency_level = Column(String(20), nullable=False)  # beginner, intermediate, advanced, expert
+    proficiency_level = Column(EnumCode(ProficiencyLevel), nullable=False)
     last_assessed = Column(Date, nullable=True)
 
     skill = relationship("Skill")
@@ -79,7 +114,7 @@ class DevelopmentPlan(Base):
     target_level = Column(String(10), nullable=False)
     created_date = Column(Date, nullable=False)
     target_date = Column(Date, nullable=True)
-    status = Column(String(20), default='active')  # active, completed, cancelled
+    status = Column(EnumCode(PlanStatus), default=PlanStatus.ACTIVE)
 
     objectives = relationship("LearningObjective", back_populates="plan")
 
@@ -88,12 +123,18 @@ class LearningObjective(Base):
     """Learning objectives within development plans"""
     __tablename__ = "learning_objectives"
 
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        # Concurrent edits of the same objective fail instead of silently overwriting
+        return {"version_id_col": cls.version}
+
     id = Column(Integer, primary_key=True, index=True)
-    plan_id = Column(Integer, ForeignKey("development_plans.id"))
+    plan_id = Column(Integer, ForeignKey("development_plans.id"), index=True)
     competency_area_id = Column(Integer, ForeignKey("competency_areas.id"), nullable=True)
     description = Column(Text, nullable=False)
-    priority = Column(String(20), default='Medium')  # High, Medium, Low
-    status = Column(String(20), default='not_started')  # not_started, in_progress, completed
+    priority = Column(EnumCode(ObjectivePriority), default=ObjectivePriority.MEDIUM)
+    status = Column(EnumCode(ObjectiveStatus), default=ObjectiveStatus.NOT_STARTED)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
 
     plan = relationship("DevelopmentPlan", back_populates="objectives")
     competency_area = relationship("CompetencyArea")
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, Enum
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 import enum
 from ..core.database import Base
+from .organization import JobRole
 
 
 class CompetencyCategory(enum.Enum):
@@ -18,6 +19,8 @@ class Competency(Base):
     name = Column(String, unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     category = Column(Enum(CompetencyCategory), nullable=False)
+    # Planisware Skillsets.Role the skillset belongs to; null until imported
+    job_role_id = Column(Integer, ForeignKey(JobRole.id), nullable=True, index=True)
 
     # Relationships
     assessments = relationship("Assessment", back_populates="competency", cascade="all, delete-orphan")
@@ -0,0 +1,31 @@
+"""
+Organization lookups from Planisware exports
+Each distinct Resource Region, Resource Country and Resource Location value
+is stored once and referenced from users by integer id; Skillsets.Role values
+are referenced from competencies, since the role belongs to the skillset.
+"""
+from sqlalchemy import Column, Integer, String
+from ..core.database import Base
+
+
+class LookupMixin:
+    """Integer id for a distinct name"""
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False, index=True)
+
+
+class Region(LookupMixin, Base):
+    __tablename__ = "regions"
+
+
+class Country(LookupMixin, Base):
+    __tablename__ = "countries"
+
+
+class Location(LookupMixin, Base):
+    __tablename__ = "locations"
+
+
+class JobRole(LookupMixin, Base):
+    """Job role from Skillsets.Role (UserRole is the application permission role)"""
+    __tablename__ = "job_roles"
@@ -0,0 +1,50 @@
+"""Column types shared by the models"""
+import enum
+from typing import List
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class CodedEnum(enum.Enum):
+    """
+    Enum stored as a small integer code and exposed in the API by label
+
+    Members are declared as NAME = code, "label"; the code is the enum value,
+    so members compare and sort numerically in SQL.
+    """
+
+    def __new__(cls, code: int, label: str):
+        member = object.__new__(cls)
+        member._value_ = code
+        member.label = label
+        return member
+
+    @classmethod
+    def labels(cls) -> List[str]:
+        return [member.label for member in cls]
+
+    @classmethod
+    def from_label(cls, label: str) -> "CodedEnum":
+        """Member for an API label; raises ValueError for unknown labels"""
+        for member in cls:
+            if member.label == label:
+                return member
+        raise ValueError(f"Invalid {cls.__name__} '{label}'. Must be one of: {', '.join(cls.labels())}")
+
+
+class EnumCode(TypeDecorator):
+    """Stores a CodedEnum member as its SMALLINT code; plain ints are accepted for range filters"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type):
+        super().__init__()
+        self.enum_class = enum_class
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return self.enum_class(value).value
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.enum_class(value)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Enum
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 import enum
 from ..core.database import Base
+from .organization import Country, Location, Region
 
 
 class UserRole(enum.Enum):
@@ -20,5 +21,10 @@ class User(Base):
     role = Column(Enum(UserRole), default=UserRole.EMPLOYEE, nullable=False)
     hashed_password = Column(String, nullable=False)
 
+    # Organization data from Planisware imports; null until imported
+    region_id = Column(Integer, ForeignKey(Region.id), nullable=True, index=True)
+    country_id = Column(Integer, ForeignKey(Country.id), nullable=True, index=True)
+    location_id = Column(Integer, ForeignKey(Location.id), nullable=True, index=True)
+
     # Relationships
     assessments = relationship("Assessment", back_populates="user", cascade="all, delete-orphan")
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List
 from ..models.assessment import ProficiencyLevel
 
 
@@ -19,3 +20,11 @@ class AssessmentResponse(AssessmentBase):
 
     class Config:
         from_attributes = True
+
+
+class AssessmentBulkItem(AssessmentBase):
+    user_id: int
+
+
+class AssessmentBulkCreate(BaseModel):
+    items: List[AssessmentBulkItem] = Field(..., min_length=1, description="Assessments to create or update")
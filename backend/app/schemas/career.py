@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+
+class DevelopmentPlanRequest(BaseModel):
+    user_id: int
+    current_level: str = Field(..., description="Current pay class, e.g. PC07")
+    target_level: str = Field(..., description="Target pay class, e.g. PC08")
+
+
+class DevelopmentPlanBulkCreate(BaseModel):
+    items: List[DevelopmentPlanRequest] = Field(..., min_length=1, max_length=5000, description="Plans to generate")
+
+
+class ObjectiveStatusUpdate(BaseModel):
+    id: int
+    status: Literal["not_started", "in_progress", "completed"]
+    version: int = Field(..., description="Version the client last read; the update fails if it has changed")
+
+
+class ObjectiveStatusBatchUpdate(BaseModel):
+    items: List[ObjectiveStatusUpdate] = Field(..., min_length=1, max_length=5000, description="Objective status changes")
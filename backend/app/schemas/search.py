@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from ..models.assessment import ProficiencyLevel
+
+
+class SkillClause(BaseModel):
+    competency_id: int
+    min_level: ProficiencyLevel = Field(ProficiencyLevel.BEGINNER, description="Minimum proficiency level (1-4)")
+
+
+class SkillSearchRequest(BaseModel):
+    all_of: List[SkillClause] = Field(default_factory=list, description="Competencies every match must have")
+    any_of: List[SkillClause] = Field(default_factory=list, description="Competencies of which a match needs at least one")
+    limit: int = Field(50, ge=1, le=1000)
+    region: Optional[str] = Field(None, description="Only users in this Resource Region")
+    country: Optional[str] = Field(None, description="Only users in this Resource Country")
+    location: Optional[str] = Field(None, description="Only users at this Resource Location")
+    job_role: Optional[str] = Field(None, description="Only users with this Skillsets.Role")
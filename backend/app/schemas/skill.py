@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+SkillProficiency = Literal["beginner", "intermediate", "advanced", "expert"]
+
+
+class UserSkillUpsert(BaseModel):
+    user_id: int
+    skill_id: int
+    proficiency_level: SkillProficiency
+
+
+class UserSkillBulkUpsert(BaseModel):
+    items: List[UserSkillUpsert] = Field(..., min_length=1, description="User skills to add or update")
@@ -0,0 +1,33 @@
+"""
+In-memory views derived from the assessments table
+Write paths bump the assessments generation (services.generations) before
+committing, then report the change here once instead of updating every
+index, matrix or cache built on top of assessments individually. Workers
+that did not handle the write rebuild their views from the generation.
+"""
+from typing import Any, Dict, Iterable
+from .skill_index import skill_index
+from .competency_matrix import competency_matrix
+from .recommendations import recommendation_engine
+from .cache import response_cache
+
+VIEWS = [skill_index, competency_matrix, recommendation_engine]
+
+
+def assessments_changed(rows: Iterable[Dict[str, Any]], generation: int) -> None:
+    """
+    Apply committed assessment upserts (user_id, competency_id, proficiency_level)
+
+    generation is the assessments generation bumped in the write's transaction.
+    """
+    rows = list(rows)
+    for view in VIEWS:
+        view.apply(rows, generation)
+    response_cache.invalidate("assessments", *{f"user:{row['user_id']}" for row in rows})
+
+
+def assessments_reloaded() -> None:
+    """Drop this worker's views after bulk changes such as imports; they rebuild on next use"""
+    for view in VIEWS:
+        view.invalidate()
+    response_cache.invalidate("assessments", "profiles")
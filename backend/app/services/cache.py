@@ -0,0 +1,248 @@
+"""
+Read-through response cache for hot read endpoints
+Endpoints opt in with the @cached decorator and declare tags describing the
+data they read; write paths call response_cache.invalidate(...) with the tags
+they touched. Invalidation bumps a per-tag version rather than hunting down
+keys, so an entry computed while a write was committing is never served.
+Entries hold the serialized JSON body, so hits skip serialization as well.
+
+Backends: an in-process LRU with TTL or a Redis-compatible server shared by
+all workers (CACHE_BACKEND=redis). The LRU holds entries per worker, but its
+tag versions are "cache:<tag>" rows in the data_generations table, read once
+per lookup, so an invalidation in one worker retires the entries of all of
+them.
+"""
+import asyncio
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from fastapi import Response
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.responses import dumps
+from .generations import bump_generations, current_generations
+
+# Endpoint parameters that never take part in cache keys
+SKIP_PARAMS = {"db"}
+
+# data_generations name prefix of the memory backend's tag versions
+TAG_GENERATION_PREFIX = "cache:"
+
+
+class MemoryCacheBackend:
+    """Thread-safe LRU with per-entry expiry; tag versions are shared through the database"""
+
+    def __init__(self, max_entries: int, session_factory: Callable[[], Session] = SessionLocal):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[int, ...], bytes]]" = OrderedDict()
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+
+    def tag_versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        names = [TAG_GENERATION_PREFIX + tag for tag in tags]
+        if not names:
+            return ()
+        with self._session_factory() as db:
+            versions = current_generations(db, names)
+        return tuple(versions[name] for name in names)
+
+    def get(self, key: str) -> Optional[Tuple[Tuple[int, ...], bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, versions, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return versions, value
+
+    def set(self, key: str, value: bytes, versions: Tuple[int, ...], ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._session_factory() as db:
+            bump_generations(db, (TAG_GENERATION_PREFIX + tag for tag in tags))
+            db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis-compatible backend; entries are "versions\nbody" with a server-side TTL"""
+
+    def __init__(self, url: str, prefix: str = "growthpath:cache:"):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def tag_versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        tags = list(tags)
+        if not tags:
+            return ()
+        values = self._client.mget([f"{self._prefix}tag:{tag}" for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    def get(self, key: str) -> Optional[Tuple[Tuple[int, ...], bytes]]:
+        raw = self._client.get(self._prefix + key)
+        if raw is None:
+            return None
+        versions, _, value = raw.partition(b"\n")
+        return tuple(json.loads(versions)), value
+
+    def set(self, key: str, value: bytes, versions: Tuple[int, ...], ttl: int) -> None:
+        self._client.set(self._prefix + key, json.dumps(versions).encode() + b"\n" + value, ex=ttl)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        pipeline = self._client.pipeline()
+        for tag in tags:
+            pipeline.incr(f"{self._prefix}tag:{tag}")
+        pipeline.execute()
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(f"{self._prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self) -> int:
+        return sum(1 for key in self._client.scan_iter(f"{self._prefix}*") if b":tag:" not in key)
+
+
+class ResponseCache:
+    """Cache front end with per-endpoint hit/miss counters"""
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CACHE_BACKEND != "none"
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    if settings.CACHE_BACKEND == "redis":
+                        self._backend = RedisCacheBackend(settings.CACHE_REDIS_URL)
+                    else:
+                        self._backend = MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+        return self._backend
+
+    def lookup(self, namespace: str, key: str, tags: Tuple[str, ...]) -> Tuple[bool, Optional[bytes], Tuple[int, ...]]:
+        """
+        Cached body for key if it is still current
+
+        Returns:
+            (hit, body, tag versions to store a freshly computed body under)
+        """
+        versions = self.backend.tag_versions(tags)
+        entry = self.backend.get(key)
+        if entry is not None and entry[0] == versions:
+            self._hits[namespace] += 1
+            return True, entry[1], versions
+        self._misses[namespace] += 1
+        return False, None, versions
+
+    def store(self, key: str, body: bytes, versions: Tuple[int, ...], ttl: Optional[int] = None) -> None:
+        self.backend.set(key, body, versions, ttl or settings.CACHE_TTL_SECONDS)
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalidate every entry carrying any of the tags"""
+        if self.enabled and tags:
+            self.backend.invalidate(tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self._hits.clear()
+        self._misses.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counts and hit rates, overall and per endpoint"""
+        namespaces = sorted(set(self._hits) | set(self._misses))
+        hits, misses = sum(self._hits.values()), sum(self._misses.values())
+        return {
+            "backend": settings.CACHE_BACKEND,
+            "entries": self.backend.size() if self.enabled else 0,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "endpoints": {
+                name: {
+                    "hits": self._hits[name],
+                    "misses": self._misses[name],
+                    "hit_rate": round(self._hits[name] / (self._hits[name] + self._misses[name]), 4)
+                }
+                for name in namespaces
+            }
+        }
+
+
+# Global instance
+response_cache = ResponseCache()
+
+
+def cached(*tags: str, ttl: Optional[int] = None):
+    """
+    Cache an endpoint's JSON response, keyed by its parameters
+
+    Tags may reference parameters, e.g. "user:{user_id}". The endpoint must
+    return plain JSON-compatible data (dicts and lists), not ORM objects; when it
+    returns a Response (e.g. a stream) that response is passed through uncached.
+    """
+    def decorator(func):
+        namespace = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        def key_and_tags(kwargs) -> Tuple[str, Tuple[str, ...]]:
+            params = {name: value for name, value in kwargs.items() if name not in SKIP_PARAMS}
+            key = f"{namespace}:{json.dumps(params, sort_keys=True, default=str)}"
+            return key, tuple(tag.format(**params) for tag in tags)
+
+        def respond(key, versions, value):
+            if isinstance(value, Response):
+                return value
+            body = dumps(value)
+            response_cache.store(key, body, versions, ttl)
+            return Response(body, media_type="application/json")
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not response_cache.enabled:
+                    return await func(*args, **kwargs)
+                key, entry_tags = key_and_tags(kwargs)
+                hit, body, versions = response_cache.lookup(namespace, key, entry_tags)
+                if hit:
+                    return Response(body, media_type="application/json")
+                return respond(key, versions, await func(*args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not response_cache.enabled:
+                    return func(*args, **kwargs)
+                key, entry_tags = key_and_tags(kwargs)
+                hit, body, versions = response_cache.lookup(namespace, key, entry_tags)
+                if hit:
+                    return Response(body, media_type="application/json")
+                return respond(key, versions, func(*args, **kwargs))
+
+        return wrapper
+    return decorator
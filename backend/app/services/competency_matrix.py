@@ -0,0 +1,236 @@
+"""
+Dense users x competencies proficiency matrix for analytics
+Loads every assessment once into an int8 NumPy matrix (0 = not assessed) so
+heatmaps, coverage and gap reports are vectorized reductions over any subset
+of users instead of per-user ORM queries. Each worker rebuilds its matrix when
+the stored assessments generation moves (see services.generations).
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.user import User
+from ..models.competency import Competency
+from ..models.assessment import Assessment, ProficiencyLevel
+from .generations import ASSESSMENTS, current_generation
+
+LEVELS = [level.value for level in ProficiencyLevel]
+
+
+class CompetencyMatrix:
+    """Users x competencies int8 matrix with id -> row/column maps"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        # Stored assessments generation the matrix reflects
+        self._generation = 0
+        self.matrix = np.zeros((0, 0), dtype=np.int8)
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.competency_ids = np.empty(0, dtype=np.int64)
+        self.competency_names: List[str] = []
+        self.competency_categories = np.empty(0, dtype=object)
+        self.user_rows: Dict[int, int] = {}
+        self.competency_cols: Dict[int, int] = {}
+        self._n_users = 0
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build the matrix from the database on first use and whenever another worker has written"""
+        # Read before the rows: a write landing in between only causes another reload
+        generation = current_generation(db, ASSESSMENTS)
+        with self._lock:
+            if self._loaded and self._generation == generation:
+                return
+
+            user_ids = np.fromiter((uid for (uid,) in db.query(User.id).order_by(User.id)), dtype=np.int64)
+            competencies = db.query(Competency.id, Competency.name, Competency.category).order_by(Competency.id).all()
+            rows = db.query(
+                Assessment.user_id,
+                Assessment.competency_id,
+                Assessment.proficiency_level
+            ).all()
+
+            user_rows = {int(uid): row for row, uid in enumerate(user_ids)}
+            competency_cols = {c.id: col for col, c in enumerate(competencies)}
+
+            matrix = np.zeros((max(len(user_ids), 1), len(competencies)), dtype=np.int8)
+            if rows:
+                r = np.fromiter((user_rows.get(a.user_id, -1) for a in rows), dtype=np.int64, count=len(rows))
+                c = np.fromiter((competency_cols.get(a.competency_id, -1) for a in rows), dtype=np.int64, count=len(rows))
+                v = np.fromiter((a.proficiency_level.value for a in rows), dtype=np.int8, count=len(rows))
+                known = (r >= 0) & (c >= 0)
+                matrix[r[known], c[known]] = v[known]
+
+            self.matrix = matrix
+            self.user_ids = np.resize(user_ids, matrix.shape[0])
+            self.user_rows = user_rows
+            self._n_users = len(user_ids)
+            self.competency_ids = np.array([c.id for c in competencies], dtype=np.int64)
+            self.competency_names = [c.name for c in competencies]
+            self.competency_categories = np.array([c.category.value for c in competencies], dtype=object)
+            self.competency_cols = competency_cols
+            self._generation = generation
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        """Drop the matrix; it is rebuilt on the next request"""
+        with self._lock:
+            self._loaded = False
+
+    def apply(self, rows: Iterable[Dict[str, Any]], generation: int) -> None:
+        """
+        Apply committed assessment writes incrementally
+
+        New users get a row appended (capacity grows geometrically); an unknown
+        competency needs its name and category, so it triggers a full reload.
+        generation is the assessments generation the write's transaction bumped
+        to; when other writes came in between, the matrix is left to reload.
+        """
+        with self._lock:
+            if not self._loaded or self._generation != generation - 1:
+                return
+            self._generation = generation
+            for row in rows:
+                col = self.competency_cols.get(row["competency_id"])
+                if col is None:
+                    self._loaded = False
+                    return
+                user_row = self.user_rows.get(row["user_id"])
+                if user_row is None:
+                    user_row = self._append_user(row["user_id"])
+                self.matrix[user_row, col] = ProficiencyLevel(row["proficiency_level"]).value
+
+    def _append_user(self, user_id: int) -> int:
+        if self._n_users == self.matrix.shape[0]:
+            capacity = max(2 * self.matrix.shape[0], 16)
+            grown = np.zeros((capacity, self.matrix.shape[1]), dtype=np.int8)
+            grown[:self._n_users] = self.matrix[:self._n_users]
+            self.matrix = grown
+            self.user_ids = np.resize(self.user_ids, capacity)
+        row = self._n_users
+        self.user_ids[row] = user_id
+        self.user_rows[user_id] = row
+        self._n_users += 1
+        return row
+
+    def subset(self, user_ids: Optional[List[int]] = None) -> np.ndarray:
+        """Row indexes for the given users (all users when None); unknown ids are ignored"""
+        if user_ids is None:
+            return np.arange(self._n_users)
+        return np.array([self.user_rows[uid] for uid in user_ids if uid in self.user_rows], dtype=np.int64)
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Copies of the matrix, its row user ids and its column competency ids"""
+        with self._lock:
+            return (
+                self.matrix[:self._n_users].copy(),
+                self.user_ids[:self._n_users].copy(),
+                self.competency_ids.copy()
+            )
+
+    def _competency(self, col: int) -> Dict[str, Any]:
+        return {
+            "id": int(self.competency_ids[col]),
+            "name": self.competency_names[col],
+            "category": self.competency_categories[col]
+        }
+
+    def heatmap(self, user_ids: Optional[List[int]] = None, category: Optional[str] = None,
+                include_grid: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Level distribution per competency for a group of users
+
+        When explicit users are given (or include_grid is set), the per-user
+        level grid is included for competencies held by at least one of them.
+        """
+        if include_grid is None:
+            include_grid = user_ids is not None
+        with self._lock:
+            rows = self.subset(user_ids)
+            sub = self.matrix[rows]
+            cols = np.arange(sub.shape[1])
+            if category:
+                cols = cols[self.competency_categories == category]
+            counts = np.stack([(sub[:, cols] == level).sum(axis=0) for level in LEVELS], axis=1) \
+                if len(cols) else np.zeros((0, len(LEVELS)), dtype=np.int64)
+            held = counts.sum(axis=1) > 0
+            cols, counts = cols[held], counts[held]
+
+            result = {
+                "users_count": int(len(rows)),
+                "levels": [level.name for level in ProficiencyLevel],
+                "competencies": [
+                    {**self._competency(col), "distribution": counts[i].tolist()}
+                    for i, col in enumerate(cols)
+                ]
+            }
+            if include_grid:
+                result["user_ids"] = self.user_ids[rows].tolist()
+                result["grid"] = sub[:, cols].tolist()
+        return result
+
+    def category_averages(self, user_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Average level per competency category, over holders and over the whole group"""
+        with self._lock:
+            sub = self.matrix[self.subset(user_ids)]
+            result = []
+            for category in sorted(set(self.competency_categories)):
+                block = sub[:, self.competency_categories == category]
+                held = block > 0
+                result.append({
+                    "category": category,
+                    "competencies": int(block.shape[1]),
+                    "average_level": round(float(block[held].mean()), 2) if held.any() else 0.0,
+                    "average_level_all_users": round(float(block.mean()), 2) if block.size else 0.0,
+                    "assessments": int(held.sum())
+                })
+        return result
+
+    def coverage(
+        self,
+        user_ids: Optional[List[int]] = None,
+        min_level: int = ProficiencyLevel.BEGINNER.value
+    ) -> List[Dict[str, Any]]:
+        """Share of the group holding each competency at min_level or above"""
+        with self._lock:
+            sub = self.matrix[self.subset(user_ids)]
+            holders = (sub >= min_level).sum(axis=0)
+            percentage = holders / sub.shape[0] * 100 if sub.shape[0] else np.zeros(sub.shape[1])
+            order = np.argsort(-percentage, kind="stable")
+            return [
+                {
+                    **self._competency(col),
+                    "holders": int(holders[col]),
+                    "coverage_percentage": round(float(percentage[col]), 1)
+                }
+                for col in order
+            ]
+
+    def gaps(
+        self,
+        user_ids: Optional[List[int]] = None,
+        target_level: int = ProficiencyLevel.ADVANCED.value,
+        top_n: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Competencies with the largest average shortfall below target_level"""
+        with self._lock:
+            sub = self.matrix[self.subset(user_ids)]
+            if not sub.shape[0] or not sub.shape[1]:
+                return []
+            shortfall = np.clip(target_level - sub.astype(np.int16), 0, None)
+            mean_gap = shortfall.mean(axis=0)
+            below = (sub < target_level).sum(axis=0)
+            top = np.argsort(-mean_gap, kind="stable")[:top_n]
+            return [
+                {
+                    **self._competency(col),
+                    "average_gap": round(float(mean_gap[col]), 2),
+                    "users_below_target": int(below[col]),
+                    "users_at_target": int(sub.shape[0] - below[col])
+                }
+                for col in top
+            ]
+
+
+# Global instance
+competency_matrix = CompetencyMatrix()
@@ -0,0 +1,150 @@
+"""
+Streaming tabular exports
+Rows are read from the database in batches through a server-side cursor
+(yield_per) and written incrementally: CSV and Parquet bytes are sent after
+every batch, so the download starts immediately and memory stays constant
+however many rows are exported. XLSX is a zip archive whose directory is only
+known at the end, so it is built with openpyxl's write-only workbook (rows are
+spooled to disk, not kept in memory) and streamed once complete.
+"""
+import csv
+import io
+import os
+import tempfile
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from ..core.database import SessionLocal
+
+# Query parameter pattern for export endpoints
+EXPORT_FORMATS = "^(csv|xlsx|parquet)$"
+
+# Rows fetched from the cursor and written per chunk (one Parquet row group)
+EXPORT_BATCH_SIZE = 5000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+# (header, type) with type one of "int", "str", "date", "datetime"
+ExportColumn = Tuple[str, str]
+
+
+def stream_query(statement: Select, transform=None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Sequence[Any]]]:
+    """
+    Batches of rows of a query, read with a server-side cursor
+
+    The generator owns its session, so it stays open for as long as the
+    response is streaming rather than for the request handler only.
+
+    Args:
+        statement: Select whose columns are the export columns
+        transform: Optional function applied to each row
+        batch_size: Rows per batch
+    """
+    with SessionLocal() as db:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield [transform(row) for row in rows] if transform else rows
+
+
+def csv_chunks(columns: Sequence[ExportColumn], batches: Iterable[List[Sequence[Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def parquet_chunks(columns: Sequence[ExportColumn], batches: Iterable[List[Sequence[Any]]]) -> Iterator[bytes]:
+    """One row group per batch, flushed to the client as it is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"int": pa.int64(), "str": pa.string(), "date": pa.date32(), "datetime": pa.timestamp("us")}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array([row[i] for row in batch], type=field.type) for i, field in enumerate(schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def xlsx_chunks(columns: Sequence[ExportColumn], batches: Iterable[List[Sequence[Any]]],
+                sheet_title: str = "Export") -> Iterator[bytes]:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append([name for name, _ in columns])
+    for batch in batches:
+        for row in batch:
+            sheet.append(list(row))
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def export_response(format: str, filename: str, columns: Sequence[ExportColumn],
+                    batches: Iterable[List[Sequence[Any]]]) -> StreamingResponse:
+    """
+    Stream batches as a CSV, XLSX or Parquet download
+
+    Args:
+        format: "csv", "xlsx" or "parquet"
+        filename: Download name without extension
+        columns: Header and type of each column
+        batches: Lists of rows, e.g. from stream_query
+    """
+    if format == "parquet":
+        body = parquet_chunks(columns, batches)
+    elif format == "xlsx":
+        body = xlsx_chunks(columns, batches, sheet_title=filename)
+    else:
+        body = csv_chunks(columns, batches)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format], headers={
+        "Content-Disposition": f'attachment; filename="{filename}.{format}"'
+    })
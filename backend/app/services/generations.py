@@ -0,0 +1,70 @@
+"""
+Data generations
+The skill index, competency matrix and recommendations are built in memory
+by every worker. Writers bump a counter stored in the database in the same
+transaction as their changes; a view compares it with the generation it was
+built from and rebuilds once it has moved, so writes and imports handled by
+one worker reach all of them.
+"""
+from typing import Dict, Iterable
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from ..core.database import UPSERT_CHUNK_SIZE
+from ..models.analytics import DataGeneration
+
+# Bumped by every committed assessment write, imports included
+ASSESSMENTS = "assessments"
+
+# Bumped by imports only
+IMPORTS = "imports"
+
+
+def current_generation(db: Session, name: str) -> int:
+    """Stored generation of a data set (0 before its first write)"""
+    return db.scalar(select(DataGeneration.generation).where(DataGeneration.name == name)) or 0
+
+
+def bump_generation(db: Session, name: str) -> int:
+    """Increment a generation in the caller's transaction and return the new value"""
+    bumped = db.execute(
+        update(DataGeneration)
+        .where(DataGeneration.name == name)
+        .values(generation=DataGeneration.generation + 1)
+    )
+    if not bumped.rowcount:
+        # The migration seeds the rows; databases built with create_all lack them
+        db.execute(insert(DataGeneration).values(name=name, generation=1))
+    return current_generation(db, name)
+
+
+def current_generations(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Stored generations of several data sets in one query (0 for those never written)"""
+    names = list(names)
+    stored = dict(db.execute(
+        select(DataGeneration.name, DataGeneration.generation).where(DataGeneration.name.in_(names))
+    ).all())
+    return {name: stored.get(name, 0) for name in names}
+
+
+def bump_generations(db: Session, names: Iterable[str]) -> None:
+    """Increment several generations in the caller's transaction, creating missing rows"""
+    rows = [{"name": name, "generation": 1} for name in sorted(set(names))]
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for row in rows:
+            bump_generation(db, row["name"])
+        return
+
+    # Sorted names take row locks in the same order in every writer
+    stmt = dialect_insert(DataGeneration.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"generation": DataGeneration.__table__.c.generation + 1}
+    )
+    connection = db.connection()
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        connection.execute(stmt, rows[start:start + UPSERT_CHUNK_SIZE])
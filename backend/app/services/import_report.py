@@ -0,0 +1,81 @@
+"""
+Import validation reports
+Issues found while importing (see IMPORT_ISSUES) are counted per code and the
+first IMPORT_ISSUE_SAMPLE are kept as messages for the response; all of them
+are appended chunk by chunk to a CSV file under IMPORT_REPORT_DIR, served by
+GET /import/reports/{report_id}. Only the newest IMPORT_REPORTS_KEPT files
+are kept.
+"""
+import re
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+from ..core.config import settings
+from .planisware import IMPORT_ISSUES, ISSUE_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Issue messages returned with the import response
+IMPORT_ISSUE_SAMPLE = 50
+
+# Report files kept on disk, newest first
+IMPORT_REPORTS_KEPT = 20
+
+_REPORT_ID = re.compile(r"[0-9]{14}-[0-9a-f]{8}")
+
+
+def report_path(report_id: str) -> Optional[Path]:
+    """File of a stored report, or None for an unknown or malformed id"""
+    if not _REPORT_ID.fullmatch(report_id):
+        return None
+    path = Path(settings.IMPORT_REPORT_DIR) / f"{report_id}.csv"
+    return path if path.exists() else None
+
+
+class ImportReport:
+    """Issues of one import: counts per code, a bounded sample and the full list on disk"""
+
+    def __init__(self, sample_size: int = IMPORT_ISSUE_SAMPLE):
+        # Ids start with the creation time, so file names sort by age
+        self.report_id = f"{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.sample_size = sample_size
+        self.counts: Counter = Counter()
+        self.sample: List[str] = []
+        self.path: Optional[Path] = None
+
+    def add(self, issues: "pd.DataFrame") -> None:
+        if issues.empty:
+            return
+        self.counts.update(issues["code"].value_counts().to_dict())
+        for row, code, column, value in issues.head(self.sample_size - len(self.sample)).itertuples(index=False):
+            where = f"Row {row}, {column}" if column else f"Row {row}"
+            self.sample.append(f"{where}: {IMPORT_ISSUES[code]}" + (f" ({value})" if value else ""))
+
+        if self.path is None:
+            directory = Path(settings.IMPORT_REPORT_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            for stale in sorted(directory.glob("*.csv"))[:-(IMPORT_REPORTS_KEPT - 1) or None]:
+                stale.unlink(missing_ok=True)
+            self.path = directory / f"{self.report_id}.csv"
+            header = True
+        else:
+            header = False
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            issues[ISSUE_COLUMNS].assign(message=issues["code"].map(IMPORT_ISSUES)).to_csv(
+                f, header=header, index=False
+            )
+
+    def summary(self) -> Dict:
+        """
+        Response fields: issue counts per code, the sampled messages
+        ("errors") and the download path of the full report (None when the
+        import had no issues)
+        """
+        return {
+            "issues": dict(self.counts),
+            "errors": self.sample,
+            "error_report": f"/import/reports/{self.report_id}" if self.path else None
+        }
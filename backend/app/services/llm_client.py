@@ -2,9 +2,9 @@
 LLM Farm Client Service
 Handles communication with the Bosch LLM Farm (Google Vertex AI format)
 """
-import httpx
 from typing import Optional, List, Dict, Any
 from ..core.config import settings
+from ..core.metrics import llm_wait
 
 
 class LLMClient:
@@ -73,12 +73,15 @@ class LLMClient:
             "Content-Type": "application/json"
         }
 
+        import httpx  # Deferred to first use to keep worker startup fast
+
         async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                endpoint_url,
-                json=payload,
-                headers=headers
-            )
+            with llm_wait():
+                response = await client.post(
+                    endpoint_url,
+                    json=payload,
+                    headers=headers
+                )
             response.raise_for_status()
             return response.json()
 
@@ -0,0 +1,96 @@
+"""
+Organization filters
+Region, country, location and job role filters shared by the user list,
+people search and analytics endpoints. A filter value is a lookup name; it is
+resolved to its id in a subquery, so filtering users is an indexed equality
+on the integer column rather than a string comparison. The job role belongs
+to skillsets, so it selects the users holding any competency of that role.
+"""
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional
+from fastapi import Query
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+from ..models.assessment import Assessment
+from ..models.competency import Competency
+from ..models.organization import Country, JobRole, Location, Region
+from ..models.user import User
+
+# Field -> (lookup model, users column) for the fields stored on users
+USER_FIELDS = {
+    "region": (Region, User.region_id),
+    "country": (Country, User.country_id),
+    "location": (Location, User.location_id)
+}
+
+
+def lookup_id(model, name: str):
+    """Scalar subquery for the id of a lookup name"""
+    return select(model.id).where(model.name == name).scalar_subquery()
+
+
+def job_role_holders(name: str):
+    """Subquery of the ids of users holding a competency of the job role"""
+    return (
+        select(Assessment.user_id)
+        .join(Competency, Competency.id == Assessment.competency_id)
+        .where(Competency.job_role_id == lookup_id(JobRole, name))
+    )
+
+
+@dataclass
+class OrganizationFilter:
+    region: Optional[str] = None
+    country: Optional[str] = None
+    location: Optional[str] = None
+    job_role: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, field.name) for field in fields(self))
+
+    def conditions(self) -> List:
+        """WHERE clauses on User for the fields that are set"""
+        conditions = [
+            column == lookup_id(model, value)
+            for name, (model, column) in USER_FIELDS.items()
+            if (value := getattr(self, name))
+        ]
+        if self.job_role:
+            conditions.append(User.id.in_(job_role_holders(self.job_role)))
+        return conditions
+
+    def user_ids(self, db: Session, within: Optional[List[int]] = None) -> Optional[List[int]]:
+        """
+        Ids of the matching users, restricted to `within` when given
+
+        Returns `within` unchanged when no field is set (None = all users).
+        """
+        if not self:
+            return within
+        ids = db.scalars(select(User.id).where(*self.conditions()).order_by(User.id)).all()
+        if within is None:
+            return list(ids)
+        matching = set(ids)
+        return [user_id for user_id in within if user_id in matching]
+
+
+def organization_filter(
+    region: Optional[str] = Query(None, description="Resource Region, e.g. EMEA"),
+    country: Optional[str] = Query(None, description="Resource Country"),
+    location: Optional[str] = Query(None, description="Resource Location"),
+    job_role: Optional[str] = Query(None, description="Skillsets.Role of a competency the user holds")
+) -> OrganizationFilter:
+    """Dependency reading the filter from query parameters"""
+    return OrganizationFilter(region, country, location, job_role)
+
+
+def with_organization(statement: Select) -> Select:
+    """Add the region, country and location names of the selected users as columns"""
+    for name, (model, column) in USER_FIELDS.items():
+        statement = statement.add_columns(model.name.label(name)).outerjoin(model, model.id == column)
+    return statement
+
+
+def organization_of(row: Any) -> Dict[str, Optional[str]]:
+    """The organization columns of a row selected with with_organization"""
+    return {name: getattr(row, name) for name in USER_FIELDS}
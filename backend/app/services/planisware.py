@@ -0,0 +1,244 @@
+"""
+Planisware export normalization
+Shared by the API importer (planisware_import.py) and import_plw_data.py.
+Skillset levels, categories and e-mail addresses are derived with column
+operations over a whole frame: levels through a categorical lookup table,
+categories through ordered substring masks and addresses through pandas
+string methods. The scalar functions define the mapping for single values;
+benchmarks/bench_normalization.py checks that both agree.
+
+Validation runs on the same frames: every skipped, rejected or suspicious row
+becomes one issue (row, code, column, value), collected in a frame rather than
+as messages so an import with many bad rows stays cheap to report.
+
+pandas is imported by the frame functions only, so importing the mappings
+stays cheap.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+import numpy as np
+from ..models.assessment import ProficiencyLevel
+from ..models.competency import CompetencyCategory
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Planisware "Skillset Level" values; anything else is a beginner
+SKILLSET_LEVELS = {
+    "1st": ProficiencyLevel.BEGINNER,
+    "2nd": ProficiencyLevel.INTERMEDIATE,
+    "3rd": ProficiencyLevel.ADVANCED,
+    "4th": ProficiencyLevel.EXPERT
+}
+DEFAULT_LEVEL = ProficiencyLevel.BEGINNER
+
+# Substrings of "Skillsets.Category" in order of precedence; anything else is technical
+CATEGORY_KEYWORDS = [
+    (("standard", "advanced"), CompetencyCategory.TECHNICAL),
+    (("leadership",), CompetencyCategory.LEADERSHIP),
+    (("niche", "domain"), CompetencyCategory.DOMAIN_KNOWLEDGE),
+    (("soft",), CompetencyCategory.SOFT_SKILLS)
+]
+DEFAULT_CATEGORY = CompetencyCategory.TECHNICAL
+
+# "Skillsets.Category" written by exports; each maps back to its category on import
+SKILLSET_CATEGORY_LABELS = {
+    CompetencyCategory.TECHNICAL: "Standard",
+    CompetencyCategory.SOFT_SKILLS: "Soft Skills",
+    CompetencyCategory.LEADERSHIP: "Leadership",
+    CompetencyCategory.DOMAIN_KNOWLEDGE: "Domain"
+}
+
+EMAIL_DOMAIN = "@bosch.com"
+
+REQUIRED_COLUMNS = ["Name", "Skillset", "Skillset Level"]
+
+# Optional source column -> normalized column
+OPTIONAL_COLUMNS = {
+    "Skillsets.Description": "description",
+    "Resource Region": "region",
+    "Resource Country": "country",
+    "Resource Location": "location",
+    "Skillsets.Role": "job_role"
+}
+
+# Validation issues: code -> message
+IMPORT_ISSUES = {
+    "missing_name": "Name is empty; row skipped",
+    "missing_skillset": "Skillset is empty; row skipped",
+    "name_not_text": "Name is not text; row rejected",
+    "unknown_level": "Unknown Skillset Level; imported as 1st",
+    "duplicate_row": "Repeats an earlier row for the same name and skillset",
+    "conflicting_level": "Skillset Level differs from an earlier row for the same name and skillset; the last row wins",
+    "write_failed": "The chunk holding this row could not be written; row not imported"
+}
+ISSUE_COLUMNS = ["row", "code", "column", "value"]
+
+
+def map_skillset_level_to_proficiency(level: str) -> ProficiencyLevel:
+    """Map Planisware skillset level to proficiency level"""
+    return SKILLSET_LEVELS.get(level, DEFAULT_LEVEL)
+
+
+def map_category_to_competency_category(category: str) -> CompetencyCategory:
+    """Map Planisware category to competency category"""
+    if not isinstance(category, str):  # Empty Excel cells arrive as NaN
+        return DEFAULT_CATEGORY
+
+    category = category.lower()
+    for keywords, mapped in CATEGORY_KEYWORDS:
+        if any(keyword in category for keyword in keywords):
+            return mapped
+    return DEFAULT_CATEGORY
+
+
+def planisware_email(name: str) -> str:
+    """Login e-mail of an employee: "Ana Smith" -> "ana.smith@bosch.com" """
+    return name.lower().replace(" ", ".") + EMAIL_DOMAIN
+
+
+def proficiency_codes(levels: "pd.Series") -> np.ndarray:
+    """ProficiencyLevel codes (int8) of a "Skillset Level" column"""
+    import pandas as pd
+
+    codes = pd.Categorical(levels, categories=list(SKILLSET_LEVELS)).codes
+    # Unknown and missing values get code -1, which picks the default at the end
+    table = np.array([level.value for level in SKILLSET_LEVELS.values()] + [DEFAULT_LEVEL.value], dtype=np.int8)
+    return table[codes]
+
+
+def competency_categories(categories: "pd.Series") -> np.ndarray:
+    """CompetencyCategory members of a "Skillsets.Category" column"""
+    lowered = categories.astype(object).str.lower()
+    masks = [
+        np.logical_or.reduce([lowered.str.contains(keyword, regex=False).fillna(False).to_numpy(dtype=bool)
+                              for keyword in keywords])
+        for keywords, _ in CATEGORY_KEYWORDS
+    ]
+    choices = np.array([mapped for _, mapped in CATEGORY_KEYWORDS] + [DEFAULT_CATEGORY], dtype=object)
+    # Index of the first matching keyword group, or the default past the end
+    first = np.select(masks, np.arange(len(masks)), default=len(masks))
+    return choices[first]
+
+
+def planisware_emails(names: "pd.Series") -> "pd.Series":
+    """planisware_email over a column of names"""
+    return names.str.lower().str.replace(" ", ".", regex=False) + EMAIL_DOMAIN
+
+
+def issue_frame(index: "pd.Index", code: str, column: str, values=None) -> "pd.DataFrame":
+    """
+    Issues of the rows at index (0 = first data row)
+
+    Rows are numbered as in the file, the header being row 1; values are the
+    offending cells as text.
+    """
+    import pandas as pd
+
+    if values is None:
+        values = ""
+    elif isinstance(values, pd.Series):
+        values = values.astype(object).where(values.notna(), "").astype(str).to_numpy()
+    return pd.DataFrame({"row": index + 2, "code": code, "column": column, "value": values}, columns=ISSUE_COLUMNS)
+
+
+@dataclass
+class NormalizedRows:
+    """
+    Import-ready rows, indexed by the source row number
+
+    frame columns: name, email, skillset, description, region, country,
+    location, job_role (str or None), category (CompetencyCategory) and proficiency (int8
+    ProficiencyLevel code). issues has ISSUE_COLUMNS.
+    """
+    frame: "pd.DataFrame"
+    skipped: int
+    issues: "pd.DataFrame"
+
+
+def normalize_planisware(df: "pd.DataFrame") -> NormalizedRows:
+    """
+    Normalize and validate a frame of Planisware rows in one pass
+
+    Rows without a Name or Skillset are skipped; non-text names are rejected,
+    since no e-mail can be derived from them. Unknown levels are imported as
+    the default level and reported.
+    """
+    import pandas as pd
+
+    has_name, has_skillset = df["Name"].notna(), df["Skillset"].notna()
+    present = has_name & has_skillset
+    skipped = int((~present).sum())
+    issues = [
+        issue_frame(df.index[~has_name], "missing_name", "Name"),
+        issue_frame(df.index[has_name & ~has_skillset], "missing_skillset", "Skillset")
+    ]
+    df = df[present]
+
+    # .str methods give NaN for values that are not strings
+    is_text = df["Name"].astype(object).str.len().notna()
+    issues.append(issue_frame(df.index[~is_text], "name_not_text", "Name", df["Name"][~is_text]))
+    df = df[is_text]
+
+    unknown = ~df["Skillset Level"].isin(list(SKILLSET_LEVELS))
+    issues.append(issue_frame(df.index[unknown], "unknown_level", "Skillset Level", df["Skillset Level"][unknown]))
+
+    def optional(column: str) -> Optional["pd.Series"]:
+        if column not in df:
+            return None
+        values = df[column].astype(object)
+        return values.where(values.notna(), None)
+
+    missing = pd.Series(np.nan, index=df.index, dtype=object)
+    frame = pd.DataFrame({
+        "name": df["Name"],
+        "email": planisware_emails(df["Name"]),
+        "skillset": df["Skillset"].astype(str),
+        "category": competency_categories(df["Skillsets.Category"] if "Skillsets.Category" in df else missing),
+        "proficiency": proficiency_codes(df["Skillset Level"]),
+        **{target: optional(source) for source, target in OPTIONAL_COLUMNS.items()}
+    }, index=df.index)
+    return NormalizedRows(frame, skipped, pd.concat(issues, ignore_index=True))
+
+
+class RepeatCheck:
+    """
+    Finds rows repeating the name (e-mail) and skillset of an earlier row of
+    the same import, across chunks: duplicates when the level is the same,
+    conflicts when it differs. Keeps the last level of every pair recorded;
+    chunks are recorded once written, so rows of a chunk that was rolled
+    back are not reported as repeated later.
+    """
+
+    def __init__(self):
+        self.levels: Dict[str, int] = {}
+
+    @staticmethod
+    def _keys(frame: "pd.DataFrame") -> "pd.Series":
+        return frame["email"] + "\x1f" + frame["skillset"]
+
+    def __call__(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        """Repeat issues of a chunk, against itself and the recorded chunks"""
+        import pandas as pd
+
+        if frame.empty:
+            return pd.DataFrame(columns=ISSUE_COLUMNS)
+        key = self._keys(frame)
+        levels = frame["proficiency"]
+        # Level of the previous row with the same key: in this chunk, else in earlier chunks
+        previous = levels.groupby(key).shift().fillna(key.map(self.levels))
+        repeated = previous.notna()
+        same = repeated & (previous == levels)
+        conflicting = repeated & ~same
+
+        labels = {level.value: label for label, level in SKILLSET_LEVELS.items()}
+        return pd.concat([
+            issue_frame(frame.index[same], "duplicate_row", "Skillset", frame["skillset"][same]),
+            issue_frame(frame.index[conflicting], "conflicting_level", "Skillset Level",
+                        levels[conflicting].map(labels))
+        ], ignore_index=True)
+
+    def record(self, frame: "pd.DataFrame") -> None:
+        """Remember the last level of every pair of a written chunk"""
+        if not frame.empty:
+            self.levels.update(frame["proficiency"].groupby(self._keys(frame)).last().astype(int).items())
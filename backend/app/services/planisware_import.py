@@ -0,0 +1,538 @@
+"""
+Planisware import pipeline
+The worksheet XML of an xlsx export is decompressed once and cut into row
+ranges as it streams; each range's bytes are sent to a process pool that
+parses and normalizes it (XML parsing is CPU-bound and single-threaded),
+while one writer in the request applies the normalized chunks to the
+database in bulk, in file order. CSV files, .xls files and
+sheets that cannot be split are read with pandas and normalized in the same
+chunks in-process. Normalization itself is shared with import_plw_data.py
+(planisware.py).
+
+Every chunk is validated before it is written and written inside a
+savepoint: a chunk the database rejects is rolled back on its own and
+reported, and the rest of the import goes on.
+
+Cells are read as stored: shared and inline strings, numbers and booleans.
+Number formats (dates) are not applied, which the Planisware text columns
+never need.
+"""
+import os
+import re
+import zipfile
+import posixpath
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from xml.etree import ElementTree
+import pandas as pd
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import UPSERT_CHUNK_SIZE, savepoint, upsert
+from ..models.assessment import Assessment
+from ..models.competency import Competency
+from ..models.organization import Country, JobRole, Location, Region
+from ..models.user import User, UserRole
+from .generations import ASSESSMENTS, IMPORTS, bump_generation
+from .import_report import ImportReport
+from .planisware import NormalizedRows, RepeatCheck, issue_frame, normalize_planisware
+
+# Worksheet XML per parse task (about 15k Planisware rows)
+IMPORT_CHUNK_BYTES = 8 << 20
+
+# Rows per chunk when the file is read with pandas
+IMPORT_CHUNK_ROWS = 20000
+
+# Fewer ranges than this are parsed in the request: each pool process needs
+# about a second to start and import pandas, which a few ranges do not repay
+IMPORT_POOL_MIN_RANGES = 4
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_ROW = f"{{{_MAIN_NS}}}row"
+_CELL = f"{{{_MAIN_NS}}}c"
+_VALUE = f"{{{_MAIN_NS}}}v"
+_TEXT = f"{{{_MAIN_NS}}}t"
+_RUN = f"{{{_MAIN_NS}}}r"
+_INLINE = f"{{{_MAIN_NS}}}is"
+_READ_BLOCK = 1 << 20
+
+# (model, column, lookup model, normalized column); users are keyed by e-mail, competencies by skillset
+ORGANIZATION_LOOKUPS = [
+    (User, "region_id", Region, "region"),
+    (User, "country_id", Country, "country"),
+    (User, "location_id", Location, "location"),
+    (Competency, "job_role_id", JobRole, "job_role")
+]
+
+
+def import_workers() -> int:
+    """Parse processes for imports: IMPORT_WORKERS, at most one per CPU"""
+    cpus = os.cpu_count() or 1
+    return min(settings.IMPORT_WORKERS or cpus, cpus)
+
+
+def _column_index(ref: str) -> int:
+    """Zero-based column of a cell reference such as "AB12" """
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _rich_text(element: Optional[ElementTree.Element]) -> str:
+    """Text of a string item: a plain <t> or formatted runs (phonetic hints are skipped)"""
+    if element is None:
+        return ""
+    parts = []
+    for child in element:
+        if child.tag == _TEXT:
+            parts.append(child.text or "")
+        elif child.tag == _RUN:
+            text = child.find(_TEXT)
+            parts.append(text.text or "" if text is not None else "")
+    return "".join(parts)
+
+
+def _cell_value(cell: ElementTree.Element, shared: Sequence[str]):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return _rich_text(cell.find(_INLINE)) or None
+    element = cell.find(_VALUE)
+    if element is None or element.text is None:
+        return None
+    text = element.text
+    if kind == "s":
+        return shared[int(text)] or None
+    if kind in ("str", "e"):
+        return text or None
+    if kind == "b":
+        return text == "1"
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def parse_rows(xml: bytes, columns: int, shared: Sequence[str]) -> Tuple[List[int], List[List]]:
+    """Excel row numbers and cell values of an XML document holding <row> elements"""
+    numbers, rows = [], []
+    for position, row in enumerate(ElementTree.fromstring(xml).iter(_ROW)):
+        values = [None] * columns
+        for offset, cell in enumerate(row.iter(_CELL)):
+            ref = cell.get("r")
+            col = _column_index(ref) if ref else offset
+            if col < columns:
+                values[col] = _cell_value(cell, shared)
+        number = row.get("r")
+        numbers.append(int(number) if number else position)
+        rows.append(values)
+    return numbers, rows
+
+
+@dataclass
+class SheetLayout:
+    """Header of a worksheet and where its data rows start in the XML"""
+    member: str
+    header: List[str]
+    root_open: bytes
+    root_close: bytes
+    row_tag: bytes = b"row"
+    data_end_tag: bytes = b"</sheetData>"
+    # Offset of the first data row's XML (None when the sheet has no data rows)
+    data_start: Optional[int] = None
+    # Uncompressed size of the worksheet XML
+    size: int = 0
+
+    def estimated_ranges(self, chunk_bytes: int = IMPORT_CHUNK_BYTES) -> int:
+        if self.data_start is None:
+            return 0
+        return -(-(self.size - self.data_start) // chunk_bytes)
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    try:
+        root = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+    except KeyError:
+        return []
+    return [_rich_text(item) for item in root.iter(f"{{{_MAIN_NS}}}si")]
+
+
+def _first_worksheet(archive: zipfile.ZipFile) -> Optional[str]:
+    """Path of the first sheet of the workbook (what pd.read_excel reads by default)"""
+    try:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    except KeyError:
+        return None
+    sheet = workbook.find(f"{{{_MAIN_NS}}}sheets/{{{_MAIN_NS}}}sheet")
+    if sheet is None:
+        return None
+    rel_id = sheet.get(f"{{{_REL_NS}}}id")
+    for rel in rels.iter(f"{{{_PKG_REL_NS}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    return None
+
+
+def _find_tag(buffer: bytes, tag: bytes, start: int = 0) -> int:
+    """Position of the next <tag element (not a longer tag name sharing the prefix)"""
+    pattern = b"<" + tag
+    while True:
+        index = buffer.find(pattern, start)
+        if index < 0 or index + len(pattern) >= len(buffer):
+            return -1
+        if buffer[index + len(pattern):index + len(pattern) + 1] in (b" ", b">", b"/", b"\t", b"\r", b"\n"):
+            return index
+        start = index + 1
+
+
+def worksheet_layout(path: str) -> Optional[SheetLayout]:
+    """
+    Header of the first worksheet and the offset of its data rows
+
+    Only the start of the worksheet is decompressed. Returns None when the
+    file is not a workbook this reader understands, so the caller can fall
+    back to pandas.
+    """
+    try:
+        archive = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError):
+        return None
+    with archive:
+        member = _first_worksheet(archive)
+        if member is None or member not in archive.namelist():
+            return None
+        shared = _shared_strings(archive)
+        size = archive.getinfo(member).file_size
+
+        with archive.open(member) as stream:
+            # Everything before the rows (sheet properties, column widths) is small
+            buffer = b""
+            sheet_data = None
+            while sheet_data is None and len(buffer) < (4 << 20):
+                block = stream.read(_READ_BLOCK)
+                if not block:
+                    break
+                buffer += block
+                sheet_data = re.search(rb"<((?:[\w.-]+:)?)sheetData\b[^>]*?(/?)>", buffer)
+            root = re.search(rb"<((?:[\w.-]+:)?worksheet)\b[^>]*>", buffer)
+            if root is None or sheet_data is None:
+                return None
+            root_open, root_close = root.group(0), b"</" + root.group(1) + b">"
+            if sheet_data.group(2):
+                return SheetLayout(member, [], root_open, root_close)
+            row_tag = sheet_data.group(1) + b"row"
+            data_end_tag = b"</" + sheet_data.group(1) + b"sheetData>"
+            row_close = b"</" + row_tag + b">"
+
+            # Header row
+            while True:
+                first = _find_tag(buffer, row_tag, sheet_data.end())
+                header_end = buffer.find(row_close, first) if first >= 0 else -1
+                if header_end >= 0 or data_end_tag in buffer:
+                    break
+                block = stream.read(_READ_BLOCK)
+                if not block:
+                    return None
+                buffer += block
+            if first < 0 or header_end < 0:
+                return SheetLayout(member, [], root_open, root_close)
+            header_end += len(row_close)
+            _, rows = parse_rows(root_open + buffer[first:header_end] + root_close, 16384, shared)
+            header = rows[0] if rows else []
+            while header and header[-1] is None:
+                header.pop()
+            header = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+            return SheetLayout(member, header, root_open, root_close, row_tag, data_end_tag, header_end, size)
+
+
+def row_ranges(path: str, layout: SheetLayout, chunk_bytes: int = IMPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    XML of the data rows in consecutive ranges of about chunk_bytes, cut at
+    row starts while the worksheet is decompressed in a single pass
+    """
+    if layout.data_start is None:
+        return
+    with zipfile.ZipFile(path) as archive, archive.open(layout.member) as stream:
+        buffer = bytearray()
+        position = 0
+        while position < layout.data_start:
+            block = stream.read(_READ_BLOCK)
+            if not block:
+                raise ValueError("The worksheet ends before its data rows")
+            buffer += block[max(layout.data_start - position, 0):]
+            position += len(block)
+
+        # Bytes of buffer already searched for a cut, less a margin for tags split across blocks
+        searched = 0
+        while True:
+            cut = _find_tag(buffer, layout.row_tag, max(chunk_bytes, searched))
+            if cut >= 0:
+                yield bytes(buffer[:cut])
+                del buffer[:cut]
+                searched = 0
+                continue
+            closing = buffer.find(layout.data_end_tag, searched)
+            if closing >= 0:
+                if 0 <= _find_tag(buffer, layout.row_tag) < closing:
+                    yield bytes(buffer[:closing])
+                return
+            block = stream.read(_READ_BLOCK)
+            if not block:
+                raise ValueError("The worksheet ends before the end of its rows")
+            searched = max(len(buffer) - 64, 0)
+            buffer += block
+
+
+# Per-process state of parse workers, set by _init_parser
+_parser_state: Dict[str, object] = {}
+
+
+def _init_parser(path: str, layout: SheetLayout) -> None:
+    with zipfile.ZipFile(path) as archive:
+        _parser_state.update(layout=layout, shared=_shared_strings(archive))
+
+
+def _parse_range(xml: bytes) -> NormalizedRows:
+    """Parse and normalize the XML of one row range of the worksheet (runs in a worker)"""
+    layout, shared = _parser_state["layout"], _parser_state["shared"]
+    numbers, rows = parse_rows(layout.root_open + xml + layout.root_close, len(layout.header), shared)
+    # Index rows like pd.read_excel does: the first data row (Excel row 2) is 0
+    frame = pd.DataFrame(rows, columns=layout.header, index=[number - 2 for number in numbers], dtype=object)
+    return normalize_planisware(frame)
+
+
+class PlaniswareFile:
+    """An uploaded Planisware export, read as normalized chunks in file order"""
+
+    def __init__(self, path: str, is_csv: bool = False):
+        self.path = path
+        self.layout = None if is_csv else worksheet_layout(path)
+        self.frame = None
+        if self.layout is None:
+            # Only empty cells are missing; pandas would also read the region "NA" as NaN
+            na = {"keep_default_na": False, "na_values": [""]}
+            self.frame = pd.read_csv(path, **na) if is_csv else pd.read_excel(path, **na)
+            self.columns = list(self.frame.columns)
+        else:
+            self.columns = self.layout.header
+
+    def chunks(self, workers: int = 1) -> Iterator[NormalizedRows]:
+        if self.layout is None:
+            for start in range(0, len(self.frame), IMPORT_CHUNK_ROWS):
+                yield normalize_planisware(self.frame.iloc[start:start + IMPORT_CHUNK_ROWS])
+            return
+
+        ranges = row_ranges(self.path, self.layout)
+        expected = self.layout.estimated_ranges()
+        if workers <= 1 or expected < IMPORT_POOL_MIN_RANGES:
+            _init_parser(self.path, self.layout)
+            try:
+                for xml in ranges:
+                    yield _parse_range(xml)
+            finally:
+                _parser_state.clear()
+            return
+
+        # Spawned, not forked: the server process has threads and open connections
+        workers = min(workers, expected)
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_parser,
+            initargs=(self.path, self.layout)
+        )
+        try:
+            # Keep a bounded number of ranges in flight; each task carries its own bytes
+            pending = deque()
+            for xml in ranges:
+                pending.append(pool.submit(_parse_range, xml))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                chunk = pending.popleft().result()
+                xml = next(ranges, None)
+                if xml is not None:
+                    pending.append(pool.submit(_parse_range, xml))
+                yield chunk
+        finally:
+            ranges.close()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ImportWriter:
+    """
+    Applies normalized chunks to the database in bulk
+
+    Users and competencies are resolved with one IN query per batch of new
+    keys and inserted in bulk; assessments are upserted on (user, competency)
+    with the last row of the file winning. Region, country, location and job
+    role names are resolved to lookup ids the same way and set on the users
+    (and the job role on the competencies) in one bulk update per chunk;
+    blank cells keep the stored value. The caller commits. Statistics
+    keep the meaning of the row-by-row import: "existing" counts rows whose
+    user, competency or assessment was already there (or created by an
+    earlier row).
+
+    A chunk failing with a data error (constraint, value too long) is rolled
+    back to its savepoint and its rows are reported as write_failed; other
+    database errors (lost connection, locked database) abort the import.
+    """
+
+    def __init__(self, db: Session, hash_default_password: Callable[[], str]):
+        self.db = db
+        self.hash_default_password = hash_default_password
+        self._hashed_password = None
+        self.imported_at = datetime.utcnow()
+        self.user_ids: Dict[str, int] = {}
+        self.competency_ids: Dict[str, int] = {}
+        # lookup table -> {name: id}
+        self.lookup_ids: Dict[str, Dict[str, int]] = {
+            lookup.__tablename__: {} for _, _, lookup, _ in ORGANIZATION_LOOKUPS
+        }
+        self.report = ImportReport()
+        self.repeats = RepeatCheck()
+        self.stats = {
+            "users_created": 0,
+            "users_existing": 0,
+            "competencies_created": 0,
+            "competencies_existing": 0,
+            "assessments_created": 0,
+            "assessments_existing": 0,
+            "rows_processed": 0,
+            "rows_skipped": 0,
+            "rows_failed": 0
+        }
+
+    @property
+    def hashed_password(self) -> str:
+        """New users share one hash of the default password, computed only if any are created"""
+        if self._hashed_password is None:
+            self._hashed_password = self.hash_default_password()
+        return self._hashed_password
+
+    def _load_ids(self, key_column, id_column, keys: List, into: Dict) -> None:
+        for start in range(0, len(keys), UPSERT_CHUNK_SIZE):
+            into.update(self.db.execute(
+                select(key_column, id_column).where(key_column.in_(keys[start:start + UPSERT_CHUNK_SIZE]))
+            ).all())
+
+    def _resolve(self, model, column, key: str, frame: pd.DataFrame, ids: Dict, new_row) -> int:
+        """Map the frame's key column to ids, inserting the missing rows; returns the number inserted"""
+        first = frame.drop_duplicates(key)
+        unknown = [value for value in first[key] if value not in ids]
+        if not unknown:
+            return 0
+        self._load_ids(column, model.id, unknown, ids)
+        new = first[~first[key].isin(ids.keys())]
+        if new.empty:
+            return 0
+        self.db.execute(insert(model), [new_row(row) for row in new.itertuples(index=False)])
+        self._load_ids(column, model.id, list(new[key]), ids)
+        return len(new)
+
+    def write(self, chunk: NormalizedRows) -> None:
+        """Validate a chunk and write it in its own savepoint"""
+        self.stats["rows_skipped"] += chunk.skipped
+        self.report.add(chunk.issues)
+        frame = chunk.frame
+        self.report.add(self.repeats(frame))
+        if frame.empty:
+            return
+
+        # Ids resolved in a chunk that is rolled back must be forgotten
+        user_ids, competency_ids = dict(self.user_ids), dict(self.competency_ids)
+        lookup_ids = {column: dict(ids) for column, ids in self.lookup_ids.items()}
+        try:
+            with savepoint(self.db):
+                created = self._write(frame)
+        except (IntegrityError, DataError) as e:
+            self.user_ids, self.competency_ids, self.lookup_ids = user_ids, competency_ids, lookup_ids
+            self.stats["rows_failed"] += len(frame)
+            self.report.add(issue_frame(frame.index, "write_failed", "", str(e.orig)[:200]))
+            return
+
+        self.repeats.record(frame)
+        for key, count in created.items():
+            self.stats[key] += count
+        self.stats["rows_processed"] += len(frame)
+
+    def _write(self, frame: pd.DataFrame) -> Dict[str, int]:
+        """Insert and upsert the rows of a chunk; returns the created counts"""
+        users_created = self._resolve(User, User.email, "email", frame, self.user_ids, lambda row: {
+            "email": row.email, "name": row.name, "role": UserRole.EMPLOYEE, "hashed_password": self.hashed_password
+        })
+        competencies_created = self._resolve(
+            Competency, Competency.name, "skillset", frame, self.competency_ids, lambda row: {
+                "name": row.skillset, "description": row.description, "category": row.category
+            }
+        )
+
+        pairs = pd.DataFrame({
+            "user_id": frame["email"].map(self.user_ids),
+            "competency_id": frame["skillset"].map(self.competency_ids),
+            "proficiency_level": frame["proficiency"]
+        }).drop_duplicates(["user_id", "competency_id"], keep="last")
+        user_ids = [int(user_id) for user_id in pairs["user_id"].unique()]
+        existing = set()
+        for start in range(0, len(user_ids), UPSERT_CHUNK_SIZE):
+            existing.update(self.db.execute(
+                select(Assessment.user_id, Assessment.competency_id)
+                .where(Assessment.user_id.in_(user_ids[start:start + UPSERT_CHUNK_SIZE]))
+            ).all())
+        rows = [
+            {"user_id": int(user_id), "competency_id": int(competency_id),
+             "proficiency_level": int(level), "assessed_at": self.imported_at}
+            for user_id, competency_id, level in pairs.itertuples(index=False)
+        ]
+        assessments_created = sum((row["user_id"], row["competency_id"]) not in existing for row in rows)
+        upsert(self.db, Assessment, rows, index_elements=["user_id", "competency_id"],
+               update_columns=["proficiency_level"])
+        self._write_organization(frame)
+        return {
+            "users_created": users_created,
+            "competencies_created": competencies_created,
+            "assessments_created": assessments_created
+        }
+
+    def _write_organization(self, frame: pd.DataFrame) -> None:
+        """Set the lookup ids of the chunk's users and competencies from their last row"""
+        keys = {User: ("email", self.user_ids), Competency: ("skillset", self.competency_ids)}
+        updates: Dict[type, Dict[int, Dict[str, int]]] = {User: {}, Competency: {}}
+        for model, column, lookup, source in ORGANIZATION_LOOKUPS:
+            key, key_ids = keys[model]
+            names = frame.drop_duplicates(key, keep="last").set_index(key)[source].dropna().astype(str)
+            if names.empty:
+                continue
+            ids = self.lookup_ids[lookup.__tablename__]
+            self._resolve(lookup, lookup.name, "name", names.to_frame("name"), ids, lambda row: {"name": row.name})
+            for value, lookup_id in names.map(ids).items():
+                updates[model].setdefault(key_ids[value], {})[column] = lookup_id
+        for model, rows in updates.items():
+            if rows:
+                self.db.execute(update(model), [{"id": row_id, **values} for row_id, values in rows.items()])
+
+    def finish(self) -> Dict:
+        """
+        Final statistics with the validation summary (issue counts, sample,
+        report download)
+
+        Also bumps the assessments and imports generations, so every worker
+        rebuilds its in-memory views once the caller commits.
+        """
+        bump_generation(self.db, ASSESSMENTS)
+        bump_generation(self.db, IMPORTS)
+        processed = self.stats["rows_processed"]
+        self.stats["users_existing"] = processed - self.stats["users_created"]
+        self.stats["competencies_existing"] = processed - self.stats["competencies_created"]
+        self.stats["assessments_existing"] = processed - self.stats["assessments_created"]
+        self.stats.update(self.report.summary())
+        return self.stats
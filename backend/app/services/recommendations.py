@@ -0,0 +1,192 @@
+"""
+Similarity-based recommendations over user skill profiles
+Builds sparse user x feature vectors from assessments (competencies) and user
+skills (catalog skills), weighted by proficiency, and precomputes cosine
+top-k neighbors for users and features in one pass. Neighbors are rebuilt in
+every worker after imports, tracked by the stored imports generation (see
+services.generations).
+"""
+import threading
+from typing import Dict, List, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.assessment import Assessment
+from ..models.career import UserSkill
+from .generations import IMPORTS, current_generation
+
+COMPETENCY = "competency"
+SKILL = "skill"
+
+# Rows per similarity block; bounds the dense block to BLOCK_SIZE x n floats
+BLOCK_SIZE = 1024
+
+
+def _top_k(similarity: np.ndarray, k: int, offset: int) -> List[List[Tuple[int, float]]]:
+    """Top-k (column, score) pairs per row of a dense block, excluding self and zeros"""
+    rows = np.arange(similarity.shape[0])
+    self_cols = rows + offset
+    inside = self_cols < similarity.shape[1]
+    similarity[rows[inside], self_cols[inside]] = 0.0
+
+    k = min(k, similarity.shape[1])
+    if k == 0:
+        return [[] for _ in rows]
+    candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(similarity, candidates, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    return [
+        [(int(c), float(s)) for c, s in zip(row_cols, row_scores) if s > 0]
+        for row_cols, row_scores in zip(candidates, scores)
+    ]
+
+
+def _cosine_neighbors(vectors, k: int) -> List[List[Tuple[int, float]]]:
+    """Cosine top-k neighbors between the rows of a sparse matrix, computed blockwise"""
+    from scipy import sparse
+
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel()).astype(np.float32)
+    norms[norms == 0] = 1.0
+    normalized = (sparse.diags(1.0 / norms) @ vectors).tocsr().astype(np.float32)
+    transposed = normalized.T.tocsc()
+
+    neighbors = []
+    for start in range(0, normalized.shape[0], BLOCK_SIZE):
+        block = (normalized[start:start + BLOCK_SIZE] @ transposed).toarray()
+        neighbors.extend(_top_k(block, k, start))
+    return neighbors
+
+
+class RecommendationEngine:
+    """Precomputed nearest neighbors for users, competencies and skills"""
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self._lock = threading.RLock()
+        self._loaded = False
+        # Stored imports generation the neighbors reflect
+        self._generation = 0
+        self._vectors = None
+        self._user_ids = np.empty(0, dtype=np.int64)
+        self._user_rows: Dict[int, int] = {}
+        self._features: List[Tuple[str, int]] = []
+        self._feature_cols: Dict[Tuple[str, int], int] = {}
+        self._user_neighbors: Dict[int, List[Tuple[int, float]]] = {}
+        self._feature_neighbors: Dict[Tuple[str, int], List[Tuple[int, float]]] = {}
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build vectors and neighbor lists on first use and after every import"""
+        generation = current_generation(db, IMPORTS)
+        with self._lock:
+            if not self._loaded or self._generation != generation:
+                self._build(db)
+                self._generation = generation
+
+    def invalidate(self) -> None:
+        """Drop precomputed neighbors; they are rebuilt on the next request"""
+        with self._lock:
+            self._loaded = False
+
+    def apply(self, rows, generation: int) -> None:
+        """
+        Single assessment writes barely move neighborhoods, so they do not
+        trigger a rebuild; neighbors are refreshed after imports instead.
+        """
+
+    def _build(self, db: Session) -> None:
+        from scipy import sparse
+
+        entries = [
+            (user_id, (COMPETENCY, competency_id), proficiency.value)
+            for user_id, competency_id, proficiency in db.query(
+                Assessment.user_id, Assessment.competency_id, Assessment.proficiency_level
+            )
+        ]
+        entries.extend(
+            (user_id, (SKILL, skill_id), proficiency.value)
+            for user_id, skill_id, proficiency in db.query(
+                UserSkill.user_id, UserSkill.skill_id, UserSkill.proficiency_level
+            )
+            if skill_id is not None
+        )
+
+        user_ids = sorted({user_id for user_id, _, _ in entries})
+        features = sorted({feature for _, feature, _ in entries})
+        user_rows = {user_id: row for row, user_id in enumerate(user_ids)}
+        feature_cols = {feature: col for col, feature in enumerate(features)}
+
+        vectors = sparse.csr_matrix(
+            (
+                np.array([weight for _, _, weight in entries], dtype=np.float32),
+                (
+                    np.array([user_rows[u] for u, _, _ in entries], dtype=np.int64),
+                    np.array([feature_cols[f] for _, f, _ in entries], dtype=np.int64)
+                )
+            ),
+            shape=(len(user_ids), len(features))
+        )
+
+        user_neighbors = {}
+        if len(user_ids):
+            for row, neighbors in enumerate(_cosine_neighbors(vectors, self.top_k)):
+                user_neighbors[user_ids[row]] = [(user_ids[col], score) for col, score in neighbors]
+
+        # Feature neighbors are computed within each kind (skills with skills,
+        # competencies with competencies) from their user co-occurrence columns
+        feature_neighbors = {}
+        by_column = vectors.T.tocsr()
+        for kind in (COMPETENCY, SKILL):
+            cols = np.array([col for col, feature in enumerate(features) if feature[0] == kind], dtype=np.int64)
+            if not len(cols):
+                continue
+            for position, neighbors in enumerate(_cosine_neighbors(by_column[cols], self.top_k)):
+                feature_neighbors[features[cols[position]]] = [
+                    (features[cols[col]][1], score) for col, score in neighbors
+                ]
+
+        self._vectors = vectors
+        self._user_ids = np.array(user_ids, dtype=np.int64)
+        self._user_rows = user_rows
+        self._features = features
+        self._feature_cols = feature_cols
+        self._user_neighbors = user_neighbors
+        self._feature_neighbors = feature_neighbors
+        self._loaded = True
+
+    def similar_users(self, user_id: int, limit: int = 10) -> List[Tuple[int, float]]:
+        """Users with the most similar profiles as (user_id, cosine similarity)"""
+        return self._user_neighbors.get(user_id, [])[:limit]
+
+    def related(self, kind: str, feature_id: int, limit: int = 10) -> List[Tuple[int, float]]:
+        """Competencies or skills most often held together with the given one"""
+        return self._feature_neighbors.get((kind, feature_id), [])[:limit]
+
+    def suggested_competencies(self, user_id: int, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Competencies common among a user's nearest neighbors that the user lacks
+
+        Scores are the similarity-weighted proficiency sums over the neighbors.
+        """
+        with self._lock:
+            row = self._user_rows.get(user_id)
+            neighbors = self._user_neighbors.get(user_id, [])
+            if row is None or not neighbors:
+                return []
+            neighbor_rows = [self._user_rows[uid] for uid, _ in neighbors]
+            weights = np.array([score for _, score in neighbors], dtype=np.float32)
+            scores = np.asarray(self._vectors[neighbor_rows].T @ weights).ravel()
+            scores[self._vectors[row].indices] = 0.0
+
+            suggestions = []
+            for col in np.argsort(-scores, kind="stable"):
+                if scores[col] <= 0 or len(suggestions) == limit:
+                    break
+                kind, feature_id = self._features[col]
+                if kind == COMPETENCY:
+                    suggestions.append((feature_id, round(float(scores[col]), 3)))
+            return suggestions
+
+
+# Global instance
+recommendation_engine = RecommendationEngine()
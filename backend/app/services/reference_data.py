@@ -0,0 +1,259 @@
+"""
+Reference data loader
+Applies CareerFramework.json, TechMasterData.json and Skillsets.json to the
+database with bulk upserts keyed on natural keys (track + pay class, area_key,
+area + pay class, skill name + parent category). Each table is diffed
+against the source first, so only new or changed rows are written and a
+rerun with unchanged files costs one SELECT per table. Rows that exist in the
+database but not in the source are reported, never deleted, since user data
+references them. The JSON is read through the compiled reference snapshot
+(reference_snapshot.py) rather than parsed again here.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal, upsert
+from ..models.career import CareerLevel, CompetencyArea, CompetencyExpectation, Skill
+from .cache import response_cache
+from .reference_snapshot import DATA_DIR, ReferenceSnapshot, build_snapshot, reference_snapshot
+
+DATASETS = ("career", "skills")
+
+
+@dataclass
+class TableDiff:
+    """Changes needed to bring one table in line with its source"""
+    table: str
+    inserts: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+    missing_from_source: List[str] = field(default_factory=list)
+    changed_columns: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserts or self.updates)
+
+    def summary(self, verbose: bool = False) -> Dict[str, Any]:
+        result = {
+            "inserted": len(self.inserts),
+            "updated": len(self.updates),
+            "unchanged": self.unchanged,
+            "missing_from_source": len(self.missing_from_source)
+        }
+        if verbose:
+            result["details"] = {
+                "insert": [row["_key"] for row in self.inserts],
+                "update": self.changed_columns,
+                "missing_from_source": self.missing_from_source
+            }
+        return result
+
+
+def diff_table(db: Session, model, key_columns: Sequence[str], value_columns: Sequence[str],
+               rows: List[Dict[str, Any]]) -> TableDiff:
+    """
+    Compare source rows with the table on their natural key
+
+    Args:
+        db: Database session
+        model: Mapped model class
+        key_columns: Columns of the model's unique natural key
+        value_columns: Columns owned by the source, overwritten on change
+        rows: Source rows; each carries a readable "_key" for reports
+    """
+    columns = [getattr(model, name) for name in (*key_columns, *value_columns)]
+    existing = {
+        tuple(row[:len(key_columns)]): tuple(row[len(key_columns):])
+        for row in db.execute(select(*columns))
+    }
+    diff = TableDiff(model.__tablename__)
+    seen = set()
+    for row in rows:
+        key = tuple(row[name] for name in key_columns)
+        seen.add(key)
+        current = existing.get(key)
+        if current is None:
+            diff.inserts.append(row)
+            continue
+        changed = [name for name, value in zip(value_columns, current) if row[name] != value]
+        if changed:
+            diff.updates.append(row)
+            diff.changed_columns[row["_key"]] = changed
+        else:
+            diff.unchanged += 1
+    diff.missing_from_source = ["/".join(str(part) for part in key) for key in existing if key not in seen]
+    return diff
+
+
+def apply_diff(db: Session, model, key_columns: Sequence[str], value_columns: Sequence[str], diff: TableDiff) -> None:
+    """Upsert the new and changed rows of a diff; the caller commits"""
+    if not diff.changed:
+        return
+    rows = [
+        {name: row[name] for name in (*key_columns, *value_columns)}
+        for row in diff.inserts + diff.updates
+    ]
+    upsert(db, model, rows, index_elements=list(key_columns), update_columns=list(value_columns))
+
+
+def load_sources(data_dir: Path = DATA_DIR) -> ReferenceSnapshot:
+    """The process-wide snapshot for the default sources, otherwise parse data_dir directly"""
+    if data_dir == DATA_DIR:
+        return reference_snapshot()
+    return build_snapshot(data_dir)
+
+
+def career_level_rows(framework: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_key": f"{track}/{level['pay_class']}",
+            "track": track,
+            "pay_class": level["pay_class"],
+            "level": level["level"],
+            "title": level["title"],
+            "summary": level["summary"],
+            "impact_scope": level["impact_scope"],
+            "project_category": level.get("project_category")
+        }
+        for track, track_data in framework["career_tracks"].items()
+        for level in track_data["levels"]
+    ]
+
+
+def competency_area_rows(framework: Dict[str, Any]) -> List[Dict[str, Any]]:
+    areas = [(key, data) for key, data in framework["competency_areas"].items()]
+    areas += [(f"architect_{key}", data) for key, data in framework["architect_competencies"].items()]
+    return [
+        {"_key": key, "area_key": key, "name": data["name"], "description": data["description"]}
+        for key, data in areas
+    ]
+
+
+def expectation_rows(framework: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expectations keyed by (area_key, pay_class); area ids are resolved when applied"""
+    rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def add(area_key: str, pay_class: str, expectations: str, scope: Optional[str] = None):
+        rows[(area_key, pay_class)] = {
+            "_key": f"{area_key}/{pay_class}",
+            "area_key": area_key,
+            "pay_class": pay_class,
+            "expectations": expectations,
+            "scope": scope
+        }
+
+    for area_key, area in framework["competency_areas"].items():
+        for pay_class, level in area["levels"].items():
+            add(area_key, pay_class, level["expectations"], level.get("scope"))
+    for area_key, area in framework["architect_competencies"].items():
+        if "shared" in area:
+            for pay_class in ["PC09", "PC10"]:
+                add(f"architect_{area_key}", pay_class, area["shared"]["expectations"])
+        for level_key in ["architect", "senior_architect"]:
+            if level_key in area:
+                level = area[level_key]
+                add(f"architect_{area_key}", level["pay_class"], level["expectations"])
+    return list(rows.values())
+
+
+def skill_rows(tech_data: Dict[str, Any], skillsets: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for item in tech_data["flat"]:
+        rows[(item["sub_skill"], item["parent_skill"])] = {
+            "name": item["sub_skill"],
+            "parent_category": item["parent_skill"],
+            "description": item["full_name"],
+            "category": None,
+            "roles": None,
+            "is_data_skill": 0
+        }
+    for skillset in skillsets["skillsets"]:
+        rows[(skillset["name"], "Data")] = {
+            "name": skillset["name"],
+            "parent_category": "Data",
+            "description": skillset.get("description", ""),
+            "category": skillset.get("category", "Standard"),
+            "roles": skillset.get("roles", ""),
+            "is_data_skill": 1
+        }
+    return [{"_key": f"{name} ({parent})", **row} for (name, parent), row in rows.items()]
+
+
+CAREER_LEVEL_KEY = ("track", "pay_class")
+CAREER_LEVEL_VALUES = ("level", "title", "summary", "impact_scope", "project_category")
+AREA_KEY = ("area_key",)
+AREA_VALUES = ("name", "description")
+EXPECTATION_KEY = ("competency_area_id", "pay_class")
+EXPECTATION_VALUES = ("expectations", "scope")
+SKILL_KEY = ("name", "parent_category")
+SKILL_VALUES = ("description", "category", "roles", "is_data_skill")
+
+
+def _with_area_ids(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Resolve area_key to competency_area_id; areas not in the database yet get None"""
+    area_ids = dict(db.execute(select(CompetencyArea.area_key, CompetencyArea.id)).all())
+    return [{**row, "competency_area_id": area_ids.get(row["area_key"])} for row in rows]
+
+
+def load_reference_data(db: Session, datasets: Sequence[str] = DATASETS, dry_run: bool = False,
+                        data_dir: Path = DATA_DIR) -> Dict[str, TableDiff]:
+    """
+    Bring reference tables in line with the JSON sources
+
+    Args:
+        db: Database session; committed unless dry_run
+        datasets: "career" (levels, areas, expectations) and/or "skills"
+        dry_run: Only compute the diff
+        data_dir: Directory holding the JSON files
+
+    Returns:
+        Diff per table, as computed before applying
+    """
+    diffs: Dict[str, TableDiff] = {}
+    sources = load_sources(data_dir)
+
+    if "career" in datasets:
+        framework = sources.framework
+        diffs["career_levels"] = diff_table(db, CareerLevel, CAREER_LEVEL_KEY, CAREER_LEVEL_VALUES,
+                                            career_level_rows(framework))
+        diffs["competency_areas"] = diff_table(db, CompetencyArea, AREA_KEY, AREA_VALUES,
+                                               competency_area_rows(framework))
+        if not dry_run:
+            apply_diff(db, CareerLevel, CAREER_LEVEL_KEY, CAREER_LEVEL_VALUES, diffs["career_levels"])
+            apply_diff(db, CompetencyArea, AREA_KEY, AREA_VALUES, diffs["competency_areas"])
+            db.flush()
+        # In a dry run, expectations of areas still to be inserted show up as inserts
+        diffs["competency_expectations"] = diff_table(db, CompetencyExpectation, EXPECTATION_KEY,
+                                                      EXPECTATION_VALUES, _with_area_ids(db, expectation_rows(framework)))
+        if not dry_run:
+            apply_diff(db, CompetencyExpectation, EXPECTATION_KEY, EXPECTATION_VALUES,
+                       diffs["competency_expectations"])
+
+    if "skills" in datasets:
+        diffs["skills"] = diff_table(db, Skill, SKILL_KEY, SKILL_VALUES, skill_rows(
+            sources.tech_data, sources.skillsets
+        ))
+        if not dry_run:
+            apply_diff(db, Skill, SKILL_KEY, SKILL_VALUES, diffs["skills"])
+
+    if dry_run:
+        db.rollback()
+    elif any(diff.changed for diff in diffs.values()):
+        db.commit()
+        response_cache.invalidate("career", "skills")
+    return diffs
+
+
+def sync_reference_data() -> int:
+    """
+    Apply all reference data in its own session (used at startup)
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    with SessionLocal() as db:
+        diffs = load_reference_data(db)
+    return sum(len(diff.inserts) + len(diff.updates) for diff in diffs.values())
@@ -0,0 +1,172 @@
+"""
+Compiled reference-data snapshot
+CareerFramework.json, TechMasterData.json and Skillsets.json are compiled into
+one pickled, frozen snapshot with the lookups the API needs precomputed
+(career path summaries, levels by track and pay class, the hierarchical skill
+tree). The API loads it in one shot at startup instead of parsing JSON per
+request. The snapshot records a format version and a SHA-256 checksum of the
+source files; a missing, stale or older-format snapshot is rebuilt from the
+JSON and rewritten.
+
+Build it ahead of time with `python build_reference_snapshot.py` (run.py does
+this before starting the server). The file is a local build artifact: pickle
+is only safe for files this application wrote itself.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from ..core.config import settings
+from ..core.migrations import BACKEND_DIR
+
+logger = logging.getLogger("uvicorn.error")
+
+# Bump when the snapshot layout changes so old files are rebuilt
+SNAPSHOT_FORMAT_VERSION = 1
+
+SOURCE_FILES = ("CareerFramework.json", "TechMasterData.json", "Skillsets.json")
+
+# Reference files live at the project root, next to backend/
+DATA_DIR = BACKEND_DIR.parent
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Parsed reference data with precomputed lookups; treat contents as read-only"""
+    format_version: int
+    checksum: str
+    built_at: float
+    framework: Dict[str, Any]
+    tech_data: Dict[str, Any]
+    skillsets: Dict[str, Any]
+    # GET /api/career/paths response
+    career_paths: Dict[str, Any]
+    # (track, pay_class) -> level from the framework
+    levels: Dict[Tuple[str, str], Dict[str, Any]]
+    # GET /api/skills/hierarchical response
+    hierarchical_skills: Dict[str, Any]
+
+
+def source_checksum(data_dir: Path = DATA_DIR) -> str:
+    """SHA-256 over the names and bytes of the source files"""
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        digest.update(name.encode())
+        digest.update((data_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+def build_snapshot(data_dir: Path = DATA_DIR) -> ReferenceSnapshot:
+    """Parse the JSON sources and precompute the lookups"""
+    framework, tech_data, skillsets = (
+        json.loads((data_dir / name).read_text(encoding="utf-8")) for name in SOURCE_FILES
+    )
+    career_paths = {"tracks": [
+        {
+            "key": key,
+            "name": data["name"],
+            "description": data["description"],
+            "levels": len(data["levels"]),
+            "level_details": [
+                {
+                    "level": level["level"],
+                    "title": level["title"],
+                    "pay_class": level["pay_class"],
+                    "summary": level["summary"]
+                }
+                for level in data["levels"]
+            ]
+        }
+        for key, data in framework["career_tracks"].items()
+    ]}
+    return ReferenceSnapshot(
+        format_version=SNAPSHOT_FORMAT_VERSION,
+        checksum=source_checksum(data_dir),
+        built_at=time.time(),
+        framework=framework,
+        tech_data=tech_data,
+        skillsets=skillsets,
+        career_paths=career_paths,
+        levels={
+            (track, level["pay_class"]): level
+            for track, data in framework["career_tracks"].items()
+            for level in data["levels"]
+        },
+        hierarchical_skills={"hierarchical": tech_data["hierarchical"], "metadata": tech_data["metadata"]}
+    )
+
+
+def write_snapshot(snapshot: ReferenceSnapshot, path: Path) -> None:
+    """Write atomically so concurrently starting workers never read a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique name per writer, so workers in other processes never share it
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_snapshot(path: Path) -> Optional[ReferenceSnapshot]:
+    """Snapshot at path, or None if missing, unreadable or of another format version"""
+    try:
+        snapshot = pickle.loads(path.read_bytes())
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, TypeError):
+        return None
+    if not isinstance(snapshot, ReferenceSnapshot) or snapshot.format_version != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return snapshot
+
+
+def snapshot_path() -> Path:
+    return BACKEND_DIR / settings.REFERENCE_SNAPSHOT_PATH
+
+
+def ensure_snapshot(path: Optional[Path] = None, data_dir: Path = DATA_DIR) -> Tuple[ReferenceSnapshot, bool]:
+    """
+    Current snapshot, rebuilding it when missing or stale
+
+    Returns:
+        (snapshot, whether it was rebuilt)
+    """
+    path = path or snapshot_path()
+    snapshot = read_snapshot(path)
+    try:
+        checksum = source_checksum(data_dir)
+    except OSError:
+        checksum = None  # Deployed without the JSON sources; trust the snapshot
+    if snapshot is not None and (checksum is None or snapshot.checksum == checksum):
+        return snapshot, False
+
+    snapshot = build_snapshot(data_dir)
+    try:
+        write_snapshot(snapshot, path)
+    except OSError as e:
+        logger.warning("Could not write reference snapshot %s: %s", path, e)
+    return snapshot, True
+
+
+_snapshot: Optional[ReferenceSnapshot] = None
+_lock = threading.Lock()
+
+
+def reference_snapshot() -> ReferenceSnapshot:
+    """The process-wide snapshot, loaded on first use (the lifespan loads it at startup)"""
+    global _snapshot
+    if _snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot, rebuilt = ensure_snapshot()
+                if rebuilt:
+                    logger.info("Reference snapshot rebuilt from JSON sources")
+    return _snapshot
@@ -0,0 +1,127 @@
+"""
+Skill coverage risk report
+Computes per-competency holder counts by level, bus factor, Gini concentration
+and regional coverage over the whole organization in one vectorized pass and
+materializes the result into the competency_risk table.
+"""
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from ..models.analytics import CompetencyRisk
+from ..models.assessment import ProficiencyLevel
+from ..models.organization import Country, Region
+from ..models.user import User
+from .competency_matrix import CompetencyMatrix, competency_matrix, LEVELS
+
+RISK_LEVELS = ["critical", "high", "medium", "low"]
+
+
+def gini_by_column(matrix: np.ndarray) -> np.ndarray:
+    """Gini coefficient of each column (0 = evenly spread, 1 = held by one user)"""
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(matrix.shape[1])
+    values = np.sort(matrix.astype(np.float64), axis=0)
+    totals = values.sum(axis=0)
+    ranks = np.arange(1, n + 1, dtype=np.float64)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gini = (2 * (ranks * values).sum(axis=0)) / (n * totals) - (n + 1) / n
+    return np.where(totals > 0, gini, 0.0)
+
+
+def classify_risk(bus_factor: int, regions_covered: Optional[int]) -> str:
+    """Risk bucket from the number of advanced/expert holders and regional spread"""
+    if bus_factor <= 1:
+        return "critical"
+    if bus_factor == 2:
+        return "high"
+    if bus_factor <= 4 or regions_covered == 1:
+        return "medium"
+    return "low"
+
+
+def user_locations(db: Session) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+    """user_id -> (region, country) of the users with a stored region or country"""
+    return {
+        user_id: (region, country)
+        for user_id, region, country in db.execute(
+            select(User.id, Region.name, Country.name)
+            .outerjoin(Region, Region.id == User.region_id)
+            .outerjoin(Country, Country.id == User.country_id)
+            .where(or_(User.region_id.isnot(None), User.country_id.isnot(None)))
+        )
+    }
+
+
+def refresh_competency_risk(
+    db: Session,
+    locations: Optional[Dict[int, Tuple[Optional[str], Optional[str]]]] = None,
+    matrix: Optional[CompetencyMatrix] = None
+) -> int:
+    """
+    Recompute the risk summary for every competency and replace the table contents
+
+    Args:
+        db: Database session; the caller commits, so an import and its report
+            can be written in one transaction
+        locations: user_id -> (region, country) map; the stored user locations when None
+        matrix: Matrix to summarize, the shared competency_matrix when None;
+            pass a fresh one when the session holds uncommitted writes, so the
+            shared matrix is never built from rows that may be rolled back
+
+    Returns:
+        Number of competencies summarized
+    """
+    matrix = matrix or competency_matrix
+    matrix.ensure_loaded(db)
+    sub, user_ids, competency_ids = matrix.snapshot()
+    if locations is None:
+        locations = user_locations(db)
+
+    counts = np.stack([(sub == level).sum(axis=0) for level in LEVELS], axis=1)
+    holders = counts.sum(axis=1)
+    bus_factor = (sub >= ProficiencyLevel.ADVANCED.value).sum(axis=0)
+    gini = gini_by_column(sub)
+
+    region_counts = [None] * len(competency_ids)
+    country_counts = [None] * len(competency_ids)
+    if locations:
+        regions = np.array([(locations.get(int(uid)) or (None, None))[0] for uid in user_ids], dtype=object)
+        countries = np.array([(locations.get(int(uid)) or (None, None))[1] for uid in user_ids], dtype=object)
+        for col in range(len(competency_ids)):
+            held = sub[:, col] > 0
+            region_counts[col] = Counter(r for r in regions[held] if r)
+            country_counts[col] = len({c for c in countries[held] if c})
+
+    summaries = []
+    for col, competency_id in enumerate(competency_ids):
+        regions_covered = len(region_counts[col]) if region_counts[col] is not None else None
+        summaries.append({
+            "competency_id": int(competency_id),
+            "holders": int(holders[col]),
+            "beginner_count": int(counts[col, 0]),
+            "intermediate_count": int(counts[col, 1]),
+            "advanced_count": int(counts[col, 2]),
+            "expert_count": int(counts[col, 3]),
+            "bus_factor": int(bus_factor[col]),
+            "gini": round(float(gini[col]), 4),
+            "regions_covered": regions_covered,
+            "countries_covered": country_counts[col],
+            "region_coverage": json.dumps(dict(region_counts[col])) if region_counts[col] is not None else None,
+            "risk_level": classify_risk(int(bus_factor[col]), regions_covered)
+        })
+
+    summaries.sort(key=lambda s: (RISK_LEVELS.index(s["risk_level"]), s["bus_factor"], s["holders"], -s["gini"]))
+    computed_at = datetime.utcnow()
+    for rank, summary in enumerate(summaries):
+        summary["risk_rank"] = rank
+        summary["computed_at"] = computed_at
+
+    db.query(CompetencyRisk).delete(synchronize_session=False)
+    if summaries:
+        db.bulk_insert_mappings(CompetencyRisk, summaries)
+    return len(summaries)
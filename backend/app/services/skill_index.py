@@ -0,0 +1,168 @@
+"""
+Inverted skill index for people search
+Keeps, per competency, one bitmap of user ids for every proficiency level so
+multi-skill staffing queries are answered with in-memory AND/OR operations
+instead of per-user database lookups. Each worker rebuilds its index when the
+stored assessments generation moves (see services.generations).
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.assessment import Assessment, ProficiencyLevel
+from .generations import ASSESSMENTS, current_generation
+
+
+def bitmap_to_ids(bitmap: int) -> np.ndarray:
+    """Decode a user id bitmap into a sorted array of user ids"""
+    if not bitmap:
+        return np.empty(0, dtype=np.int64)
+    raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+
+def ids_to_bitmap(user_ids: Iterable[int]) -> int:
+    """Encode user ids into a bitmap with bit user_id set"""
+    ids = np.fromiter(user_ids, dtype=np.int64)
+    if not len(ids):
+        return 0
+    bits = np.zeros(int(ids.max()) + 1, dtype=np.uint8)
+    bits[ids] = 1
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+class SkillIndex:
+    """Competency -> proficiency level -> bitmap of user ids"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        # Stored assessments generation the index reflects
+        self._generation = 0
+        # competency_id -> {level value: bitmap with bit user_id set}
+        self._bitmaps: Dict[int, Dict[int, int]] = {}
+        # competency_id -> {user_id: level value}, used for ranking
+        self._levels: Dict[int, Dict[int, int]] = {}
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build the index from the assessments table on first use and whenever another worker has written"""
+        # Read before the rows: a write landing in between only causes another reload
+        generation = current_generation(db, ASSESSMENTS)
+        with self._lock:
+            if self._loaded and self._generation == generation:
+                return
+            bitmaps: Dict[int, Dict[int, int]] = {}
+            levels: Dict[int, Dict[int, int]] = {}
+            rows = db.query(
+                Assessment.user_id,
+                Assessment.competency_id,
+                Assessment.proficiency_level
+            )
+            for user_id, competency_id, proficiency in rows:
+                level = proficiency.value
+                by_level = bitmaps.setdefault(competency_id, {})
+                by_level[level] = by_level.get(level, 0) | (1 << user_id)
+                levels.setdefault(competency_id, {})[user_id] = level
+            self._bitmaps = bitmaps
+            self._levels = levels
+            self._generation = generation
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        """Drop the index; it is rebuilt on the next query"""
+        with self._lock:
+            self._loaded = False
+            self._bitmaps = {}
+            self._levels = {}
+
+    def apply(self, rows: Iterable[Dict[str, Any]], generation: int) -> None:
+        """
+        Apply committed assessment writes incrementally
+
+        Args:
+            rows: Dicts with user_id, competency_id and proficiency_level
+            generation: Assessments generation the write's transaction bumped to;
+                when other writes came in between, the index is left to reload
+        """
+        with self._lock:
+            if not self._loaded or self._generation != generation - 1:
+                return
+            self._generation = generation
+            for row in rows:
+                user_id = row["user_id"]
+                competency_id = row["competency_id"]
+                level = ProficiencyLevel(row["proficiency_level"]).value
+                bit = 1 << user_id
+                by_level = self._bitmaps.setdefault(competency_id, {})
+                previous = self._levels.setdefault(competency_id, {}).get(user_id)
+                if previous is not None:
+                    by_level[previous] &= ~bit
+                by_level[level] = by_level.get(level, 0) | bit
+                self._levels[competency_id][user_id] = level
+
+    def users_with(self, competency_id: int, min_level: int = ProficiencyLevel.BEGINNER.value) -> int:
+        """Bitmap of users holding a competency at min_level or above"""
+        bitmap = 0
+        for level, users in self._bitmaps.get(competency_id, {}).items():
+            if level >= min_level:
+                bitmap |= users
+        return bitmap
+
+    def search(
+        self,
+        all_of: List[Tuple[int, int]],
+        any_of: Optional[List[Tuple[int, int]]] = None,
+        limit: int = 50,
+        user_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find users matching every `all_of` clause and at least one `any_of` clause
+
+        Clauses are (competency_id, min_level) pairs. Matches are ranked by the
+        sum of their levels across all queried competencies. When user_ids is
+        given, only those users can match.
+
+        Returns:
+            Total number of matches and the top `limit` ranked matches
+        """
+        any_of = any_of or []
+        with self._lock:
+            matches = None
+            for competency_id, min_level in all_of:
+                users = self.users_with(competency_id, min_level)
+                matches = users if matches is None else matches & users
+                if not matches:
+                    break
+
+            if any_of and matches != 0:
+                alternatives = 0
+                for competency_id, min_level in any_of:
+                    alternatives |= self.users_with(competency_id, min_level)
+                matches = alternatives if matches is None else matches & alternatives
+
+            if user_ids is not None and matches:
+                matches &= ids_to_bitmap(user_ids)
+
+            user_ids = bitmap_to_ids(matches or 0)
+            competency_ids = list(dict.fromkeys(c for c, _ in all_of + any_of))
+            level_maps = [self._levels.get(c, {}) for c in competency_ids]
+
+            ranked = []
+            for user_id in user_ids.tolist():
+                levels = {
+                    competency_id: level_map[user_id]
+                    for competency_id, level_map in zip(competency_ids, level_maps)
+                    if user_id in level_map
+                }
+                ranked.append({
+                    "user_id": user_id,
+                    "score": sum(levels.values()),
+                    "levels": levels
+                })
+
+        ranked.sort(key=lambda match: (-match["score"], match["user_id"]))
+        return len(ranked), ranked[:limit]
+
+
+# Global instance
+skill_index = SkillIndex()
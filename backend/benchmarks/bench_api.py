@@ -0,0 +1,208 @@
+"""
+API benchmark suite against a synthetic large organization
+Generates (or reuses) a database from benchmarks/synthetic_data.py, then
+drives the import, directory, profile, catalog search, people search,
+skills-gap and plan endpoints with concurrent clients and reports throughput
+and latency percentiles per scenario. Results are written as JSON so runs can
+be compared for regressions with --compare.
+
+Requests go to the app in-process by default, or to a running server with
+--base-url (start it against the same database).
+
+Run with:
+    python benchmarks/bench_api.py --users 20000 --skills 300 --output results.json
+    python benchmarks/bench_api.py --database sqlite:////tmp/org.db --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from synthetic_data import PAY_CLASSES, populate_database, skill_catalog, write_planisware_file
+
+# A request: (method, url, keyword arguments for the client)
+Request = Tuple[str, str, Dict]
+
+CATALOG_TERMS = ["data", "aws", "java", "sap", "cloud", "test", "python", "power", "ml", "security"]
+
+
+def scenarios(rng: random.Random, users: int, competencies: int, plans: int) -> Dict[str, Callable[[], Request]]:
+    """Request factories per scenario; each call picks fresh random parameters"""
+    def pay_class_step():
+        current = rng.randrange(len(PAY_CLASSES) - 1)
+        return {"current_level": PAY_CLASSES[current], "target_level": PAY_CLASSES[current + 1]}
+
+    return {
+        "directory": lambda: ("GET", "/users/", {"params": {"skip": rng.randrange(max(1, users - 50)), "limit": 50}}),
+        "directory_search": lambda: ("GET", "/users/", {"params": {"search": rng.choice(["ana", "smith", "li", "rao"])}}),
+        "profile": lambda: ("GET", f"/users/{rng.randint(1, users)}", {}),
+        "profile_skills": lambda: ("GET", f"/users/{rng.randint(1, users)}/skills", {}),
+        "catalog_search": lambda: ("GET", "/api/skills/catalog", {"params": {"search": rng.choice(CATALOG_TERMS)}}),
+        "people_by_skill": lambda: ("GET", f"/users/search/by-skill/{rng.randint(1, competencies)}",
+                                    {"params": {"min_level": rng.randint(1, 4)}}),
+        "skills_gap": lambda: ("POST", "/api/career/skills-gap", {"params": pay_class_step()}),
+        "user_plans": lambda: ("GET", f"/api/career/user-plans/{rng.randint(1, max(1, plans))}", {}),
+        "plan_generate": lambda: ("POST", "/api/career/development-plan",
+                                  {"params": {"user_id": rng.randint(1, users), **pay_class_step()}}),
+        "analytics_heatmap": lambda: ("GET", "/api/analytics/heatmap", {})
+    }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies: List[float], errors: int, wall_seconds: float) -> Dict:
+    """Throughput and latency percentiles (ms) for one scenario"""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / wall_seconds, 1),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(ordered, 0.90) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2)
+    }
+
+
+def run_scenario(client, factory: Callable[[], Request], requests: int, concurrency: int) -> Dict:
+    """Issue `requests` requests from `concurrency` threads"""
+    batch = [factory() for _ in range(requests)]
+    latencies, errors = [], 0
+
+    def issue(request: Request):
+        method, url, kwargs = request
+        started = time.perf_counter()
+        response = client.request(method, url, **kwargs)
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, status in pool.map(issue, batch):
+            if status >= 400:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def run_import(client, users: int, skills: int, per_user: int) -> Dict:
+    """Time one Planisware upload of a synthetic export for new people"""
+    path = os.path.join(tempfile.mkdtemp(prefix="growthpath-bench-"), "import.xlsx")
+    # A different seed gives mostly new names, so the import creates users
+    rows = write_planisware_file(path, users, skills, per_user, seed=7)
+    with open(path, "rb") as file:
+        started = time.perf_counter()
+        response = client.post("/import/planisware", files={"file": ("import.xlsx", file)})
+        elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "status": response.status_code,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(rows / elapsed, 1)
+    }
+
+
+def compare(results: Dict, baseline: Dict) -> None:
+    """Print throughput and p95 changes against a previous results file"""
+    print(f"\nCompared with {baseline['generated_at']}:")
+    print(f"{'scenario':<20}{'rps':>10}{'change':>9}{'p95 ms':>10}{'change':>9}")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "p95_ms" not in current or "p95_ms" not in previous:
+            continue
+        rps_change = (current["throughput_rps"] / previous["throughput_rps"] - 1) * 100
+        p95_change = (current["p95_ms"] / previous["p95_ms"] - 1) * 100
+        print(f"{name:<20}{current['throughput_rps']:>10}{rps_change:>+8.1f}%{current['p95_ms']:>10}{p95_change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", help="Existing database URL to benchmark instead of generating one")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--skills-per-user", type=int, default=12)
+    parser.add_argument("--plans", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=300, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--import-users", type=int, default=500, help="People in the timed import (0 to skip)")
+    parser.add_argument("--scenario", action="append", help="Only run the named scenario(s)")
+    parser.add_argument("--cache", choices=["memory", "redis", "none"], help="Override CACHE_BACKEND")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the app in-process")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    url = args.database
+    if url is None:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='growthpath-bench-'), 'org.db')}"
+        print(f"Generating {args.users} users x {args.skills} skills into {url} ...")
+        started = time.perf_counter()
+        populate_database(url, args.users, args.skills, args.skills_per_user, args.plans)
+        print(f"  done in {time.perf_counter() - started:.1f}s")
+
+    # Settings are read when the app is imported, so configure it first
+    os.environ["DATABASE_URL"] = url
+    if args.cache:
+        os.environ["CACHE_BACKEND"] = args.cache
+    if args.base_url:
+        import httpx
+        client = httpx.Client(base_url=args.base_url, timeout=120)
+    else:
+        from fastapi.testclient import TestClient
+        from app.main import app
+        client = TestClient(app)
+    from app.core.config import settings
+
+    rng = random.Random(args.seed)
+    factories = scenarios(rng, args.users, len(skill_catalog(args.skills)), args.plans)
+    selected = args.scenario or list(factories)
+
+    results = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "scale": {"users": args.users, "skills": args.skills, "skills_per_user": args.skills_per_user,
+                  "plans": args.plans},
+        "settings": {"requests": args.requests, "concurrency": args.concurrency, "cache": settings.CACHE_BACKEND,
+                     "database": url.split(":", 1)[0], "target": args.base_url or "in-process",
+                     "python": platform.python_version()},
+        "scenarios": {}
+    }
+
+    with client:
+        print(f"\n{'scenario':<20}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for name in selected:
+            r = run_scenario(client, factories[name], args.requests, args.concurrency)
+            results["scenarios"][name] = r
+            print(f"{name:<20}{r['requests']:>9}{r['errors']:>8}{r.get('throughput_rps', '-'):>9}"
+                  f"{r.get('p50_ms', '-'):>9}{r.get('p95_ms', '-'):>9}{r.get('p99_ms', '-'):>9}")
+
+        if args.import_users and not args.scenario:
+            r = results["import"] = run_import(client, args.import_users, args.skills, args.skills_per_user)
+            print(f"\nimport: {r['rows']} rows in {r['seconds']}s ({r['rows_per_second']} rows/s, status {r['status']})")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
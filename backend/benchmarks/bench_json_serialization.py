@@ -0,0 +1,85 @@
+"""
+Benchmark JSON serialization of large list responses
+Compares FastAPI's default path (jsonable_encoder + stdlib json, with and
+without response_model re-validation) against the orjson response class and
+the direct fast path used by the list endpoints. Times are per 10k rows.
+Run with: python benchmarks/bench_json_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.core.responses import dumps
+from app.models.competency import Competency, CompetencyCategory
+from app.schemas.competency import CompetencyResponse
+
+
+def stdlib_dumps(content) -> bytes:
+    """What fastapi.responses.JSONResponse.render does"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def make_rows(n: int):
+    categories = list(CompetencyCategory)
+    orm_rows = [
+        Competency(id=i, name=f"Competency {i}", description=f"Description of competency {i} " * 3,
+                   category=categories[i % len(categories)])
+        for i in range(n)
+    ]
+    dict_rows = [
+        {"id": c.id, "name": c.name, "description": c.description, "category": c.category.value}
+        for c in orm_rows
+    ]
+    return orm_rows, dict_rows
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orm_rows, dict_rows = make_rows(args.rows)
+    adapter = TypeAdapter(List[CompetencyResponse])
+
+    cases = [
+        ("response_model + json (previous /competencies/)",
+         lambda: stdlib_dumps(adapter.dump_python(adapter.validate_python(orm_rows, from_attributes=True), mode="json"))),
+        ("jsonable_encoder + json (dict endpoints)",
+         lambda: stdlib_dumps(jsonable_encoder(dict_rows))),
+        ("jsonable_encoder + orjson (default class)",
+         lambda: dumps(jsonable_encoder(dict_rows))),
+        ("orjson fast path (json_response / cache)",
+         lambda: dumps(dict_rows)),
+        ("orjson NDJSON stream",
+         lambda: b"".join(dumps(row) + b"\n" for row in dict_rows)),
+    ]
+
+    scale = 10000 / args.rows
+    print(f"{args.rows} rows, median of {args.repeat} runs, ms per 10k rows\n")
+    baseline = None
+    for name, fn in cases:
+        ms = timed(fn, args.repeat) * 1000 * scale
+        baseline = baseline or ms
+        print(f"{name:<50}{ms:>10.2f}{baseline / ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark and equivalence check of Planisware normalization
+Normalizes a synthetic export (with missing names, unknown levels, odd
+categories and non-text values mixed in) once with the vectorized
+normalize_planisware and once row by row with the scalar mapping functions,
+the way the importers used to, and fails unless both give identical rows,
+skip counts and validation issues.
+Run with: python benchmarks/bench_normalization.py [--rows 100000] [--repeat 3]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from app.services.planisware import (
+    OPTIONAL_COLUMNS,
+    ISSUE_COLUMNS,
+    SKILLSET_LEVELS,
+    NormalizedRows,
+    map_category_to_competency_category,
+    map_skillset_level_to_proficiency,
+    normalize_planisware,
+    planisware_email
+)
+from synthetic_data import PLANISWARE_COLUMNS, planisware_rows
+
+# Values planted every few rows to cover the edge cases of each mapping
+ODD_LEVELS = [None, "5th", "1st ", "4TH", 3, np.nan]
+ODD_CATEGORIES = [None, "SOFT skills", "Leadership & Domain", 12, "niche-advanced", "", "Inactive"]
+ODD_NAMES = [None, 42, "  Ana   Smith ", "ÉVA Nagy", "O'Neil Smith"]
+
+
+def synthetic_frame(rows: int) -> pd.DataFrame:
+    # People hold about 10 skillsets each; add people until there are enough rows
+    users = max(rows // 10, 1)
+    generated = planisware_rows(users, 300, 10)
+    while len(generated) < rows:
+        users = users * rows // max(len(generated), 1) + 1
+        generated = planisware_rows(users, 300, 10)
+    frame = pd.DataFrame(generated, columns=PLANISWARE_COLUMNS).head(rows)
+    frame = frame.astype(object)
+    for step, column, values in [(7, "Skillset Level", ODD_LEVELS), (11, "Skillsets.Category", ODD_CATEGORIES),
+                                 (13, "Name", ODD_NAMES), (17, "Skillset", [None, 7])]:
+        positions = np.arange(0, len(frame), step)
+        frame.iloc[positions, frame.columns.get_loc(column)] = [values[i % len(values)] for i in range(len(positions))]
+    return frame
+
+
+def normalize_rowwise(df: pd.DataFrame) -> NormalizedRows:
+    """The per-row mapping of the previous importers, producing the same frame layout"""
+    records, index, issues, skipped = [], [], [], 0
+    for idx, row in df.iterrows():
+        name, skillset = row["Name"], row["Skillset"]
+        if pd.isna(name) or pd.isna(skillset):
+            skipped += 1
+            issues.append((idx + 2, "missing_name" if pd.isna(name) else "missing_skillset"))
+            continue
+        if not isinstance(name, str):
+            issues.append((idx + 2, "name_not_text"))
+            continue
+        if row["Skillset Level"] not in SKILLSET_LEVELS:
+            issues.append((idx + 2, "unknown_level"))
+        record = {
+            "name": name,
+            "email": planisware_email(name),
+            "skillset": str(skillset),
+            "category": map_category_to_competency_category(row.get("Skillsets.Category")),
+            "proficiency": map_skillset_level_to_proficiency(row["Skillset Level"]).value
+        }
+        for source, target in OPTIONAL_COLUMNS.items():
+            value = row.get(source)
+            record[target] = None if value is None or pd.isna(value) else value
+        records.append(record)
+        index.append(idx)
+    frame = pd.DataFrame(records, index=index, columns=[
+        "name", "email", "skillset", "category", "proficiency", *OPTIONAL_COLUMNS.values()
+    ])
+    frame["proficiency"] = frame["proficiency"].astype(np.int8)
+    return NormalizedRows(frame, skipped, pd.DataFrame(issues, columns=ISSUE_COLUMNS[:2]))
+
+
+def timed(fn, repeat: int):
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    rowwise_seconds, expected = timed(lambda: normalize_rowwise(df), max(1, args.repeat // 3))
+    vectorized_seconds, actual = timed(lambda: normalize_planisware(df), args.repeat)
+
+    pd.testing.assert_frame_equal(actual.frame, expected.frame, check_dtype=False)
+    assert actual.frame["proficiency"].dtype == np.int8, actual.frame["proficiency"].dtype
+    assert actual.skipped == expected.skipped, (actual.skipped, expected.skipped)
+    found = actual.issues[ISSUE_COLUMNS[:2]].sort_values(ISSUE_COLUMNS[:2], ignore_index=True)
+    pd.testing.assert_frame_equal(found, expected.issues.sort_values(ISSUE_COLUMNS[:2], ignore_index=True),
+                                  check_dtype=False)
+
+    print(f"{len(df)} rows ({expected.skipped} skipped, {len(expected.issues)} issues): results identical\n")
+    print(f"{'row by row':<14}{rowwise_seconds * 1000:>10.0f} ms{len(df) / rowwise_seconds:>14,.0f} rows/s")
+    print(f"{'vectorized':<14}{vectorized_seconds * 1000:>10.0f} ms{len(df) / vectorized_seconds:>14,.0f} rows/s"
+          f"   {rowwise_seconds / vectorized_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
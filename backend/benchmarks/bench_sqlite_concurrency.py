@@ -0,0 +1,125 @@
+"""
+Benchmark SQLite read throughput while an import is writing
+Compares the default SQLite settings (rollback journal) with the tuned
+profile from app.core.database (WAL, synchronous=NORMAL, mmap, cache).
+Run with: python benchmarks/bench_sqlite_concurrency.py [--readers 4] [--rows 50000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base, create_db_engine, sqlite_pragmas
+from app.models.user import User, UserRole
+from app.models.competency import Competency, CompetencyCategory
+from app.models.assessment import Assessment, ProficiencyLevel
+
+USERS = 2000
+COMPETENCIES = 200
+BATCH_SIZE = 500
+
+
+def seed(engine):
+    """Create the schema with a base population of users and competencies"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "name": f"User {i}", "role": UserRole.EMPLOYEE, "hashed_password": "x"}
+            for i in range(USERS)
+        ])
+        conn.execute(insert(Competency), [
+            {"name": f"Competency {i}", "category": CompetencyCategory.TECHNICAL}
+            for i in range(COMPETENCIES)
+        ])
+
+
+def run_import(engine, rows, done):
+    """Write assessments in committed batches, like the Planisware importer"""
+    Session = sessionmaker(bind=engine)
+    levels = list(ProficiencyLevel)
+    written = 0
+    while written < rows:
+        with Session() as db:
+            batch = []
+            for n in range(written, min(written + BATCH_SIZE, rows)):
+                batch.append({
+                    "user_id": n % USERS + 1,
+                    "competency_id": n // USERS % COMPETENCIES + 1,
+                    "proficiency_level": levels[n % len(levels)]
+                })
+            db.execute(insert(Assessment), batch)
+            db.commit()
+            written += len(batch)
+    done.set()
+
+
+def run_reader(engine, done, latencies, errors):
+    """Run directory-style aggregate reads until the import finishes"""
+    Session = sessionmaker(bind=engine)
+    while not done.is_set():
+        started = time.perf_counter()
+        try:
+            with Session() as db:
+                db.query(Assessment.user_id, func.count(Assessment.id)).group_by(
+                    Assessment.user_id
+                ).limit(100).all()
+                db.query(User).filter(User.name.ilike("%User 1%")).limit(50).all()
+        except Exception:
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def run_profile(name, pragmas, readers, rows):
+    directory = tempfile.mkdtemp(prefix="growthpath-bench-")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", pragmas=pragmas)
+    seed(engine)
+
+    done = threading.Event()
+    latencies, errors = [], []
+    threads = [threading.Thread(target=run_reader, args=(engine, done, latencies, errors)) for _ in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    run_import(engine, rows, done)
+    import_seconds = time.perf_counter() - started
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": name,
+        "import_seconds": round(import_seconds, 2),
+        "reads": len(latencies),
+        "reads_per_second": round(len(latencies) / import_seconds, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None,
+        "read_errors": len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers during an import of {args.rows} assessments\n")
+    print(f"{'profile':<10}{'import s':>10}{'reads':>8}{'reads/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    for name, pragmas in [("default", []), ("tuned", sqlite_pragmas())]:
+        r = run_profile(name, pragmas, args.readers, args.rows)
+        print(f"{r['profile']:<10}{r['import_seconds']:>10}{r['reads']:>8}{r['reads_per_second']:>10}"
+              f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['read_errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Synthetic large-organization dataset generator
+Produces Planisware-shaped skillset exports (the columns of
+plw_employee_taging-test.xlsx) and fully populated databases at a configurable
+scale, for benchmarks and load tests. Skill names come from Skillsets.json and
+TechMasterData.json; skill popularity is skewed so a few skills are held by
+many people, like in the real exports. Output is deterministic for a seed.
+
+Run with:
+    python benchmarks/synthetic_data.py file plw-20k.xlsx --users 20000 --skills 300
+    python benchmarks/synthetic_data.py database sqlite:////tmp/org.db --users 20000 --skills 300 --plans 2000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+PLANISWARE_COLUMNS = [
+    "Name", "Chapter", "Chapter Area", "Skillset Level", "Skillset", "Resource Location",
+    "Resource Country", "Resource Region", "Skillsets.Description", "Skillsets.Category", "Skillsets.Role"
+]
+SKILLSET_LEVELS = ["1st", "2nd", "3rd", "4th"]
+LEVEL_WEIGHTS = [35, 35, 20, 10]
+SKILLSET_CATEGORIES = ["Standard", "Advanced", "Niche"]
+ROLES = ["Software Engineer", "Data Engineer", "Data Scientist", "Data Analyst", "Architect", "Test Engineer"]
+CHAPTERS = ["Backend", "Frontend", "Data", "Cloud", "Embedded", "Quality"]
+
+# (Resource Location, Resource Country, Resource Region)
+LOCATIONS = [
+    ("Sofia", "BG", "EMEA"), ("Stuttgart", "DE", "EMEA"), ("Budapest", "HU", "EMEA"),
+    ("Braga", "PT", "EMEA"), ("Cluj", "RO", "EMEA"), ("Bangalore", "IN", "APA"),
+    ("Coimbatore", "IN", "APA"), ("Ho Chi Minh City", "VN", "APA"), ("Suzhou", "CN", "APA"),
+    ("Vancouver", "CA", "NA"), ("Farmington Hills", "US", "NA"), ("Campinas", "BR", "LA")
+]
+FIRST_NAMES = [
+    "Ana", "John", "Bobi", "Maria", "Ivan", "Elena", "Georgi", "Petya", "Lukas", "Sofia",
+    "Arjun", "Priya", "Minh", "Linh", "Wei", "Jing", "Carlos", "Lucia", "Emma", "Noah",
+    "Olivia", "Liam", "Mila", "Jonas", "Anika", "Rahul", "Chen", "Yuki", "Diego", "Zara"
+]
+LAST_NAMES = [
+    "Smith", "Dow", "Jay", "Ivanova", "Petrov", "Georgieva", "Dimitrov", "Schmidt", "Muller", "Weber",
+    "Sharma", "Patel", "Nguyen", "Tran", "Wang", "Li", "Silva", "Santos", "Costa", "Popescu",
+    "Nagy", "Kovacs", "Fischer", "Wagner", "Becker", "Rao", "Iyer", "Zhang", "Pereira", "Horvat"
+]
+PAY_CLASSES = ["PC06", "PC07", "PC08", "PC09", "PC10"]
+
+
+def skill_catalog(count: int) -> List[Dict[str, str]]:
+    """
+    Skillsets named after the real catalog, extended with variants past its size
+
+    Returns:
+        Dicts with name, description, category and role
+    """
+    skillsets = json.loads((PROJECT_ROOT / "Skillsets.json").read_text(encoding="utf-8"))["skillsets"]
+    tech = json.loads((PROJECT_ROOT / "TechMasterData.json").read_text(encoding="utf-8"))["flat"]
+
+    base = [
+        {"name": s["name"], "description": s.get("description", ""), "category": s.get("category", "Standard"),
+         "role": s.get("roles", "Data Engineer")}
+        for s in skillsets
+    ]
+    base += [
+        {"name": t["sub_skill"], "description": t["full_name"], "category": SKILLSET_CATEGORIES[i % 3],
+         "role": ROLES[i % len(ROLES)]}
+        for i, t in enumerate(tech)
+    ]
+    # Keep names unique; the importer keys competencies on them
+    seen, unique = set(), []
+    for skill in base:
+        if skill["name"] not in seen:
+            seen.add(skill["name"])
+            unique.append(skill)
+
+    catalog = unique[:count]
+    variant = 2
+    while len(catalog) < count:
+        for skill in unique[:count - len(catalog)]:
+            catalog.append({**skill, "name": f"{skill['name']} {variant}"})
+        variant += 1
+    return catalog
+
+
+def person_names(count: int, rng: random.Random) -> List[str]:
+    """Unique "First Last" names; numbered once the combinations run out"""
+    pairs = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    rng.shuffle(pairs)
+    names = []
+    round_no = 1
+    while len(names) < count:
+        suffix = "" if round_no == 1 else str(round_no)
+        names.extend(f"{pair}{suffix}" for pair in pairs[:count - len(names)])
+        round_no += 1
+    return names
+
+
+@lru_cache(maxsize=None)
+def skill_weights(count: int) -> Tuple[float, ...]:
+    """Cumulative Zipf-like popularity: the k-th skill is held about k^-0.8 as often as the first"""
+    return tuple(accumulate(1 / (rank + 1) ** 0.8 for rank in range(count)))
+
+
+def user_skillsets(rng: random.Random, skills: int, per_user: int) -> List[int]:
+    """Distinct skill indexes for one person, drawn by popularity"""
+    cum_weights = skill_weights(skills)
+    wanted = max(1, min(skills, int(rng.gauss(per_user, per_user / 4))))
+    chosen = set()
+    while len(chosen) < wanted:
+        chosen.update(rng.choices(range(skills), cum_weights=cum_weights, k=wanted - len(chosen)))
+    return sorted(chosen)
+
+
+def planisware_rows(users: int, skills: int, per_user: int, seed: int = 42) -> List[Dict]:
+    """Rows of a Planisware skillset export, one per person and skillset"""
+    rng = random.Random(seed)
+    catalog = skill_catalog(skills)
+    rows = []
+    for name in person_names(users, rng):
+        location, country, region = rng.choice(LOCATIONS)
+        chapter = rng.choice(CHAPTERS)
+        for index in user_skillsets(rng, skills, per_user):
+            skill = catalog[index]
+            rows.append({
+                "Name": name,
+                "Chapter": chapter,
+                "Chapter Area": f"{chapter} {region}",
+                "Skillset Level": rng.choices(SKILLSET_LEVELS, weights=LEVEL_WEIGHTS)[0],
+                "Skillset": skill["name"],
+                "Resource Location": location,
+                "Resource Country": country,
+                "Resource Region": region,
+                "Skillsets.Description": skill["description"],
+                "Skillsets.Category": skill["category"],
+                "Skillsets.Role": skill["role"]
+            })
+    return rows
+
+
+def write_planisware_file(path: str, users: int, skills: int, per_user: int, seed: int = 42) -> int:
+    """
+    Write a synthetic Planisware export (.xlsx or .csv, by extension)
+
+    Returns:
+        Number of rows written
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(planisware_rows(users, skills, per_user, seed), columns=PLANISWARE_COLUMNS)
+    if path.endswith(".csv"):
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_excel(path, index=False)
+    return len(frame)
+
+
+def populate_database(url: str, users: int, skills: int, per_user: int, plans: int, seed: int = 42,
+                      force: bool = False) -> Dict[str, int]:
+    """
+    Create and fill a database at the given URL
+
+    Loads the career framework and skills catalog (load_reference_data.py),
+    then bulk-inserts the users, competencies and assessments that importing
+    the synthetic export would create, catalog skills per user and development
+    plans with objectives for the first `plans` users.
+
+    A database that already holds users is refused before anything is
+    written; with force, an existing SQLite file is deleted first.
+
+    Returns:
+        Row counts per table
+    """
+    from sqlalchemy import func, insert, select
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.orm import sessionmaker
+    from app.api.import_data import password_context
+    from app.core.database import create_db_engine, UPSERT_CHUNK_SIZE
+    from app.core.migrations import upgrade_database
+    from app.models.assessment import Assessment, ProficiencyLevel
+    from app.models.career import (
+        CompetencyArea, DevelopmentPlan, LearningObjective, ObjectivePriority, ObjectiveStatus,
+        PlanStatus, Skill, UserSkill
+    )
+    from app.models.competency import Competency
+    from app.models.organization import Country, JobRole, Location, Region
+    from app.models.user import User, UserRole
+    from app.services.planisware import map_category_to_competency_category, planisware_email
+    from app.services.risk_report import refresh_competency_risk
+    from app.services.reference_data import load_reference_data
+
+    path = make_url(url).database if url.startswith("sqlite") else None
+    if force:
+        if not path or path == ":memory:":
+            raise ValueError("--force can only delete SQLite database files")
+        for suffix in ("", "-wal", "-shm"):
+            Path(path + suffix).unlink(missing_ok=True)
+
+    rng = random.Random(seed)
+    engine = create_db_engine(url)
+    upgrade_database(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        if db.scalar(select(func.count()).select_from(User)):
+            engine.dispose()
+            raise ValueError(f"{url} already holds data; use an empty database or --force to recreate a SQLite file")
+    catalog = skill_catalog(skills)
+    levels = list(ProficiencyLevel)
+    counts: Dict[str, int] = {}
+
+    def insert_chunked(db, model, rows):
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE * 10):
+            db.execute(insert(model), rows[start:start + UPSERT_CHUNK_SIZE * 10])
+        counts[model.__tablename__] = len(rows)
+
+    with Session() as db:
+        load_reference_data(db)
+
+        # Users, competencies and assessments as the Planisware importer would create them
+        rows = planisware_rows(users, skills, per_user, seed)
+        people = {row["Name"]: row for row in rows}
+        lookups = {}
+        for column, model, source in [("region_id", Region, "Resource Region"), ("country_id", Country, "Resource Country"),
+                                      ("location_id", Location, "Resource Location")]:
+            insert_chunked(db, model, [{"name": name} for name in sorted({row[source] for row in people.values()})])
+            lookups[column, source] = dict(db.execute(select(model.name, model.id)).all())
+        hashed = password_context().hash("password123")
+        insert_chunked(db, User, [
+            {"email": planisware_email(name), "name": name,
+             "role": UserRole.MANAGER if i % 12 == 0 else UserRole.EMPLOYEE, "hashed_password": hashed,
+             **{column: ids[row[source]] for (column, source), ids in lookups.items()}}
+            for i, (name, row) in enumerate(people.items())
+        ])
+        insert_chunked(db, JobRole, [{"name": role} for role in sorted({skill["role"] for skill in catalog})])
+        job_role_ids = dict(db.execute(select(JobRole.name, JobRole.id)).all())
+        insert_chunked(db, Competency, [
+            {"name": skill["name"], "description": skill["description"],
+             "category": map_category_to_competency_category(skill["category"]),
+             "job_role_id": job_role_ids[skill["role"]]}
+            for skill in catalog
+        ])
+        user_id_by_name = dict(db.execute(select(User.name, User.id)).all())
+        competency_ids = dict(db.execute(select(Competency.name, Competency.id)).all())
+        insert_chunked(db, Assessment, [
+            {"user_id": user_id_by_name[row["Name"]], "competency_id": competency_ids[row["Skillset"]],
+             "proficiency_level": levels[SKILLSET_LEVELS.index(row["Skillset Level"])]}
+            for row in rows
+        ])
+        user_ids = sorted(user_id_by_name.values())
+
+        skill_ids = db.scalars(select(Skill.id)).all()
+        insert_chunked(db, UserSkill, [
+            {"user_id": user_id, "skill_id": skill_id, "proficiency_level": rng.choice(levels),
+             "last_assessed": date.today() - timedelta(days=rng.randrange(720))}
+            for user_id in user_ids
+            for skill_id in rng.sample(skill_ids, min(len(skill_ids), max(1, per_user // 3)))
+        ])
+
+        area_ids = db.scalars(select(CompetencyArea.id)).all()
+        plan_rows = []
+        for user_id in user_ids[:plans]:
+            current = rng.randrange(len(PAY_CLASSES) - 1)
+            plan_rows.append({
+                "user_id": user_id, "current_level": PAY_CLASSES[current],
+                "target_level": PAY_CLASSES[current + 1], "created_date": date.today(),
+                "target_date": date.today() + timedelta(days=365),
+                "status": rng.choices(list(PlanStatus), weights=[80, 15, 5])[0]
+            })
+        insert_chunked(db, DevelopmentPlan, plan_rows)
+        plan_ids = db.scalars(select(DevelopmentPlan.id)).all()
+        insert_chunked(db, LearningObjective, [
+            {"plan_id": plan_id, "competency_area_id": area_id, "description": f"Develop competency area {area_id}",
+             "priority": list(ObjectivePriority)[min(i, 2)], "status": rng.choice(list(ObjectiveStatus))}
+            for plan_id in plan_ids
+            for i, area_id in enumerate(rng.sample(area_ids, min(len(area_ids), 5)))
+        ])
+        db.commit()
+
+        refresh_competency_risk(db)
+        db.commit()
+
+    engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", choices=["file", "database"], help="Write an export file or populate a database")
+    parser.add_argument("destination", help="Output path (.xlsx/.csv) or database URL")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--skills-per-user", type=int, default=12)
+    parser.add_argument("--plans", type=int, default=2000, help="Users with a development plan (database only)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="Delete an existing SQLite database first (database only)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.target == "file":
+        rows = write_planisware_file(args.destination, args.users, args.skills, args.skills_per_user, args.seed)
+        print(f"Wrote {rows} rows to {args.destination}")
+    else:
+        try:
+            counts = populate_database(args.destination, args.users, args.skills, args.skills_per_user,
+                                       args.plans, args.seed, force=args.force)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        for table, count in counts.items():
+            print(f"  {table:<22}{count:>10}")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compile CareerFramework.json, TechMasterData.json and Skillsets.json into the
+reference snapshot the API loads at startup
+Run with: python build_reference_snapshot.py [--check]
+"""
+import argparse
+import sys
+import time
+from app.services.reference_snapshot import (
+    build_snapshot,
+    read_snapshot,
+    snapshot_path,
+    source_checksum,
+    write_snapshot
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Only report whether the snapshot is current (exit 1 if not)")
+    args = parser.parse_args()
+
+    path = snapshot_path()
+    if args.check:
+        snapshot = read_snapshot(path)
+        if snapshot is None:
+            print(f"{path}: missing or of an older format")
+            sys.exit(1)
+        if snapshot.checksum != source_checksum():
+            print(f"{path}: stale, source files changed since it was built")
+            sys.exit(1)
+        print(f"{path}: up to date ({snapshot.checksum[:12]})")
+        return
+
+    started = time.perf_counter()
+    snapshot = build_snapshot()
+    write_snapshot(snapshot, path)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {path} ({path.stat().st_size / 1024:.0f} KiB, checksum {snapshot.checksum[:12]}) "
+          f"in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,158 +1,68 @@
 """
 Import script for Planisware employee tagging data
-Imports employees and their skillsets from Excel file into the database
+Imports employees and their skillsets from Excel file into the database, with
+the same pipeline as POST /import/planisware
 Run with: python import_plw_data.py
 """
-import pandas as pd
-from passlib.context import CryptContext
-from app.core.database import SessionLocal, engine, Base
-from app.models.user import User, UserRole
-from app.models.competency import Competency, CompetencyCategory
-from app.models.assessment import Assessment, ProficiencyLevel
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def map_skillset_level_to_proficiency(level: str) -> ProficiencyLevel:
-    """Map Planisware skillset level to proficiency level"""
-    level_mapping = {
-        "1st": ProficiencyLevel.BEGINNER,
-        "2nd": ProficiencyLevel.INTERMEDIATE,
-        "3rd": ProficiencyLevel.ADVANCED,
-        "4th": ProficiencyLevel.EXPERT
-    }
-    return level_mapping.get(level, ProficiencyLevel.BEGINNER)
-
-
-def map_category_to_competency_category(category: str) -> CompetencyCategory:
-    """Map Planisware category to competency category"""
-    if pd.isna(category):
-        return CompetencyCategory.TECHNICAL
-
-    category = category.lower()
-
-    if "standard" in category or "advanced" in category:
-        return CompetencyCategory.TECHNICAL
-    elif "leadership" in category:
-        return CompetencyCategory.LEADERSHIP
-    elif "niche" in category or "domain" in category:
-        return CompetencyCategory.DOMAIN_KNOWLEDGE
-    else:
-        return CompetencyCategory.TECHNICAL
+from app.core.database import SessionLocal
+from app.core.migrations import upgrade_database
+from app.models.user import User
+from app.models.competency import Competency
+from app.models.assessment import Assessment
+from app.api.import_data import password_context
+from app.services.planisware import REQUIRED_COLUMNS
+from app.services.planisware_import import ImportWriter, PlaniswareFile, import_workers
+from app.services.generations import ASSESSMENTS, IMPORTS, bump_generation
+from app.services.competency_matrix import CompetencyMatrix
+from app.services.risk_report import refresh_competency_risk
 
 
 def import_plw_data(excel_file: str):
     """Import employee data from Planisware Excel file"""
+    # Create or upgrade tables
+    upgrade_database()
     db = SessionLocal()
 
     try:
-        # Read the Excel file
+        # Read the Excel file; normalization is shared with POST /import/planisware
         print(f"Reading Excel file: {excel_file}")
-        df = pd.read_excel(excel_file)
-
-        print(f"Found {len(df)} records in Excel file")
-        print(f"Columns: {df.columns.tolist()}\n")
-
-        # Track statistics
-        users_created = 0
-        users_existing = 0
-        competencies_created = 0
-        competencies_existing = 0
-        assessments_created = 0
-
-        # Process each row
-        for idx, row in df.iterrows():
-            # Extract data
-            name = row['Name']
-            skillset = row['Skillset']
-            skillset_level = row['Skillset Level']
-            location = row.get('Resource Location', '')
-            country = row.get('Resource Country', '')
-            region = row.get('Resource Region', '')
-            description = row.get('Skillsets.Description', '')
-            category = row.get('Skillsets.Category', '')
-            role = row.get('Skillsets.Role', '')
-
-            # Skip if essential data is missing
-            if pd.isna(name) or pd.isna(skillset):
-                print(f"Row {idx}: Skipping - missing name or skillset")
-                continue
-
-            # Create/Get User
-            # Generate email from name
-            email = name.lower().replace(' ', '.') + '@bosch.com'
-
-            user = db.query(User).filter(User.email == email).first()
-            if not user:
-                # Create new user
-                user = User(
-                    email=email,
-                    name=name,
-                    role=UserRole.EMPLOYEE,
-                    hashed_password=pwd_context.hash('password123')  # Default password
-                )
-                db.add(user)
-                db.flush()  # Get the user ID
-                users_created += 1
-                print(f"Created user: {name} ({email})")
-            else:
-                users_existing += 1
-
-            # Create/Get Competency
-            competency = db.query(Competency).filter(Competency.name == skillset).first()
-            if not competency:
-                # Create new competency
-                comp_category = map_category_to_competency_category(category)
-                competency = Competency(
-                    name=skillset,
-                    description=description if not pd.isna(description) else None,
-                    category=comp_category
-                )
-                db.add(competency)
-                db.flush()  # Get the competency ID
-                competencies_created += 1
-                print(f"Created competency: {skillset} ({comp_category.value})")
-            else:
-                competencies_existing += 1
-
-            # Create Assessment (link user to competency with proficiency level)
-            proficiency = map_skillset_level_to_proficiency(skillset_level)
-
-            # Check if assessment already exists
-            existing_assessment = db.query(Assessment).filter(
-                Assessment.user_id == user.id,
-                Assessment.competency_id == competency.id,
-                Assessment.proficiency_level == proficiency
-            ).first()
-
-            if not existing_assessment:
-                assessment = Assessment(
-                    user_id=user.id,
-                    competency_id=competency.id,
-                    proficiency_level=proficiency
-                )
-                db.add(assessment)
-                assessments_created += 1
-                print(f"Created assessment: {name} -> {skillset} ({proficiency.name})")
-            else:
-                print(f"Assessment already exists: {name} -> {skillset} ({proficiency.name})")
+        source = PlaniswareFile(excel_file, is_csv=excel_file.endswith(".csv"))
+        print(f"Columns: {source.columns}\n")
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in source.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+        writer = ImportWriter(db, lambda: password_context().hash('password123'))  # Default password
+        for chunk in source.chunks(workers=import_workers()):
+            writer.write(chunk)
+        stats = writer.finish()
+
+        # Materialize the bus-factor / coverage report in the import's transaction
+        summarized = refresh_competency_risk(db, matrix=CompetencyMatrix())
 
         # Commit all changes
         db.commit()
+        print(f"Competency risk report refreshed for {summarized} competencies")
 
         # Print summary
         print("\n" + "="*60)
         print("IMPORT SUMMARY")
         print("="*60)
-        print(f"Users created: {users_created}")
-        print(f"Users existing: {users_existing}")
-        print(f"Competencies created: {competencies_created}")
-        print(f"Competencies existing: {competencies_existing}")
-        print(f"Assessments created: {assessments_created}")
+        print(f"Rows imported: {stats['rows_processed']}")
+        print(f"Rows skipped (missing name or skillset): {stats['rows_skipped']}")
+        print(f"Rows failed: {stats['rows_failed']}")
+        print(f"Users created: {stats['users_created']}")
+        print(f"Users existing: {stats['users_existing']}")
+        print(f"Competencies created: {stats['competencies_created']}")
+        print(f"Competencies existing: {stats['competencies_existing']}")
+        print(f"Assessments created: {stats['assessments_created']}")
+        print(f"Assessments updated: {stats['assessments_existing']}")
+        for code, count in stats["issues"].items():
+            print(f"Issues ({code}): {count}")
+        for error in stats["errors"]:
+            print(f"  {error}")
+        if writer.report.path:
+            print(f"All issues: {writer.report.path}")
         print("="*60)
         print("\nImport completed successfully!")
 
@@ -166,6 +76,7 @@ def import_plw_data(excel_file: str):
 
 def cleanup_data():
     """Clean up all imported data (for testing)"""
+    upgrade_database()
     db = SessionLocal()
 
     try:
@@ -183,6 +94,9 @@ def cleanup_data():
         competencies_deleted = db.query(Competency).delete()
         print(f"Deleted {competencies_deleted} competencies")
 
+        # Running servers rebuild their in-memory views
+        bump_generation(db, ASSESSMENTS)
+        bump_generation(db, IMPORTS)
         db.commit()
         print("\nCleanup completed successfully!")
 
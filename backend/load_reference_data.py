@@ -0,0 +1,44 @@
+"""
+Load reference data (career framework and skills catalog) into the database
+Reads CareerFramework.json, TechMasterData.json and Skillsets.json and applies
+only the differences with idempotent upserts, so it is safe to rerun.
+Run with: python load_reference_data.py [--dry-run] [--verbose] [--only career|skills]
+"""
+import argparse
+import json
+import time
+from app.core.database import SessionLocal
+from app.core.migrations import upgrade_database
+from app.services.reference_data import DATASETS, load_reference_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    parser.add_argument("--verbose", action="store_true", help="List the keys of new, changed and extra rows")
+    parser.add_argument("--only", action="append", choices=DATASETS, help="Limit to a dataset (repeatable)")
+    args = parser.parse_args()
+
+    upgrade_database()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        diffs = load_reference_data(db, datasets=args.only or DATASETS, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'table':<26}{'insert':>8}{'update':>8}{'same':>8}{'extra':>8}")
+    for table, diff in diffs.items():
+        summary = diff.summary()
+        print(f"{table:<26}{summary['inserted']:>8}{summary['updated']:>8}"
+              f"{summary['unchanged']:>8}{summary['missing_from_source']:>8}")
+    if args.verbose:
+        for table, diff in diffs.items():
+            details = diff.summary(verbose=True)["details"]
+            if any(details.values()):
+                print(f"\n{table}:")
+                print(json.dumps(details, indent=2, ensure_ascii=False))
+    action = "Dry run, nothing written" if args.dry_run else "Applied"
+    print(f"\n{action} in {elapsed * 1000:.0f} ms ('extra' rows exist only in the database and are kept)")
+
+
+if __name__ == "__main__":
+    main()
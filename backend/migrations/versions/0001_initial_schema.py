@@ -0,0 +1,143 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum("EMPLOYEE", "MANAGER", "HR_ADMIN", "LEADERSHIP", name="userrole")
+competency_category = sa.Enum("TECHNICAL", "SOFT_SKILLS", "LEADERSHIP", "DOMAIN_KNOWLEDGE", name="competencycategory")
+proficiency_level = sa.Enum("BEGINNER", "INTERMEDIATE", "ADVANCED", "EXPERT", name="proficiencylevel")
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False)
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "competencies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("category", competency_category, nullable=False)
+    )
+    op.create_index("ix_competencies_id", "competencies", ["id"])
+    op.create_index("ix_competencies_name", "competencies", ["name"], unique=True)
+
+    op.create_table(
+        "assessments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("competency_id", sa.Integer(), sa.ForeignKey("competencies.id"), nullable=False),
+        sa.Column("proficiency_level", proficiency_level, nullable=False),
+        sa.Column("assessed_at", sa.DateTime(), nullable=False)
+    )
+    op.create_index("ix_assessments_id", "assessments", ["id"])
+
+    op.create_table(
+        "career_levels",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("track", sa.String(50), nullable=False),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(100), nullable=False),
+        sa.Column("pay_class", sa.String(10), nullable=False),
+        sa.Column("summary", sa.Text()),
+        sa.Column("impact_scope", sa.Text()),
+        sa.Column("project_category", sa.String(10), nullable=True)
+    )
+    op.create_index("ix_career_levels_id", "career_levels", ["id"])
+    op.create_index("ix_career_levels_pay_class", "career_levels", ["pay_class"])
+
+    op.create_table(
+        "competency_areas",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("area_key", sa.String(100), nullable=False, unique=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text())
+    )
+    op.create_index("ix_competency_areas_id", "competency_areas", ["id"])
+
+    op.create_table(
+        "competency_expectations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("competency_area_id", sa.Integer(), sa.ForeignKey("competency_areas.id")),
+        sa.Column("pay_class", sa.String(10), nullable=False),
+        sa.Column("expectations", sa.Text(), nullable=False),
+        sa.Column("scope", sa.String(100), nullable=True)
+    )
+    op.create_index("ix_competency_expectations_id", "competency_expectations", ["id"])
+    op.create_index("ix_competency_expectations_pay_class", "competency_expectations", ["pay_class"])
+
+    op.create_table(
+        "skills",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("parent_category", sa.String(100), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("category", sa.String(50), nullable=True),
+        sa.Column("roles", sa.Text(), nullable=True),
+        sa.Column("is_data_skill", sa.Integer())
+    )
+    op.create_index("ix_skills_id", "skills", ["id"])
+    op.create_index("ix_skills_name", "skills", ["name"])
+
+    op.create_table(
+        "user_skills",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("skill_id", sa.Integer(), sa.ForeignKey("skills.id")),
+        sa.Column("proficiency_level", sa.String(20), nullable=False),
+        sa.Column("last_assessed", sa.Date(), nullable=True)
+    )
+    op.create_index("ix_user_skills_id", "user_skills", ["id"])
+    op.create_index("ix_user_skills_user_id", "user_skills", ["user_id"])
+
+    op.create_table(
+        "development_plans",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("current_level", sa.String(10), nullable=False),
+        sa.Column("target_level", sa.String(10), nullable=False),
+        sa.Column("created_date", sa.Date(), nullable=False),
+        sa.Column("target_date", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(20))
+    )
+    op.create_index("ix_development_plans_id", "development_plans", ["id"])
+    op.create_index("ix_development_plans_user_id", "development_plans", ["user_id"])
+
+    op.create_table(
+        "learning_objectives",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("plan_id", sa.Integer(), sa.ForeignKey("development_plans.id")),
+        sa.Column("competency_area_id", sa.Integer(), sa.ForeignKey("competency_areas.id"), nullable=True),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("priority", sa.String(20)),
+        sa.Column("status", sa.String(20))
+    )
+    op.create_index("ix_learning_objectives_id", "learning_objectives", ["id"])
+
+
+def downgrade():
+    for table in [
+        "learning_objectives", "development_plans", "user_skills", "skills",
+        "competency_expectations", "competency_areas", "career_levels",
+        "assessments", "competencies", "users"
+    ]:
+        op.drop_table(table)
+    for enum in (proficiency_level, competency_category, user_role):
+        enum.drop(op.get_bind(), checkfirst=True)
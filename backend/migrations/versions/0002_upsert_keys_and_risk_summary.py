@@ -0,0 +1,63 @@
+"""Unique upsert keys on assessments and user skills, competency risk summary
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the most recent row per natural key before making it unique
+    op.execute(
+        "DELETE FROM assessments WHERE id NOT IN "
+        "(SELECT MAX(id) FROM assessments GROUP BY user_id, competency_id)"
+    )
+    op.execute(
+        "DELETE FROM user_skills WHERE id NOT IN "
+        "(SELECT MAX(id) FROM user_skills GROUP BY user_id, skill_id)"
+    )
+    op.create_index(
+        "ix_assessments_user_competency", "assessments",
+        ["user_id", "competency_id"], unique=True, if_not_exists=True
+    )
+    op.create_index(
+        "ix_user_skills_user_skill", "user_skills",
+        ["user_id", "skill_id"], unique=True, if_not_exists=True
+    )
+
+    # Databases created with create_all after the risk report shipped already have it
+    if "competency_risk" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "competency_risk",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("competency_id", sa.Integer(), sa.ForeignKey("competencies.id"), nullable=False, unique=True),
+        sa.Column("holders", sa.Integer(), nullable=False),
+        sa.Column("beginner_count", sa.Integer(), nullable=False),
+        sa.Column("intermediate_count", sa.Integer(), nullable=False),
+        sa.Column("advanced_count", sa.Integer(), nullable=False),
+        sa.Column("expert_count", sa.Integer(), nullable=False),
+        sa.Column("bus_factor", sa.Integer(), nullable=False),
+        sa.Column("gini", sa.Float(), nullable=False),
+        sa.Column("regions_covered", sa.Integer(), nullable=True),
+        sa.Column("countries_covered", sa.Integer(), nullable=True),
+        sa.Column("region_coverage", sa.Text(), nullable=True),
+        sa.Column("risk_level", sa.String(20), nullable=False),
+        sa.Column("risk_rank", sa.Integer(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False)
+    )
+    op.create_index("ix_competency_risk_id", "competency_risk", ["id"])
+    op.create_index("ix_competency_risk_risk_rank", "competency_risk", ["risk_rank"])
+
+
+def downgrade():
+    op.drop_table("competency_risk")
+    op.drop_index("ix_user_skills_user_skill", table_name="user_skills")
+    op.drop_index("ix_assessments_user_competency", table_name="assessments")
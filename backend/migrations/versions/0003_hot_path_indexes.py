@@ -0,0 +1,40 @@
+"""Indexes for hot lookup paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # People search and coverage filter assessments by competency alone;
+    # (user_id, competency_id) is already served by the unique upsert key
+    op.create_index(
+        "ix_assessments_competency_id", "assessments", ["competency_id"], if_not_exists=True
+    )
+
+    # Every career endpoint looks expectations up by area and pay class
+    op.execute(
+        "DELETE FROM competency_expectations WHERE id NOT IN "
+        "(SELECT MAX(id) FROM competency_expectations GROUP BY competency_area_id, pay_class)"
+    )
+    op.create_index(
+        "ix_competency_expectations_area_pay_class", "competency_expectations",
+        ["competency_area_id", "pay_class"], unique=True, if_not_exists=True
+    )
+
+    op.create_index(
+        "ix_learning_objectives_plan_id", "learning_objectives", ["plan_id"], if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_learning_objectives_plan_id", table_name="learning_objectives")
+    op.drop_index("ix_competency_expectations_area_pay_class", table_name="competency_expectations")
+    op.drop_index("ix_assessments_competency_id", table_name="assessments")
@@ -0,0 +1,85 @@
+"""Integer-coded proficiency, status and priority columns
+
+Assessments and user skills share one SMALLINT proficiency scale (1-4), and
+plan/objective status and priority become SMALLINT codes. Existing text values
+are recoded in place.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# table, column, {stored text: code}, code for unknown text, text type, nullable
+RECODED = [
+    ("assessments", "proficiency_level",
+     {"BEGINNER": 1, "INTERMEDIATE": 2, "ADVANCED": 3, "EXPERT": 4}, 1,
+     sa.Enum("BEGINNER", "INTERMEDIATE", "ADVANCED", "EXPERT", name="proficiencylevel"), False),
+    ("user_skills", "proficiency_level",
+     {"beginner": 1, "intermediate": 2, "advanced": 3, "expert": 4}, 1, sa.String(20), False),
+    ("development_plans", "status",
+     {"active": 1, "completed": 2, "cancelled": 3}, 1, sa.String(20), True),
+    ("learning_objectives", "priority",
+     {"high": 1, "medium": 2, "low": 3}, 2, sa.String(20), True),
+    ("learning_objectives", "status",
+     {"not_started": 1, "in_progress": 2, "completed": 3}, 1, sa.String(20), True),
+]
+
+# Text written back on downgrade where it differs from the lowercase key above
+DOWNGRADE_TEXT = {("learning_objectives", "priority"): {1: "High", 2: "Medium", 3: "Low"}}
+
+
+def _swap_column(table, column, new_type, nullable, expression):
+    """Replace a column with a recoded copy (batch mode rebuilds the table on SQLite)"""
+    temporary = f"{column}_recoded"
+    with op.batch_alter_table(table) as batch:
+        batch.add_column(sa.Column(temporary, new_type, nullable=True))
+    op.execute(f"UPDATE {table} SET {temporary} = {expression}")
+    with op.batch_alter_table(table) as batch:
+        batch.drop_column(column)
+        batch.alter_column(temporary, new_column_name=column, existing_type=new_type, nullable=nullable)
+
+
+def upgrade():
+    op.drop_index("ix_assessments_competency_id", table_name="assessments", if_exists=True)
+
+    for table, column, codes, fallback, _, nullable in RECODED:
+        source = column if table == "assessments" else f"lower({column})"
+        cases = " ".join(f"WHEN '{text}' THEN {code}" for text, code in codes.items())
+        _swap_column(
+            table, column, sa.SmallInteger(), nullable,
+            f"CASE WHEN {column} IS NULL THEN {'NULL' if nullable else fallback} "
+            f"ELSE CASE {source} {cases} ELSE {fallback} END END"
+        )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS proficiencylevel")
+
+    op.create_index(
+        "ix_assessments_competency_level", "assessments", ["competency_id", "proficiency_level"]
+    )
+    op.create_index(
+        "ix_user_skills_skill_level", "user_skills", ["skill_id", "proficiency_level"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_user_skills_skill_level", table_name="user_skills")
+    op.drop_index("ix_assessments_competency_level", table_name="assessments")
+
+    for table, column, codes, _, text_type, nullable in RECODED:
+        texts = DOWNGRADE_TEXT.get((table, column), {code: text for text, code in codes.items()})
+        cases = " ".join(f"WHEN {code} THEN '{text}'" for code, text in texts.items())
+        expression = f"CASE {column} {cases} END"
+        if isinstance(text_type, sa.Enum) and op.get_bind().dialect.name == "postgresql":
+            text_type.create(op.get_bind(), checkfirst=True)
+            expression = f"CAST({expression} AS {text_type.name})"
+        _swap_column(table, column, text_type, nullable, expression)
+
+    op.create_index("ix_assessments_competency_id", "assessments", ["competency_id"])
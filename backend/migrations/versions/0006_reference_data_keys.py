@@ -0,0 +1,57 @@
+"""Natural-key unique indexes for reference data upserts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _merge_duplicate_skills(bind) -> None:
+    """Point user skills at the first of each duplicated skill, then drop the copies"""
+    duplicates = bind.execute(sa.text(
+        "SELECT s.id, k.keep_id FROM skills s JOIN "
+        "(SELECT name, COALESCE(parent_category, '') AS parent, MIN(id) AS keep_id "
+        " FROM skills GROUP BY name, COALESCE(parent_category, '') HAVING COUNT(*) > 1) k "
+        "ON s.name = k.name AND COALESCE(s.parent_category, '') = k.parent AND s.id <> k.keep_id"
+    )).all()
+    for duplicate_id, keep_id in duplicates:
+        params = {"duplicate_id": duplicate_id, "keep_id": keep_id}
+        # A user holding both copies keeps the entry for the surviving skill
+        bind.execute(sa.text(
+            "DELETE FROM user_skills WHERE skill_id = :duplicate_id AND user_id IN "
+            "(SELECT user_id FROM user_skills WHERE skill_id = :keep_id)"
+        ), params)
+        bind.execute(sa.text("UPDATE user_skills SET skill_id = :keep_id WHERE skill_id = :duplicate_id"), params)
+        bind.execute(sa.text("DELETE FROM skills WHERE id = :duplicate_id"), params)
+
+
+def upgrade():
+    op.execute(
+        "DELETE FROM career_levels WHERE id NOT IN "
+        "(SELECT MIN(id) FROM career_levels GROUP BY track, pay_class)"
+    )
+    op.create_index(
+        "ix_career_levels_track_pay_class", "career_levels",
+        ["track", "pay_class"], unique=True, if_not_exists=True
+    )
+
+    _merge_duplicate_skills(op.get_bind())
+    # The unique key leads with name, so it also serves name lookups
+    op.drop_index("ix_skills_name", table_name="skills", if_exists=True)
+    op.create_index(
+        "ix_skills_name_parent_category", "skills",
+        ["name", "parent_category"], unique=True, if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_skills_name_parent_category", table_name="skills")
+    op.create_index("ix_skills_name", "skills", ["name"])
+    op.drop_index("ix_career_levels_track_pay_class", table_name="career_levels")
@@ -0,0 +1,52 @@
+"""Region, country and location lookups for users, job role lookup for competencies
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# table, column, lookup table
+LOOKUPS = [
+    ("users", "region_id", "regions"),
+    ("users", "country_id", "countries"),
+    ("users", "location_id", "locations"),
+    ("competencies", "job_role_id", "job_roles"),
+]
+
+
+def upgrade():
+    for _, _, lookup in LOOKUPS:
+        op.create_table(
+            lookup,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False)
+        )
+        op.create_index(f"ix_{lookup}_id", lookup, ["id"])
+        op.create_index(f"ix_{lookup}_name", lookup, ["name"], unique=True)
+
+    for table in ("users", "competencies"):
+        with op.batch_alter_table(table) as batch:
+            for _, column, lookup in [entry for entry in LOOKUPS if entry[0] == table]:
+                batch.add_column(sa.Column(column, sa.Integer(), nullable=True))
+                batch.create_foreign_key(f"fk_{table}_{column}", lookup, [column], ["id"])
+    for table, column, _ in LOOKUPS:
+        op.create_index(f"ix_{table}_{column}", table, [column])
+
+
+def downgrade():
+    for table, column, _ in LOOKUPS:
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
+    for table in ("users", "competencies"):
+        with op.batch_alter_table(table) as batch:
+            for _, column, _ in [entry for entry in LOOKUPS if entry[0] == table]:
+                batch.drop_constraint(f"fk_{table}_{column}", type_="foreignkey")
+                batch.drop_column(column)
+    for _, _, lookup in LOOKUPS:
+        op.drop_table(lookup)
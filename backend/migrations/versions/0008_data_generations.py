@@ -0,0 +1,29 @@
+"""Generation counters for the in-memory views of each worker
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    generations = op.create_table(
+        "data_generations",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("generation", sa.Integer(), nullable=False)
+    )
+    op.bulk_insert(generations, [
+        {"name": "assessments", "generation": 0},
+        {"name": "imports", "generation": 0}
+    ])
+
+
+def downgrade():
+    op.drop_table("data_generations")
@@ -1,6 +1,24 @@
+import time
 import uvicorn
+from app.core.config import settings
+from app.core.migrations import upgrade_database
 
 if __name__ == "__main__":
+    # Migrate once here; the reloader and workers only import the app
+    started = time.perf_counter()
+    upgrade_database()
+    print(f"Database schema up to date ({time.perf_counter() - started:.2f}s)")
+    # Compile the reference snapshot before workers start so each one only loads it
+    started = time.perf_counter()
+    from app.services.reference_snapshot import ensure_snapshot
+    _, rebuilt = ensure_snapshot()
+    print(f"Reference snapshot {'rebuilt' if rebuilt else 'up to date'} ({time.perf_counter() - started:.2f}s)")
+    if settings.LOAD_REFERENCE_DATA_ON_STARTUP:
+        started = time.perf_counter()
+        from app.services.reference_data import sync_reference_data
+        changed = sync_reference_data()
+        print(f"Reference data synced, {changed} rows written ({time.perf_counter() - started:.2f}s)")
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -2,22 +2,17 @@
 Seed script to populate the database with sample competencies
 Run with: python seed_data.py
 """
-from app.core.database import SessionLocal, engine, Base
+from sqlalchemy import insert, select
+from app.core.database import SessionLocal
+from app.core.migrations import upgrade_database
 from app.models.competency import Competency, CompetencyCategory
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create or upgrade tables
+upgrade_database()
 
 def seed_competencies():
     db = SessionLocal()
 
-    # Check if data already exists
-    existing = db.query(Competency).first()
-    if existing:
-        print("Database already contains competencies. Skipping seed.")
-        db.close()
-        return
-
     sample_competencies = [
         # Technical Skills
         {
@@ -118,12 +113,14 @@ def seed_competencies():
         }
     ]
 
-    for comp_data in sample_competencies:
-        competency = Competency(**comp_data)
-        db.add(competency)
-
-    db.commit()
-    print(f"Successfully seeded {len(sample_competencies)} competencies!")
+    # Safe to rerun: only samples whose name is not taken yet are added, and
+    # existing competencies (e.g. from an import) are left as they are
+    existing = set(db.scalars(select(Competency.name)))
+    rows = [{"description": None, **comp_data} for comp_data in sample_competencies if comp_data["name"] not in existing]
+    if rows:
+        db.execute(insert(Competency), rows)
+        db.commit()
+    print(f"Successfully seeded {len(rows)} competencies!")
     db.close()
 
 if __name__ == "__main__":
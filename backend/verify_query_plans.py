@@ -0,0 +1,102 @@
+"""
+Verify that hot lookup queries are served by indexes
+Builds a fresh SQLite database through the migrations, runs EXPLAIN QUERY PLAN
+on each hot query and fails if any of them scans its table instead.
+Run with: python verify_query_plans.py
+"""
+import os
+import sys
+import tempfile
+from sqlalchemy import func, select, text
+from app.core.database import create_db_engine
+from app.core.migrations import upgrade_database
+from app.models.assessment import Assessment
+from app.models.career import CompetencyExpectation, UserSkill, LearningObjective
+from app.models.user import User
+from app.services.organization import OrganizationFilter, job_role_holders
+
+HOT_QUERIES = [
+    (
+        "assessment by user and competency (import dedupe, profile pages)",
+        select(Assessment).where(Assessment.user_id == 1, Assessment.competency_id == 2),
+        "ix_assessments_user_competency"
+    ),
+    (
+        "assessments by user",
+        select(Assessment).where(Assessment.user_id == 1),
+        "ix_assessments_user_competency"
+    ),
+    (
+        "assessments by competency and minimum level (people search)",
+        select(Assessment.user_id).where(Assessment.competency_id == 2, Assessment.proficiency_level >= 3),
+        "ix_assessments_competency_level"
+    ),
+    (
+        "level counts per competency (index-only aggregation)",
+        select(Assessment.competency_id, Assessment.proficiency_level, func.count())
+        .group_by(Assessment.competency_id, Assessment.proficiency_level),
+        "COVERING INDEX ix_assessments_competency_level"
+    ),
+    (
+        "expectation by area and pay class (career endpoints)",
+        select(CompetencyExpectation).where(
+            CompetencyExpectation.competency_area_id == 1,
+            CompetencyExpectation.pay_class == "P3"
+        ),
+        "ix_competency_expectations_area_pay_class"
+    ),
+    (
+        "user skill by user and skill",
+        select(UserSkill).where(UserSkill.user_id == 1, UserSkill.skill_id == 2),
+        "ix_user_skills_user_skill"
+    ),
+    (
+        "user skills by skill and minimum level",
+        select(UserSkill.user_id).where(UserSkill.skill_id == 2, UserSkill.proficiency_level >= 3),
+        "ix_user_skills_skill_level"
+    ),
+    (
+        "users by region (organization filters)",
+        select(User.id).where(*OrganizationFilter(region="EMEA").conditions()),
+        "ix_users_region_id"
+    ),
+    (
+        "competencies by job role (job_role filter)",
+        job_role_holders("Data Engineer"),
+        "ix_competencies_job_role_id"
+    ),
+    (
+        "objectives by plan",
+        select(LearningObjective).where(LearningObjective.plan_id == 1),
+        "ix_learning_objectives_plan_id"
+    ),
+]
+
+
+def query_plan(connection, statement) -> str:
+    sql = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def main() -> int:
+    directory = tempfile.mkdtemp(prefix="growthpath-plans-")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'plans.db')}")
+    upgrade_database(engine)
+
+    failures = 0
+    with engine.connect() as connection:
+        for name, statement, index in HOT_QUERIES:
+            plan = query_plan(connection, statement)
+            # Whole-table aggregates are expected to scan, but only a covering index
+            ok = index in plan and ("SCAN" not in plan or "COVERING INDEX" in index)
+            failures += not ok
+            print(f"{'✓' if ok else '✗'} {name}\n    {plan}")
+    engine.dispose()
+
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use their index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,14 +45,18 @@ const ProgressTracker = () => {
     }
   };
 
-  const updateObjectiveStatus = async (objectiveId, newStatus) => {
+  const updateObjectiveStatus = async (objective, newStatus) => {
     setUpdating(true);
     try {
       const response = await fetch(
-        `http://localhost:8000/api/career/objective/${objectiveId}?status=${newStatus}`,
+        `http://localhost:8000/api/career/objective/${objective.id}?status=${newStatus}&version=${objective.version}`,
         { method: 'PUT' }
       );
-      if (response.ok) {
+      if (response.status === 409) {
+        // Someone else changed the objective; show their change instead
+        alert('This objective was updated by someone else. Showing the latest status.');
+        await loadPlanDetails(selectedPlan);
+      } else if (response.ok) {
         // Reload both plans list and details
         await loadUserPlans();
         await loadPlanDetails(selectedPlan);
@@ -231,7 +235,7 @@ const ProgressTracker = () => {
                     <div className="status-buttons">
                       <button
                         className={`status-btn ${objective.status === 'not_started' ? 'active' : ''}`}
-                        onClick={() => updateObjectiveStatus(objective.id, 'not_started')}
+                        onClick={() => updateObjectiveStatus(objective, 'not_started')}
                         disabled={updating}
                         style={{ borderColor: getStatusColor('not_started') }}
                       >
@@ -239,7 +243,7 @@ const ProgressTracker = () => {
                       </button>
                       <button
                         className={`status-btn ${objective.status === 'in_progress' ? 'active' : ''}`}
-                        onClick={() => updateObjectiveStatus(objective.id, 'in_progress')}
+                        onClick={() => updateObjectiveStatus(objective, 'in_progress')}
                         disabled={updating}
                         style={{ borderColor: getStatusColor('in_progress') }}
                       >
@@ -247,7 +251,7 @@ const ProgressTracker = () => {
                       </button>
                       <button
                         className={`status-btn ${objective.status === 'completed' ? 'active' : ''}`}
-                        onClick={() => updateObjectiveStatus(objective.id, 'completed')}
+                        onClick={() => updateObjectiveStatus(objective, 'completed')}
                         disabled={updating}
                         style={{ borderColor: getStatusColor('completed') }}
                       >
@@ -42,11 +42,11 @@ function DataImport() {
 
     if (e.dataTransfer.files && e.dataTransfer.files[0]) {
       const droppedFile = e.dataTransfer.files[0]
-      if (droppedFile.name.endsWith('.xlsx') || droppedFile.name.endsWith('.xls')) {
+      if (droppedFile.name.endsWith('.xlsx') || droppedFile.name.endsWith('.xls') || droppedFile.name.endsWith('.csv')) {
         setFile(droppedFile)
         setError(null)
       } else {
-        setError('Please upload an Excel file (.xlsx or .xls)')
+        setError('Please upload an Excel file (.xlsx or .xls) or a CSV file')
       }
     }
   }
@@ -54,11 +54,11 @@ function DataImport() {
   const handleFileChange = (e) => {
     if (e.target.files && e.target.files[0]) {
       const selectedFile = e.target.files[0]
-      if (selectedFile.name.endsWith('.xlsx') || selectedFile.name.endsWith('.xls')) {
+      if (selectedFile.name.endsWith('.xlsx') || selectedFile.name.endsWith('.xls') || selectedFile.name.endsWith('.csv')) {
         setFile(selectedFile)
         setError(null)
       } else {
-        setError('Please upload an Excel file (.xlsx or .xls)')
+        setError('Please upload an Excel file (.xlsx or .xls) or a CSV file')
         setFile(null)
       }
     }
@@ -157,11 +157,11 @@ function DataImport() {
           <input
             id="file-input"
             type="file"
-            accept=".xlsx,.xls"
+            accept=".xlsx,.xls,.csv"
             onChange={handleFileChange}
             style={{ display: 'none' }}
           />
-          <p className="file-format-hint">Accepts: .xlsx, .xls</p>
+          <p className="file-format-hint">Accepts: .xlsx, .xls, .csv</p>
         </div>
 
         <div className="button-group">
@@ -209,16 +209,31 @@ function DataImport() {
               <h4>Processing</h4>
               <p>Processed: <strong>{result.statistics.rows_processed}</strong></p>
               <p>Skipped: <strong>{result.statistics.rows_skipped}</strong></p>
+              {result.statistics.rows_failed > 0 && (
+                <p>Failed: <strong>{result.statistics.rows_failed}</strong></p>
+              )}
             </div>
           </div>
           {result.statistics.errors && result.statistics.errors.length > 0 && (
             <div className="errors-section">
-              <h4>Errors ({result.statistics.errors.length})</h4>
+              <h4>
+                Issues ({Object.values(result.statistics.issues || {}).reduce((sum, count) => sum + count, 0)})
+              </h4>
+              <p>
+                {Object.entries(result.statistics.issues || {})
+                  .map(([code, count]) => `${code.replace(/_/g, ' ')}: ${count}`)
+                  .join(' · ')}
+              </p>
               <ul>
                 {result.statistics.errors.map((error, idx) => (
                   <li key={idx}>{error}</li>
                 ))}
               </ul>
+              {result.statistics.error_report && (
+                <a href={`${API_BASE_URL}${result.statistics.error_report}`} download>
+                  Download all issues (CSV)
+                </a>
+              )}
             </div>
           )}
         </div>